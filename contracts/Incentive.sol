@@ -7,6 +7,8 @@ import {Multicall_v4} from "@uniswap/base/Multicall_v4.sol";
 import {INofee} from "@governance/interfaces/INofee.sol";
 import {Operator} from "@operator/Operator.sol";
 import {StorageAccess} from "@core/StorageAccess.sol";
+import {Access} from "@core/helpers/Access.sol";
+import {IStorageAccess} from "@core/interfaces/IStorageAccess.sol";
 import {IHook} from "@core/interfaces/IHook.sol";
 import {BaseHook} from "@core/hooks/BaseHook.sol";
 import {INofeeswap} from "@core/interfaces/INofeeswap.sol";
@@ -41,21 +43,41 @@ import {getLogOffsetFromPoolId} from "@core/utilities/PoolId.sol";
 import {IIncentive} from "./interfaces/IIncentive.sol";
 import {IIncentivePoolFactory} from "./interfaces/IIncentivePoolFactory.sol";
 import {ERC721Permit} from "./base/ERC721Permit.sol";
-import {geometricMean} from "./utilities/GeometricMean.sol";
+import {geometricMeanFast} from "./utilities/GeometricMean.sol";
 import {
   incrementTokenId,
   getIncentiveDataSlot,
   readIncentiveData,
   writeIncentiveData,
+  clearIncentiveData,
+  evanescentPointsOwedOverflow,
   modifyIncentiveShares,
   collectEvanescentPoints,
   totalEvanescentPointsOwedSlot,
+  totalEvanescentPointsOwedMask,
+  readRewardProgramsCount,
   getPoolDataSlot,
   readPoolData,
   getEvanescentPointsPerShareMappingSlot,
+  evanescentPointsPerShareMask,
+  writeEvanescentPointsPerShare,
+  getPoolDataSnapshotSlot,
   updateTotalEvanescentPointsOwed,
   calculateEvanescentPointsPerShare,
-  writePoolData
+  calculateEvanescentPointsPerShareAt,
+  writePoolData,
+  maxRewardPrograms,
+  getRewardProgramSlot,
+  readRewardProgram,
+  writeRewardProgram,
+  rewardProgramAcceptedFlag,
+  readRewardProgramAccepted,
+  writeRewardProgramAccepted,
+  getRewardProgramsStateSlot,
+  rewardProgramStartedFlag,
+  rewardProgramEndedFlag,
+  getRewardProgramPointsSlot,
+  getUnpaidRewardProgramPointsSlot
 } from "./utilities/StorageIncentive.sol";
 
 using TagLibrary for uint256;
@@ -86,6 +108,7 @@ contract Incentive is
   BaseHook,
   Operator,
   StorageAccess,
+  Access,
   Multicall_v4,
   ERC721Permit('Nofeeswap Incentive', 'NOFEE-INCENTIVE')
 {
@@ -190,34 +213,457 @@ contract Incentive is
     // Check token's ownership.
     _checkAuthorized(_ownerOf(tokenId), msg.sender, tokenId);
 
-    // Update position data and read the total amount owned.
-    uint256 evanescentPointsOwed = collectEvanescentPoints(tokenId);
-    uint256 totalEvanescentPointsOwed = readStorage(
-      totalEvanescentPointsOwedSlot
+    // Collect the points of the additional reward programs first, because
+    // they are settled against the position's current subtrahend.
+    uint256[] memory programPoints = new uint256[](readRewardProgramsCount());
+    _settleRewardPrograms(tokenId, 0, programPoints);
+
+    // Update position data and pay the corresponding reward.
+    amount = _payRewards(_collectEvanescentPoints(tokenId), programPoints);
+  }
+
+  /// @inheritdoc IIncentive
+  function collectBatch(
+    uint256[] calldata tokenIds
+  ) external override returns (
+    uint256 amount
+  ) {
+    uint256 evanescentPointsOwed;
+    uint256[] memory programPoints = new uint256[](readRewardProgramsCount());
+    unchecked {
+      uint256 length = tokenIds.length;
+      for (uint256 k = 0; k < length; ++k) {
+        uint256 tokenId = tokenIds[k];
+
+        // Check token's ownership.
+        _checkAuthorized(_ownerOf(tokenId), msg.sender, tokenId);
+
+        // Update position data and aggregate the points owed. The addition
+        // is safe because the sum is capped by 'totalEvanescentPointsOwed'.
+        _settleRewardPrograms(tokenId, 0, programPoints);
+        evanescentPointsOwed += _collectEvanescentPoints(tokenId);
+      }
+    }
+
+    // Pay the aggregated reward with a single transfer per program.
+    amount = _payRewards(evanescentPointsOwed, programPoints);
+  }
+
+  /// @inheritdoc IIncentive
+  function burn(
+    uint256 tokenId
+  ) external override returns (
+    uint256 amount
+  ) {
+    // Check token's ownership.
+    _checkAuthorized(_ownerOf(tokenId), msg.sender, tokenId);
+
+    // Only positions with no shares left can be burned.
+    uint256 storageSlot = getIncentiveDataSlot(tokenId);
+    uint256 shares;
+    unchecked {
+      shares = readStorage(storageSlot + 1) & type(uint128).max;
+    }
+    require(shares == 0, PositionNotEmpty(tokenId, shares));
+
+    // The remaining points are paid before the position is cleared.
+    uint256[] memory programPoints = new uint256[](readRewardProgramsCount());
+    _settleRewardPrograms(tokenId, 0, programPoints);
+    amount = _payRewards(_collectEvanescentPoints(tokenId), programPoints);
+    clearIncentiveData(storageSlot);
+    if (programPoints.length != 0) {
+      writeStorage(getRewardProgramsStateSlot(tokenId), 0);
+    }
+    _burn(tokenId);
+  }
+
+  /// @inheritdoc IIncentive
+  function merge(
+    uint256[] calldata tokenIds
+  ) external override returns (
+    uint256 tokenId
+  ) {
+    require(tokenIds.length > 0, NoPositionsToMerge());
+    tokenId = tokenIds[0];
+
+    // Check token's ownership.
+    address owner = _ownerOf(tokenId);
+    _checkAuthorized(owner, msg.sender, tokenId);
+
+    // The points of the additional reward programs are gathered from every
+    // position and kept by 'tokenId'.
+    uint256[] memory programPoints = new uint256[](readRewardProgramsCount());
+    _settleRewardPrograms(tokenId, 0, programPoints);
+
+    uint256 storageSlot = getIncentiveDataSlot(tokenId);
+    (
+      uint256 poolId,
+      X59 qMin,
+      X59 qMax,
+      uint256 shares,
+      uint256 evanescentPointsPerShareSubtrahend,
+      uint256 evanescentPointsOwed
+    ) = readIncentiveData(storageSlot);
+
+    // All of the positions share the same range. Hence, they are settled at
+    // the same 'evanescentPointsPerShare'.
+    uint256 evanescentPointsPerShare = calculateEvanescentPointsPerShare(
+      poolId,
+      qMin,
+      qMax
     );
+    unchecked {
+      // All operations are safe because 
+      // 'evanescentPointsPerShareSubtrahend <= evanescentPointsPerShare <= 
+      // 2 ** 96 - 1'
+      evanescentPointsOwed += shares * (
+        evanescentPointsPerShare - evanescentPointsPerShareSubtrahend
+      );
+    }
 
-    // Calculate the amount of reward to be collected.
-    if (totalEvanescentPointsOwed != 0) {
-      // 'mulDiv' is safe because 
-      // 'evanescentPointsOwed <= totalEvanescentPointsOwed'.
-      amount = FullMathLibrary.mulDiv(
-        rewardToken.allowance(payMaster, address(this)),
-        evanescentPointsOwed,
-        totalEvanescentPointsOwed
+    uint256 sharesMerged;
+    uint256 length = tokenIds.length;
+    for (uint256 k = 1; k < length; ++k) {
+      uint256 otherTokenId = tokenIds[k];
+
+      // Check token's ownership. Tokens of a different owner may not be
+      // merged even if 'msg.sender' is authorized to manage them.
+      address otherOwner = _ownerOf(otherTokenId);
+      _checkAuthorized(otherOwner, msg.sender, otherTokenId);
+      require(
+        otherTokenId != tokenId && otherOwner == owner,
+        IncompatiblePositions(tokenId, otherTokenId)
+      );
+
+      uint256 otherStorageSlot = getIncentiveDataSlot(otherTokenId);
+      (
+        uint256 otherPoolId,
+        X59 otherQMin,
+        X59 otherQMax,
+        uint256 otherShares,
+        uint256 otherEvanescentPointsPerShareSubtrahend,
+        uint256 otherEvanescentPointsOwed
+      ) = readIncentiveData(otherStorageSlot);
+      require(
+        otherPoolId == poolId && otherQMin == qMin && otherQMax == qMax,
+        IncompatiblePositions(tokenId, otherTokenId)
+      );
+
+      unchecked {
+        // The additions are safe because the total number of points is capped
+        // by 'totalEvanescentPointsOwed' and the total number of shares is
+        // capped by the pool's 'sharesTotal'.
+        evanescentPointsOwed += otherEvanescentPointsOwed + otherShares * (
+          evanescentPointsPerShare - otherEvanescentPointsPerShareSubtrahend
+        );
+        shares += otherShares;
+        sharesMerged += otherShares;
+      }
+
+      // The merged token is cleared and burned. The conversion is safe
+      // because 'otherShares < 2 ** 128'.
+      emit ModifyShares(
+        otherTokenId,
+        poolId,
+        qMin,
+        qMax,
+        -int256(otherShares)
       );
+      _settleRewardPrograms(otherTokenId, 0, programPoints);
+      clearIncentiveData(otherStorageSlot);
+      if (programPoints.length != 0) {
+        writeStorage(getRewardProgramsStateSlot(otherTokenId), 0);
+      }
+      _burn(otherTokenId);
     }
 
     unchecked {
-      // The subtraction is safe because 
-      // 'evanescentPointsOwed <= totalEvanescentPointsOwed'.
-      writeStorage(
-        totalEvanescentPointsOwedSlot,
-        totalEvanescentPointsOwed - evanescentPointsOwed
-      );      
+      for (uint256 k = 0; k < programPoints.length; ++k) {
+        if (programPoints[k] != 0) {
+          writeStorage(
+            getRewardProgramPointsSlot(tokenId, k + 1),
+            programPoints[k]
+          );
+        }
+      }
     }
 
-    // Transfer the amount.
-    rewardToken.transferFrom(payMaster, msg.sender, amount);
+    _writeIncentiveData(
+      storageSlot,
+      poolId,
+      qMin,
+      qMax,
+      shares,
+      evanescentPointsPerShare,
+      evanescentPointsOwed
+    );
+
+    // The conversion is safe because 'sharesMerged <= shares < 2 ** 128'.
+    emit ModifyShares(tokenId, poolId, qMin, qMax, int256(sharesMerged));
+  }
+
+  /// @inheritdoc IIncentive
+  function split(
+    uint256 tokenId,
+    uint256 shares
+  ) external override returns (
+    uint256 newTokenId
+  ) {
+    // Check token's ownership.
+    address owner = _ownerOf(tokenId);
+    _checkAuthorized(owner, msg.sender, tokenId);
+
+    uint256 storageSlot = getIncentiveDataSlot(tokenId);
+    (
+      uint256 poolId,
+      X59 qMin,
+      X59 qMax,
+      uint256 sharesOld,
+      uint256 evanescentPointsPerShareSubtrahend,
+      uint256 evanescentPointsOwed
+    ) = readIncentiveData(storageSlot);
+    require(shares <= sharesOld, InsufficientShares(tokenId));
+
+    // The points accrued so far remain with 'tokenId'.
+    _settleRewardPrograms(tokenId, 0, new uint256[](0));
+    uint256 evanescentPointsPerShare = calculateEvanescentPointsPerShare(
+      poolId,
+      qMin,
+      qMax
+    );
+    unchecked {
+      // All operations are safe because 'shares <= sharesOld' and
+      // 'evanescentPointsPerShareSubtrahend <= evanescentPointsPerShare <= 
+      // 2 ** 96 - 1'
+      _writeIncentiveData(
+        storageSlot,
+        poolId,
+        qMin,
+        qMax,
+        sharesOld - shares,
+        evanescentPointsPerShare,
+        evanescentPointsOwed + sharesOld * (
+          evanescentPointsPerShare - evanescentPointsPerShareSubtrahend
+        )
+      );
+    }
+
+    // The split shares are given to a new token of the same owner. The
+    // conversion is safe because 'shares <= sharesOld < 2 ** 128'.
+    emit ModifyShares(tokenId, poolId, qMin, qMax, -int256(shares));
+    newTokenId = _mint(poolId, qMin, qMax, shares, owner, 0);
+  }
+
+  /// @inheritdoc IIncentive
+  function pendingPoints(
+    uint256 tokenId
+  ) external view override returns (
+    uint256 evanescentPointsOwed
+  ) {
+    (evanescentPointsOwed, ) = _pendingPoints(tokenId);
+  }
+
+  /// @inheritdoc IIncentive
+  function pendingRewards(
+    uint256[] calldata tokenIds
+  ) external view override returns (
+    uint256[] memory amounts
+  ) {
+    uint256 totalEvanescentPointsOwed = readStorage(
+      totalEvanescentPointsOwedSlot
+    ) & totalEvanescentPointsOwedMask;
+    uint256 allowance = rewardToken.allowance(payMaster, address(this));
+    uint256 length = tokenIds.length;
+    amounts = new uint256[](length);
+    unchecked {
+      for (uint256 k = 0; k < length; ++k) {
+        (
+          uint256 evanescentPointsOwed,
+          uint256 totalEvanescentPointsIncrement
+        ) = _pendingPoints(tokenIds[k]);
+
+        // Only the pending increment of the position's own pool is added.
+        // The addition is safe because the pending increment is bounded as
+        // in '_accountEvanescentPoints'.
+        uint256 total =
+          totalEvanescentPointsOwed + totalEvanescentPointsIncrement;
+
+        // 'mulDiv' is safe because 'evanescentPointsOwed <= total'.
+        if (total != 0) {
+          amounts[k] = FullMathLibrary.mulDiv(
+            allowance,
+            evanescentPointsOwed,
+            total
+          );
+        }
+      }
+    }
+  }
+
+  /// @inheritdoc IIncentive
+  function incentiveData(
+    uint256[] calldata tokenIds
+  ) external view override returns (
+    address[] memory owners,
+    bytes32[3][] memory data
+  ) {
+    uint256 length = tokenIds.length;
+    owners = new address[](length);
+    data = new bytes32[3][](length);
+    unchecked {
+      for (uint256 k = 0; k < length; ++k) {
+        owners[k] = _ownerOf(tokenIds[k]);
+        uint256 storageSlot = getIncentiveDataSlot(tokenIds[k]);
+        uint256 value0 = readStorage(storageSlot);
+        data[k][0] = bytes32(value0);
+        data[k][1] = bytes32(readStorage(storageSlot + 1));
+
+        // The third slot is only populated if 'evanescentPointsOwed' does not
+        // fit in the first one.
+        if (
+          ((value0 >> 96) & evanescentPointsOwedOverflow) == 
+          evanescentPointsOwedOverflow
+        ) {
+          data[k][2] = bytes32(readStorage(storageSlot + 2));
+        }
+      }
+    }
+  }
+
+  /// @inheritdoc IIncentive
+  function addRewardProgram(
+    INofee _rewardToken,
+    address _payMaster,
+    uint32 _startBlock,
+    uint32 _endBlock
+  ) external override returns (
+    uint256 programId
+  ) {
+    require(msg.sender == payMaster, OnlyByPayMaster(msg.sender));
+    require(
+      _startBlock > uint32(block.number),
+      InvalidStartBlock(_startBlock, uint32(block.number))
+    );
+    require(
+      _endBlock > _startBlock,
+      InvalidEndBlock(_endBlock, _startBlock)
+    );
+    require(
+      startBlock <= _startBlock && _endBlock <= endBlock,
+      RewardProgramOutOfWindow(_startBlock, _endBlock)
+    );
+
+    // The number of reward programs occupies the most significant byte of
+    // 'totalEvanescentPointsOwedSlot'.
+    uint256 value = readStorage(totalEvanescentPointsOwedSlot);
+    uint256 count = value >> 248;
+    require(count < maxRewardPrograms, TooManyRewardPrograms());
+    unchecked {
+      programId = count + 1;
+      writeStorage(totalEvanescentPointsOwedSlot, value + (1 << 248));
+    }
+
+    writeRewardProgram(
+      getRewardProgramSlot(programId),
+      _rewardToken,
+      _startBlock,
+      _endBlock,
+      _payMaster
+    );
+  }
+
+  /// @inheritdoc IIncentive
+  function acceptRewardProgram(uint256 programId) external override {
+    require(
+      programId != 0 && programId <= readRewardProgramsCount(),
+      InvalidRewardProgram(programId)
+    );
+    uint256 storageSlot = getRewardProgramSlot(programId);
+    (
+      ,
+      uint32 programStartBlock,
+      ,
+      address programPayMaster
+    ) = readRewardProgram(storageSlot);
+    require(msg.sender == programPayMaster, OnlyByPayMaster(msg.sender));
+    require(
+      programStartBlock > uint32(block.number),
+      InvalidStartBlock(programStartBlock, uint32(block.number))
+    );
+    writeRewardProgramAccepted(storageSlot);
+  }
+
+  /// @inheritdoc IIncentive
+  function rewardProgramsCount() external view override returns (uint256) {
+    return readRewardProgramsCount();
+  }
+
+  /// @inheritdoc IIncentive
+  function collectRewardProgram(
+    uint256 programId
+  ) external override returns (
+    uint256 amount
+  ) {
+    require(
+      programId != 0 && programId <= readRewardProgramsCount(),
+      InvalidRewardProgram(programId)
+    );
+    uint256 storageSlot = getUnpaidRewardProgramPointsSlot(
+      msg.sender,
+      programId
+    );
+    uint256 evanescentPointsOwed = readStorage(storageSlot);
+    writeStorage(storageSlot, 0);
+
+    // If the payment fails again, the points are kept for 'msg.sender'.
+    amount = _payRewardProgram(programId, evanescentPointsOwed);
+  }
+
+  /// @inheritdoc IIncentive
+  function unpaidRewardProgramPoints(
+    address owner,
+    uint256 programId
+  ) external view override returns (uint256) {
+    return readStorage(getUnpaidRewardProgramPointsSlot(owner, programId));
+  }
+
+  /// @inheritdoc IIncentive
+  function rewardProgram(
+    uint256 programId
+  ) external view override returns (
+    INofee programRewardToken,
+    address programPayMaster,
+    uint32 programStartBlock,
+    uint32 programEndBlock,
+    bool accepted,
+    uint256 totalEvanescentPointsOwed
+  ) {
+    if (programId == 0) {
+      return (
+        rewardToken,
+        payMaster,
+        startBlock,
+        endBlock,
+        true,
+        readStorage(totalEvanescentPointsOwedSlot) &
+          totalEvanescentPointsOwedMask
+      );
+    }
+    require(
+      programId <= readRewardProgramsCount(),
+      InvalidRewardProgram(programId)
+    );
+    uint256 storageSlot = getRewardProgramSlot(programId);
+    (
+      programRewardToken,
+      programStartBlock,
+      programEndBlock,
+      programPayMaster
+    ) = readRewardProgram(storageSlot);
+    accepted = readRewardProgramAccepted(storageSlot);
+    unchecked {
+      totalEvanescentPointsOwed = readStorage(storageSlot + 2);
+    }
   }
 
   modifier onlyNofeeswap() {
@@ -281,42 +727,38 @@ contract Incentive is
       recipient := calldataload(add(hookData, 32))
     }
 
-    // Accounting for evanescent points in the pool.
-    _accountEvanescentPoints();
+    // The calldata fields which are used more than once are decoded once.
+    uint256 poolId = getPoolIdFromCalldata();
+    X59 qMin = getLogPriceMinOffsettedFromCalldata();
+    X59 qMax = getLogPriceMaxOffsettedFromCalldata();
+    int256 shares = getSharesFromCalldata();
+
+    // Accounting for evanescent points in the pool. The resulting pool data is
+    // carried over to the position update so that it is not read again.
+    uint256 poolData = _accountEvanescentPoints(poolId);
 
     // If no 'tokenId' is provided, a new NFT is issued.
     if (tokenId == 0) {
-      _mint(
-        getPoolIdFromCalldata(),
-        getLogPriceMinOffsettedFromCalldata(),
-        getLogPriceMaxOffsettedFromCalldata(),
-        uint256(getSharesFromCalldata()),
-        recipient
-      );
+      _mint(poolId, qMin, qMax, uint256(shares), recipient, poolData);
     // Otherwise, the number of positions for the given 'tokenId' are
     // incremented.
     } else {
       require(_requireOwned(tokenId) == recipient, NotTokenOwner(recipient));
 
-      modifyIncentiveShares(
+      _settleRewardPrograms(tokenId, poolData, new uint256[](0));
+      _modifyIncentiveShares(
         tokenId,
-        calculateEvanescentPointsPerShare(
-          getPoolIdFromCalldata(),
-          getLogPriceMinOffsettedFromCalldata(),
-          getLogPriceMaxOffsettedFromCalldata()
-        ),
-        getSharesFromCalldata()
+        calculateEvanescentPointsPerShare(poolId, qMin, qMax, poolData),
+        shares
       );
+      emit ModifyShares(tokenId, poolId, qMin, qMax, shares);
     }
 
     // Shares mint for 'address(this)' to be paid by the operator.
     INofeeswap(msg.sender).modifyBalance(
       address(this),
-      getPoolIdFromCalldata().tag(
-        getLogPriceMinFromCalldata(),
-        getLogPriceMaxFromCalldata()
-      ),
-      getSharesFromCalldata()
+      poolId.tag(getLogPriceMinFromCalldata(), getLogPriceMaxFromCalldata()),
+      shares
     );
 
     return IHook.midMint.selector;
@@ -339,37 +781,38 @@ contract Incentive is
     // Checking the owner of 'tokenId'.
     require(_requireOwned(tokenId) == recipient, NotTokenOwner(recipient));
 
-    // Accounting for evanescent points in the pool.
-    _accountEvanescentPoints();
+    // The calldata fields which are used more than once are decoded once.
+    uint256 poolId = getPoolIdFromCalldata();
+    X59 qMin = getLogPriceMinOffsettedFromCalldata();
+    X59 qMax = getLogPriceMaxOffsettedFromCalldata();
+    int256 shares = getSharesFromCalldata();
+
+    // Accounting for evanescent points in the pool. The resulting pool data is
+    // carried over to the position update so that it is not read again.
+    uint256 poolData = _accountEvanescentPoints(poolId);
 
     // The number of positions for the given 'tokenId' are decremented.
-    modifyIncentiveShares(
+    _settleRewardPrograms(tokenId, poolData, new uint256[](0));
+    _modifyIncentiveShares(
       tokenId,
-      calculateEvanescentPointsPerShare(
-        getPoolIdFromCalldata(),
-        getLogPriceMinOffsettedFromCalldata(),
-        getLogPriceMaxOffsettedFromCalldata()
-      ),
-      getSharesFromCalldata()
+      calculateEvanescentPointsPerShare(poolId, qMin, qMax, poolData),
+      shares
     );
+    emit ModifyShares(tokenId, poolId, qMin, qMax, shares);
 
     // Shares are transferred to 'recipient' to be burned by the operator.
     unchecked {
-      Tag tag = getPoolIdFromCalldata().tag(
+      Tag tag = poolId.tag(
         getLogPriceMinFromCalldata(),
         getLogPriceMaxFromCalldata()
       );
-      INofeeswap(msg.sender).modifyBalance(
-        address(this),
-        tag,
-        getSharesFromCalldata()
-      );
+      INofeeswap(msg.sender).modifyBalance(address(this), tag, shares);
       INofeeswap(msg.sender).transferTransientBalanceFrom(
         address(this),
         recipient,
         tag,
         // The subtraction is safe because we are burning.
-        uint256(0 - getSharesFromCalldata())
+        uint256(0 - shares)
       );
     }
 
@@ -382,7 +825,7 @@ contract Incentive is
   ) external override(BaseHook, IHook) onlyNofeeswap returns (bytes4) {
 
     // Accounting for evanescent points in the pool.
-    _accountEvanescentPoints();
+    _accountEvanescentPoints(getPoolIdFromCalldata());
 
     return IHook.midSwap.selector;
   }
@@ -393,7 +836,7 @@ contract Incentive is
   ) external override(BaseHook, IHook) onlyNofeeswap returns (bytes4) {
 
     // Accounting for evanescent points in the pool.
-    _accountEvanescentPoints();
+    _accountEvanescentPoints(getPoolIdFromCalldata());
 
     return IHook.midDonate.selector;
   }
@@ -401,10 +844,14 @@ contract Incentive is
   /// @notice Updates 'totalEvanescentPointsOwed' and 
   /// 'evanescentPointsPerShareMapping'. Should be triggered with each 
   /// modifyPosition, swap, and donate.
-  function _accountEvanescentPoints() internal {
-    // Cache 'poolId'.
-    uint256 poolId = getPoolIdFromCalldata();
-
+  /// @param poolId The poolId which is decoded from calldata by the caller.
+  /// @return poolData The content of the pool's data slot after accounting or
+  /// '0' if the slot is not read.
+  function _accountEvanescentPoints(
+    uint256 poolId
+  ) internal returns (
+    uint256 poolData
+  ) {
     // Cache the current block and return if it is prior to the start of the
     // incentive program or if the incentive program is ended.
     uint32 currentBlock = uint32(block.number);
@@ -414,19 +861,33 @@ contract Incentive is
     // Read the current pool's data and return if 'currentBlock' is equal to 
     // the last block in which the pool is touched.
     uint256 poolDataSlot = getPoolDataSlot(poolId);
+    poolData = readStorage(poolDataSlot);
     (
       uint32 lastBlockAccounted,
       X59 lastLower,
       X59 lastUpper,
       uint256 lastActiveEvanescentPointsPerShare
-    ) = readPoolData(readStorage(poolDataSlot));
-    if (currentBlock == lastBlockAccounted) return;
+    ) = readPoolData(poolData);
+    if (currentBlock == lastBlockAccounted) return poolData;
+
+    // The number of reward programs is read along with
+    // 'totalEvanescentPointsOwed' which is updated below.
+    uint256 rewardProgramsCount = readRewardProgramsCount();
 
     // Read current active interval's boundaries from calldata.
     (X59 currentLower, X59 currentUpper) = _getBoundaries();
 
     // In this case, 'evanescentPointsPerShareMapping' needs to be updated.
     if (lastLower != currentLower) {
+      // The entries which are overwritten are preserved as of these blocks.
+      uint256[] memory boundaries;
+      if (rewardProgramsCount != 0) {
+        boundaries = _rewardProgramBoundaries(
+          rewardProgramsCount,
+          lastBlockAccounted
+        );
+      }
+
       uint256 pointsPerShareLowerSlot = getEvanescentPointsPerShareMappingSlot(
         poolId,
         lastLower
@@ -435,8 +896,10 @@ contract Incentive is
         poolId,
         lastUpper
       );
-      uint256 pointsPerShareLower = readStorage(pointsPerShareLowerSlot);
-      uint256 pointsPerShareUpper = readStorage(pointsPerShareUpperSlot);
+      uint256 pointsPerShareLower = 
+        readStorage(pointsPerShareLowerSlot) & evanescentPointsPerShareMask;
+      uint256 pointsPerShareUpper = 
+        readStorage(pointsPerShareUpperSlot) & evanescentPointsPerShareMask;
 
       // In this case, the current active interval is ahead of the previous one.
       while (lastLower < currentLower) {
@@ -446,7 +909,12 @@ contract Incentive is
           pointsPerShareLower += lastActiveEvanescentPointsPerShare;
         }
 
-        writeStorage(pointsPerShareUpperSlot, pointsPerShareLower);
+        writeEvanescentPointsPerShare(
+          pointsPerShareUpperSlot,
+          pointsPerShareLower,
+          lastBlockAccounted,
+          boundaries
+        );
 
         unchecked {
           (lastLower, lastUpper) = (
@@ -463,7 +931,8 @@ contract Incentive is
 
         uint256 pointsPerShareTransition = pointsPerShareUpper;
 
-        pointsPerShareUpper = readStorage(pointsPerShareUpperSlot);
+        pointsPerShareUpper = 
+          readStorage(pointsPerShareUpperSlot) & evanescentPointsPerShareMask;
 
         unchecked {
           // Let 'l < t < u' denote the interval consecutive boundaries, 
@@ -483,7 +952,12 @@ contract Incentive is
           pointsPerShareUpper += lastActiveEvanescentPointsPerShare;
         }
 
-        writeStorage(pointsPerShareLowerSlot, pointsPerShareUpper);
+        writeEvanescentPointsPerShare(
+          pointsPerShareLowerSlot,
+          pointsPerShareUpper,
+          lastBlockAccounted,
+          boundaries
+        );
 
         unchecked {
           (lastLower, lastUpper) = (
@@ -500,7 +974,8 @@ contract Incentive is
 
         uint256 pointsPerShareTransition = pointsPerShareLower;
 
-        pointsPerShareLower = readStorage(pointsPerShareLowerSlot);
+        pointsPerShareLower = 
+          readStorage(pointsPerShareLowerSlot) & evanescentPointsPerShareMask;
 
         unchecked {
           // Let 'l < t < u' denote the interval consecutive boundaries, 
@@ -518,21 +993,14 @@ contract Incentive is
     uint256 pointsPerShareIncrement;
     if (getGrowthFromCalldata() <= maxIncentiveGrowth) {
       unchecked {
-        pointsPerShareIncrement = (currentBlock - lastBlockAccounted) * (
-          geometricMean(
-            getIntegral0FromCalldata(),
-            getIntegral1FromCalldata()
-          ) * uint256(X111.unwrap(getGrowthFromCalldata()))
-        );
-        uint256 outgoingMax = uint256(
-          X216.unwrap(getOutgoingMaxFromCalldata())
+        pointsPerShareIncrement = _calculatePointsPerShareIncrement(
+          currentBlock - lastBlockAccounted,
+          getGrowthFromCalldata(),
+          getIntegral0FromCalldata(),
+          getIntegral1FromCalldata(),
+          getOutgoingMaxFromCalldata(),
+          getOutgoingMaxModularInverseFromCalldata()
         );
-        uint256 twos = (0 - outgoingMax) & outgoingMax;
-        pointsPerShareIncrement = (
-          (
-            pointsPerShareIncrement - (pointsPerShareIncrement % outgoingMax)
-          ) / twos
-        ) * getOutgoingMaxModularInverseFromCalldata();
         lastActiveEvanescentPointsPerShare += pointsPerShareIncrement;
       }
     }
@@ -550,22 +1018,693 @@ contract Incentive is
     //  'lastActiveEvanescentPointsPerShare <= ----------------------------'
     //                                                  2 ** 104
     //
-    writePoolData(
+    poolData = writePoolData(
       poolDataSlot,
       currentBlock,
       currentLower,
       currentUpper,
       lastActiveEvanescentPointsPerShare
     );
+    uint256 sharesTotal = getSharesTotalFromCalldata();
+    uint256 totalIncrement;
     unchecked {
       // The multiplication is safe because 
       // 'pointsPerShareIncrement < type(uint96).max'
-      updateTotalEvanescentPointsOwed(
-        pointsPerShareIncrement * getSharesTotalFromCalldata()
+      totalIncrement = pointsPerShareIncrement * sharesTotal;
+    }
+    updateTotalEvanescentPointsOwed(totalIncrement);
+
+    // The same increment is fanned out to the additional reward programs.
+    if (rewardProgramsCount != 0) {
+      _accountRewardPrograms(
+        poolId,
+        rewardProgramsCount,
+        lastBlockAccounted,
+        currentBlock,
+        poolData,
+        pointsPerShareIncrement,
+        sharesTotal
+      );
+    }
+  }
+
+  /// @notice Lists the start and end blocks of the accepted reward programs
+  /// which are prior to 'lastBlockAccounted'. These are the blocks as of
+  /// which the overwritten entries of 'evanescentPointsPerShareMapping' are
+  /// preserved.
+  function _rewardProgramBoundaries(
+    uint256 rewardProgramsCount,
+    uint32 lastBlockAccounted
+  ) internal view returns (
+    uint256[] memory boundaries
+  ) {
+    boundaries = new uint256[](2 * rewardProgramsCount);
+    uint256 length;
+    for (uint256 programId = 1; programId <= rewardProgramsCount; ++programId) {
+      uint256 value = readStorage(getRewardProgramSlot(programId));
+      if ((value & rewardProgramAcceptedFlag) == 0) continue;
+      uint256 programStartBlock = value >> 224;
+      uint256 programEndBlock = (value >> 192) & 0xFFFFFFFF;
+      unchecked {
+        if (programStartBlock < lastBlockAccounted) {
+          boundaries[length++] = programStartBlock;
+        }
+        if (programEndBlock < lastBlockAccounted) {
+          boundaries[length++] = programEndBlock;
+        }
+      }
+    }
+    assembly ("memory-safe") {
+      mstore(boundaries, length)
+    }
+  }
+
+  /// @notice Adds to the 'totalEvanescentPointsOwed' of every accepted reward
+  /// program the points accrued by a pool within the program's window. The
+  /// active interval accrues 'pointsPerShareIncrement' uniformly from
+  /// 'lastBlockAccounted' to 'currentBlock'. Hence, the program's portion is
+  /// the increment accrued after its 'startBlock' and up to its 'endBlock'.
+  /// The pool's data is preserved as of every start or end block in this
+  /// span so that positions are settled at the boundaries of the program.
+  /// @param poolData The content of the pool's data slot after accounting.
+  function _accountRewardPrograms(
+    uint256 poolId,
+    uint256 rewardProgramsCount,
+    uint32 lastBlockAccounted,
+    uint32 currentBlock,
+    uint256 poolData,
+    uint256 pointsPerShareIncrement,
+    uint256 sharesTotal
+  ) internal {
+    for (uint256 programId = 1; programId <= rewardProgramsCount; ++programId) {
+      uint256 storageSlot = getRewardProgramSlot(programId);
+
+      //
+      //     4 bytes      4 bytes    4 bytes             20 bytes
+      //  +------------+----------+---------+----------------------------------+
+      //  | startBlock | endBlock | accepted|           rewardToken            |
+      //  +------------+----------+---------+----------------------------------+
+      //
+      uint256 value = readStorage(storageSlot);
+      if ((value & rewardProgramAcceptedFlag) == 0) continue;
+      uint32 from;
+      uint32 to;
+      assembly {
+        from := shr(224, value)
+        to := and(shr(192, value), 0xFFFFFFFF)
+      }
+      _writePoolDataSnapshot(
+        poolId,
+        from,
+        lastBlockAccounted,
+        currentBlock,
+        poolData,
+        pointsPerShareIncrement
+      );
+      _writePoolDataSnapshot(
+        poolId,
+        to,
+        lastBlockAccounted,
+        currentBlock,
+        poolData,
+        pointsPerShareIncrement
+      );
+      if (from < lastBlockAccounted) from = lastBlockAccounted;
+      if (currentBlock < to) to = currentBlock;
+
+      // In this case, the blocks from 'from' to 'to' belong to the program.
+      if (from < to) {
+        unchecked {
+          storageSlot += 2;
+          // The subtraction is safe because 'from < to' and the
+          // multiplication is safe because 
+          // 'pointsPerShareIncrement < type(uint96).max'.
+          writeStorage(
+            storageSlot,
+            readStorage(storageSlot) + (
+              _pointsPerShareIncrementUntil(
+                to,
+                lastBlockAccounted,
+                currentBlock,
+                pointsPerShareIncrement
+              ) - _pointsPerShareIncrementUntil(
+                from,
+                lastBlockAccounted,
+                currentBlock,
+                pointsPerShareIncrement
+              )
+            ) * sharesTotal
+          );
+        }
+      }
+    }
+  }
+
+  /// @notice Preserves the data of a pool as of 'blockNumber' if it is
+  /// within 'lastBlockAccounted' and 'currentBlock'. The active interval is
+  /// the current one with the increment accrued up to 'blockNumber'.
+  /// @param poolData The content of the pool's data slot after accounting.
+  function _writePoolDataSnapshot(
+    uint256 poolId,
+    uint32 blockNumber,
+    uint32 lastBlockAccounted,
+    uint32 currentBlock,
+    uint256 poolData,
+    uint256 pointsPerShareIncrement
+  ) internal {
+    if (blockNumber < lastBlockAccounted) return;
+    if (currentBlock <= blockNumber) return;
+    (
+      ,
+      X59 currentLower,
+      X59 currentUpper,
+      uint256 activeEvanescentPointsPerShare
+    ) = readPoolData(poolData);
+    unchecked {
+      // The subtraction is safe because the portion of the increment does not
+      // exceed the increment which is included in the active interval.
+      writePoolData(
+        getPoolDataSnapshotSlot(poolId, blockNumber),
+        blockNumber,
+        currentLower,
+        currentUpper,
+        activeEvanescentPointsPerShare - pointsPerShareIncrement +
+          _pointsPerShareIncrementUntil(
+            blockNumber,
+            lastBlockAccounted,
+            currentBlock,
+            pointsPerShareIncrement
+          )
+      );
+    }
+  }
+
+  /// @notice The portion of 'pointsPerShareIncrement' which is accrued from
+  /// 'lastBlockAccounted' up to 'blockNumber'.
+  function _pointsPerShareIncrementUntil(
+    uint32 blockNumber,
+    uint32 lastBlockAccounted,
+    uint32 currentBlock,
+    uint256 pointsPerShareIncrement
+  ) internal pure returns (
+    uint256
+  ) {
+    unchecked {
+      // 'mulDiv' is safe because
+      // 'lastBlockAccounted <= blockNumber <= currentBlock'.
+      return FullMathLibrary.mulDiv(
+        pointsPerShareIncrement,
+        blockNumber - lastBlockAccounted,
+        currentBlock - lastBlockAccounted
+      );
+    }
+  }
+
+  /// @notice Calculates the evanescent points per share accrued by the active
+  /// interval over the given number of blocks, i.e.,
+  ///
+  ///  blocks * growth * sqrt(integral0 * integral1)
+  /// -----------------------------------------------
+  ///                  outgoingMax
+  ///
+  function _calculatePointsPerShareIncrement(
+    uint256 blocks,
+    X111 growth,
+    X216 integral0,
+    X216 integral1,
+    X216 outgoingMax,
+    uint256 outgoingMaxModularInverse
+  ) internal pure returns (
+    uint256 pointsPerShareIncrement
+  ) {
+    unchecked {
+      pointsPerShareIncrement = blocks * (
+        geometricMeanFast(integral0, integral1) * uint256(X111.unwrap(growth))
+      );
+      uint256 _outgoingMax = uint256(X216.unwrap(outgoingMax));
+      uint256 twos = (0 - _outgoingMax) & _outgoingMax;
+      pointsPerShareIncrement = (
+        (
+          pointsPerShareIncrement - (pointsPerShareIncrement % _outgoingMax)
+        ) / twos
+      ) * outgoingMaxModularInverse;
+    }
+  }
+
+  /// @notice Calculates the evanescent points owed to a position as if its
+  /// pool were accounted in the current block.
+  /// @return evanescentPointsOwed The points that the position would collect.
+  /// @return totalEvanescentPointsIncrement The pending increment of
+  /// 'totalEvanescentPointsOwed' due to the position's pool.
+  function _pendingPoints(
+    uint256 tokenId
+  ) internal view returns (
+    uint256 evanescentPointsOwed,
+    uint256 totalEvanescentPointsIncrement
+  ) {
+    _requireOwned(tokenId);
+
+    (
+      uint256 poolId,
+      X59 qMin,
+      X59 qMax,
+      uint256 shares,
+      uint256 evanescentPointsPerShareSubtrahend,
+      uint256 evanescentPointsOwedStored
+    ) = readIncentiveData(getIncentiveDataSlot(tokenId));
+
+    uint256 evanescentPointsPerShare = calculateEvanescentPointsPerShare(
+      poolId,
+      qMin,
+      qMax
+    );
+
+    (
+      uint256 pointsPerShareIncrement,
+      uint256 sharesTotal,
+      X59 logPriceCurrent
+    ) = _pendingPointsPerShareIncrement(poolId);
+
+    unchecked {
+      // The pending points belong to the current active interval which is
+      // within the position's range if and only if the current price is
+      // strictly between 'qMin' and 'qMax'. Otherwise, either the interval is
+      // outside of the range or the price is at the boundary of the active
+      // interval in which case no points are accrued.
+      if (qMin < logPriceCurrent && logPriceCurrent < qMax) {
+        evanescentPointsPerShare += pointsPerShareIncrement;
+      }
+
+      // The multiplication is safe because
+      // 'pointsPerShareIncrement < type(uint96).max'
+      totalEvanescentPointsIncrement = pointsPerShareIncrement * sharesTotal;
+
+      // All operations are safe because
+      // 'evanescentPointsPerShareSubtrahend <= evanescentPointsPerShare <=
+      // 2 ** 96 - 1'
+      evanescentPointsOwed = evanescentPointsOwedStored + shares * (
+        evanescentPointsPerShare - evanescentPointsPerShareSubtrahend
+      );
+    }
+  }
+
+  /// @notice Calculates the evanescent points per share that the current
+  /// active interval of a pool has accrued since 'lastBlockAccounted' but
+  /// which are not accounted yet. The pool's dynamic and static parameters
+  /// are read from nofeeswap's storage via the inherited 'Access' readers.
+  function _pendingPointsPerShareIncrement(
+    uint256 poolId
+  ) internal view returns (
+    uint256 pointsPerShareIncrement,
+    uint256 sharesTotal,
+    X59 logPriceCurrent
+  ) {
+    // Same as '_accountEvanescentPoints', nothing is accrued prior to the
+    // start or after the end of the incentive program.
+    uint32 currentBlock = uint32(block.number);
+    if (currentBlock <= startBlock) return (0, 0, logPriceCurrent);
+    if (endBlock < currentBlock) return (0, 0, logPriceCurrent);
+
+    (uint32 lastBlockAccounted, , , ) = readPoolData(
+      readStorage(getPoolDataSlot(poolId))
+    );
+    if (currentBlock == lastBlockAccounted) return (0, 0, logPriceCurrent);
+
+    X111 growth;
+    X216 integral0;
+    X216 integral1;
+    uint256 staticParamsStoragePointer;
+    (
+      ,
+      growth,
+      integral0,
+      integral1,
+      sharesTotal,
+      staticParamsStoragePointer,
+      logPriceCurrent
+    ) = this._readDynamicParams(IStorageAccess(nofeeswap), poolId);
+
+    if (growth <= maxIncentiveGrowth) {
+      (
+        X216 outgoingMax,
+        uint256 outgoingMaxModularInverse,
+        ,
+        ,
+        ,
+        ,
+      ) = this._readStaticParams1(
+        IStorageAccess(nofeeswap),
+        poolId,
+        staticParamsStoragePointer
+      );
+
+      unchecked {
+        pointsPerShareIncrement = _calculatePointsPerShareIncrement(
+          currentBlock - lastBlockAccounted,
+          growth,
+          integral0,
+          integral1,
+          outgoingMax,
+          outgoingMaxModularInverse
+        );
+      }
+    }
+  }
+
+  /// @notice Converts the given evanescent points to reward tokens, deducts
+  /// them from 'totalEvanescentPointsOwed' and transfers the reward to
+  /// 'msg.sender'. The additional reward programs are paid afterwards.
+  ///
+  /// Since the ratio 'rewardAllowance / totalEvanescentPointsOwed' is
+  /// preserved by every collect, paying the aggregated points of several
+  /// positions at once amounts to collecting them one by one.
+  /// @param evanescentPointsOwed The points collected for 'programId == 0'.
+  /// @param programPoints The points collected for every additional reward
+  /// program, i.e., 'programPoints[programId - 1]'.
+  function _payRewards(
+    uint256 evanescentPointsOwed,
+    uint256[] memory programPoints
+  ) internal returns (
+    uint256 amount
+  ) {
+    // Read the total amount owed which shares its slot with the number of
+    // reward programs.
+    uint256 value = readStorage(totalEvanescentPointsOwedSlot);
+    uint256 totalEvanescentPointsOwed = value & totalEvanescentPointsOwedMask;
+
+    // Calculate the amount of reward to be collected.
+    if (totalEvanescentPointsOwed != 0) {
+      // 'mulDiv' is safe because 
+      // 'evanescentPointsOwed <= totalEvanescentPointsOwed'.
+      amount = FullMathLibrary.mulDiv(
+        rewardToken.allowance(payMaster, address(this)),
+        evanescentPointsOwed,
+        totalEvanescentPointsOwed
+      );
+    }
+
+    unchecked {
+      // The subtraction is safe because 
+      // 'evanescentPointsOwed <= totalEvanescentPointsOwed'. Hence, the
+      // number of reward programs remains intact.
+      writeStorage(totalEvanescentPointsOwedSlot, value - evanescentPointsOwed);
+    }
+
+    // Transfer the amount.
+    rewardToken.transferFrom(payMaster, msg.sender, amount);
+    emit Collect(msg.sender, evanescentPointsOwed, amount);
+
+    // Pay the additional reward programs.
+    uint256 length = programPoints.length;
+    for (uint256 k = 0; k < length; ++k) {
+      if (programPoints[k] != 0) {
+        unchecked {
+          _payRewardProgram(k + 1, programPoints[k]);
+        }
+      }
+    }
+  }
+
+  /// @notice Converts the given evanescent points of a reward program to the
+  /// program's reward token the same way as '_payRewards' and transfers them
+  /// to 'msg.sender'. The payment fails on its own if the program's token
+  /// reverts or returns 'false', in which case the points are kept for
+  /// 'msg.sender' to be claimed via 'collectRewardProgram'.
+  /// @param programId The identifier of the program.
+  /// @param evanescentPointsOwed The points collected for the program.
+  /// @return amount The amount paid which is '0' if the payment fails.
+  function _payRewardProgram(
+    uint256 programId,
+    uint256 evanescentPointsOwed
+  ) internal returns (
+    uint256 amount
+  ) {
+    uint256 storageSlot = getRewardProgramSlot(programId);
+    (
+      INofee programRewardToken,
+      ,
+      ,
+      address programPayMaster
+    ) = readRewardProgram(storageSlot);
+    unchecked {
+      storageSlot += 2;
+    }
+
+    // The program owes at least the points of every position and of every
+    // failed payment. Hence, 'evanescentPointsOwed <= programTotal'.
+    uint256 programTotal = readStorage(storageSlot);
+
+    (bool success, uint256 allowance) = _tryAllowance(
+      programRewardToken,
+      programPayMaster
+    );
+    if (success && programTotal != 0) {
+      // 'mulDiv' is safe because 'evanescentPointsOwed <= programTotal'.
+      amount = FullMathLibrary.mulDiv(
+        allowance,
+        evanescentPointsOwed,
+        programTotal
+      );
+
+      unchecked {
+        // The subtraction is safe because
+        // 'evanescentPointsOwed <= programTotal'.
+        writeStorage(storageSlot, programTotal - evanescentPointsOwed);
+      }
+
+      success = _tryTransferFrom(
+        programRewardToken,
+        programPayMaster,
+        msg.sender,
+        amount
+      );
+    } else {
+      success = false;
+    }
+
+    if (success) {
+      emit CollectRewardProgram(
+        msg.sender,
+        programId,
+        evanescentPointsOwed,
+        amount
+      );
+    } else {
+      // The program still owes the points which are kept for 'msg.sender'.
+      amount = 0;
+      writeStorage(storageSlot, programTotal);
+      uint256 unpaidSlot = getUnpaidRewardProgramPointsSlot(
+        msg.sender,
+        programId
+      );
+      unchecked {
+        // The addition is safe because the sum is capped by 'programTotal'.
+        writeStorage(
+          unpaidSlot,
+          readStorage(unpaidSlot) + evanescentPointsOwed
+        );
+      }
+      emit RewardProgramPaymentFailed(
+        msg.sender,
+        programId,
+        evanescentPointsOwed
       );
     }
   }
 
+  /// @notice Reads 'token.allowance(owner, address(this))' without reverting
+  /// if 'token' reverts or returns less than a word.
+  function _tryAllowance(
+    INofee token,
+    address owner
+  ) internal view returns (
+    bool success,
+    uint256 allowance
+  ) {
+    assembly ("memory-safe") {
+      let pointer := mload(0x40)
+      // 0xdd62ed3e = bytes4(keccak256("allowance(address,address)"))
+      mstore(pointer, shl(224, 0xdd62ed3e))
+      mstore(add(pointer, 4), owner)
+      mstore(add(pointer, 36), address())
+      success := and(
+        staticcall(gas(), token, pointer, 68, 0, 32),
+        gt(returndatasize(), 31)
+      )
+      allowance := mul(mload(0), success)
+    }
+  }
+
+  /// @notice Calls 'token.transferFrom(from, to, amount)' without reverting
+  /// if 'token' reverts. Tokens which return no data are accepted as long as
+  /// they have code. Otherwise, 'true' should be returned.
+  function _tryTransferFrom(
+    INofee token,
+    address from,
+    address to,
+    uint256 amount
+  ) internal returns (
+    bool success
+  ) {
+    assembly ("memory-safe") {
+      let pointer := mload(0x40)
+      // 0x23b872dd = bytes4(keccak256("transferFrom(address,address,uint256)"))
+      mstore(pointer, shl(224, 0x23b872dd))
+      mstore(add(pointer, 4), from)
+      mstore(add(pointer, 36), to)
+      mstore(add(pointer, 68), amount)
+      mstore(0, 0)
+      success := and(
+        call(gas(), token, 0, pointer, 100, 0, 32),
+        or(
+          and(gt(returndatasize(), 31), eq(mload(0), 1)),
+          and(iszero(returndatasize()), gt(extcodesize(token), 0))
+        )
+      )
+    }
+  }
+
+  /// @notice Settles the evanescent points that a position has accrued within
+  /// the window of every accepted reward program since it was last touched.
+  /// Should be called right before the position's
+  /// 'evanescentPointsPerShareSubtrahend' is updated. If the position has not
+  /// started accruing points for a program, it is settled from the program's
+  /// 'startBlock'. If the program is ended, the position is settled up to the
+  /// program's 'endBlock' and never again.
+  /// @param tokenId The corresponding tokenId of the incentive position.
+  /// @param poolData Output of '_accountEvanescentPoints' or '0' in which case
+  /// the pool's data slot is read.
+  /// @param programPoints If empty, the settled points are kept by the
+  /// position. Otherwise, the settled points along with those kept by the
+  /// position are collected in 'programPoints[programId - 1]'.
+  function _settleRewardPrograms(
+    uint256 tokenId,
+    uint256 poolData,
+    uint256[] memory programPoints
+  ) internal {
+    uint256 rewardProgramsCount = readRewardProgramsCount();
+    if (rewardProgramsCount == 0) return;
+
+    (
+      uint256 poolId,
+      X59 qMin,
+      X59 qMax,
+      uint256 shares,
+      uint256 evanescentPointsPerShareSubtrahend,
+    ) = readIncentiveData(getIncentiveDataSlot(tokenId));
+    if (poolData == 0) poolData = readStorage(getPoolDataSlot(poolId));
+
+    // No reward program starts prior to 'startBlock'.
+    uint32 lastBlockAccounted = uint32(poolData >> 224);
+    if (lastBlockAccounted <= startBlock) return;
+
+    uint256 evanescentPointsPerShare = calculateEvanescentPointsPerShare(
+      poolId,
+      qMin,
+      qMax,
+      poolData
+    );
+
+    uint256 stateSlot = getRewardProgramsStateSlot(tokenId);
+    uint256 stateOld = readStorage(stateSlot);
+    uint256 state = stateOld;
+    bool collected = programPoints.length != 0;
+    for (uint256 programId = 1; programId <= rewardProgramsCount; ++programId) {
+      uint256 value = readStorage(getRewardProgramSlot(programId));
+      if ((value & rewardProgramAcceptedFlag) == 0) continue;
+      uint32 programStartBlock;
+      uint32 programEndBlock;
+      assembly {
+        programStartBlock := shr(224, value)
+        programEndBlock := and(shr(192, value), 0xFFFFFFFF)
+      }
+
+      // No points are accrued prior to the program's 'startBlock'.
+      if (lastBlockAccounted <= programStartBlock) continue;
+
+      uint256 points;
+      if ((state & rewardProgramEndedFlag(programId)) == 0) {
+        uint256 pointsPerShareStart = 
+          (state & rewardProgramStartedFlag(programId)) == 0 ? 
+          calculateEvanescentPointsPerShareAt(
+            poolId,
+            qMin,
+            qMax,
+            programStartBlock
+          ) : evanescentPointsPerShareSubtrahend;
+
+        uint256 pointsPerShareEnd = evanescentPointsPerShare;
+        if (programEndBlock <= lastBlockAccounted) {
+          pointsPerShareEnd = calculateEvanescentPointsPerShareAt(
+            poolId,
+            qMin,
+            qMax,
+            programEndBlock
+          );
+          state |= rewardProgramEndedFlag(programId);
+        }
+        state |= rewardProgramStartedFlag(programId);
+
+        unchecked {
+          // All operations are safe because 'evanescentPointsPerShare' is
+          // non-decreasing over time and does not exceed '2 ** 96 - 1'.
+          points = shares * (pointsPerShareEnd - pointsPerShareStart);
+        }
+      }
+
+      uint256 pointsSlot = getRewardProgramPointsSlot(tokenId, programId);
+      unchecked {
+        // The additions are safe because the sums are capped by the
+        // program's 'totalEvanescentPointsOwed'.
+        if (collected) {
+          uint256 pointsKept = readStorage(pointsSlot);
+          if (pointsKept != 0) writeStorage(pointsSlot, 0);
+          programPoints[programId - 1] += pointsKept + points;
+        } else if (points != 0) {
+          writeStorage(pointsSlot, readStorage(pointsSlot) + points);
+        }
+      }
+    }
+    if (state != stateOld) writeStorage(stateSlot, state);
+  }
+
+  /// @notice Marks the reward programs for which a new position has already
+  /// started or ended accruing points, because the position's initial
+  /// 'evanescentPointsPerShareSubtrahend' is as of 'lastBlockAccounted'.
+  /// @param poolData Output of '_accountEvanescentPoints' or '0' in which case
+  /// the pool's data slot is read.
+  function _initializeRewardPrograms(
+    uint256 tokenId,
+    uint256 poolId,
+    uint256 poolData
+  ) internal {
+    uint256 rewardProgramsCount = readRewardProgramsCount();
+    if (rewardProgramsCount == 0) return;
+
+    if (poolData == 0) poolData = readStorage(getPoolDataSlot(poolId));
+    uint32 lastBlockAccounted = uint32(poolData >> 224);
+    if (lastBlockAccounted <= startBlock) return;
+
+    uint256 state;
+    for (uint256 programId = 1; programId <= rewardProgramsCount; ++programId) {
+      uint256 value = readStorage(getRewardProgramSlot(programId));
+      if ((value & rewardProgramAcceptedFlag) == 0) continue;
+      uint32 programStartBlock;
+      uint32 programEndBlock;
+      assembly {
+        programStartBlock := shr(224, value)
+        programEndBlock := and(shr(192, value), 0xFFFFFFFF)
+      }
+      if (programStartBlock < lastBlockAccounted) {
+        state |= rewardProgramStartedFlag(programId);
+      }
+      if (programEndBlock <= lastBlockAccounted) {
+        state |= rewardProgramEndedFlag(programId);
+      }
+    }
+    if (state != 0) writeStorage(getRewardProgramsStateSlot(tokenId), state);
+  }
+
   /// @notice Provides the current active interval's boundaries by reading 
   /// the curve from calldata.
   function _getBoundaries() internal pure returns (
@@ -580,30 +1719,77 @@ contract Incentive is
     (qLower, qUpper) = qLower <= qUpper ? (qLower, qUpper) : (qUpper, qLower);
   }
 
+  /// @notice Same as 'modifyIncentiveShares' in 'StorageIncentive.sol'. The
+  /// storage operations on incentive positions are virtual so that their
+  /// layout can be benchmarked against alternatives.
+  function _modifyIncentiveShares(
+    uint256 tokenId,
+    uint256 evanescentPointsPerShare,
+    int256 sharesIncrement
+  ) internal virtual {
+    modifyIncentiveShares(tokenId, evanescentPointsPerShare, sharesIncrement);
+  }
+
+  /// @notice Same as 'collectEvanescentPoints' in 'StorageIncentive.sol'.
+  function _collectEvanescentPoints(
+    uint256 tokenId
+  ) internal virtual returns (
+    uint256 evanescentPointsOwed
+  ) {
+    return collectEvanescentPoints(tokenId);
+  }
+
+  /// @notice Same as 'writeIncentiveData' in 'StorageIncentive.sol'.
+  function _writeIncentiveData(
+    uint256 storageSlot,
+    uint256 poolId,
+    X59 qMin,
+    X59 qMax,
+    uint256 shares,
+    uint256 evanescentPointsPerShareSubtrahend,
+    uint256 evanescentPointsOwed
+  ) internal virtual {
+    writeIncentiveData(
+      storageSlot,
+      poolId,
+      qMin,
+      qMax,
+      shares,
+      evanescentPointsPerShareSubtrahend,
+      evanescentPointsOwed
+    );
+  }
+
   /// @notice Mints a new token for the owner.
+  /// @param poolData Output of '_accountEvanescentPoints'.
   function _mint(
     uint256 poolId,
     X59 qMin,
     X59 qMax,
     uint256 shares,
-    address owner
+    address owner,
+    uint256 poolData
   ) internal returns (
     uint256 tokenId
   ) {
     tokenId = incrementTokenId();
 
     // Token's data is written.
-    writeIncentiveData(
+    _writeIncentiveData(
       getIncentiveDataSlot(tokenId),
       poolId,
       qMin,
       qMax,
       shares,
-      calculateEvanescentPointsPerShare(poolId, qMin, qMax),
+      calculateEvanescentPointsPerShare(poolId, qMin, qMax, poolData),
       0
     );
 
-    // Token's owner is set to 'owner'.
+    _initializeRewardPrograms(tokenId, poolId, poolData);
+
+    // Token's owner is set to 'owner'. The conversion is safe because
+    // 'shares < 2 ** 128'.
     _mint(owner, tokenId);
+    emit ModifyShares(tokenId, poolId, qMin, qMax, int256(shares));
   }
 }
\ No newline at end of file
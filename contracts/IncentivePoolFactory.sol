@@ -58,6 +58,24 @@ contract IncentivePoolFactory is
   /// @inheritdoc IIncentivePoolFactory
   mapping(Tag tag => uint256 blockNumber) public override lastDisbursed;
 
+  /// @notice For every pool which is initialized by this contract, the key of
+  /// its pair of tags in '_pairs' followed by its 'syncedPoolGrowthPortion'
+  /// in the 48 least significant bits.
+  mapping(uint256 poolId => uint256) internal _poolData;
+
+  /// @notice A pair of tags along with the pools which are initialized by
+  /// this contract for it in the order of initialization.
+  struct Pair {
+    Tag tag0;
+    Tag tag1;
+    uint256[] poolIds;
+  }
+
+  /// @notice The pairs of tags of the pools which are initialized by this
+  /// contract. The key is the 208 most significant bits of the hash of the
+  /// pair as given by '_pairKey'.
+  mapping(uint256 pairKey => Pair) private _pairs;
+
   constructor(
     INofeeswap _nofeeswap,
     INofee _nofee,
@@ -156,15 +174,24 @@ contract IncentivePoolFactory is
     uint256[] memory poolIds
   ) external override {
     unchecked {
+      (Tag[] memory tag0s, Tag[] memory tag1s) = _readTagsBatch(poolIds);
       uint256 length = poolIds.length;
       for (uint256 k = 0; k < length; ++k) {
         uint256 poolId = poolIds[k];
-        (Tag tag0, Tag tag1) = _readTags(poolId);
+        X47 portion = poolGrowthPortion[tag0s[k]][tag1s[k]];
+
+        // Pools which are already synced are skipped. The record is read
+        // again so that a repeated 'poolId' sees the portion written by its
+        // previous occurrence.
+        uint256 data = _poolData[poolId];
+        if (_unpackPortion(data) == portion) continue;
+        _poolData[poolId] = ((data >> 48) << 48) | _packPortion(portion);
+
         INofeeswap(nofeeswap).dispatch(
           abi.encodeWithSelector(
             INofeeswapDelegatee.modifyPoolGrowthPortion.selector,
             poolId,
-            poolGrowthPortion[tag0][tag1]
+            portion
           )
         );
       }
@@ -177,33 +204,107 @@ contract IncentivePoolFactory is
     uint256[] calldata kernelCompactArray,
     uint256[] calldata curveArray
   ) external override {
-    uint256 unsaltedPoolId;
+    IIncentive incentive = IIncentive(address(uint160(unpepperedPoolId)));
+    _initialize(
+      unpepperedPoolId,
+      incentive.tag0(),
+      incentive.tag1(),
+      kernelCompactArray,
+      curveArray
+    );
+  }
+
+  /// @inheritdoc IIncentivePoolFactory
+  function initializeBatch(
+    uint256[] calldata unpepperedPoolIds,
+    uint256[][] calldata kernelCompactArrays,
+    uint256[][] calldata curveArrays
+  ) external override returns (
+    uint256[] memory poolIds
+  ) {
+    uint256 length = unpepperedPoolIds.length;
+    require(
+      length == kernelCompactArrays.length,
+      UnequalLengths(length, kernelCompactArrays.length)
+    );
+    require(
+      length == curveArrays.length,
+      UnequalLengths(length, curveArrays.length)
+    );
+
+    poolIds = new uint256[](length);
+
+    // The tags of every distinct hook are looked up once and kept in memory.
+    address[] memory hooks = new address[](length);
+    Tag[] memory tag0s = new Tag[](length);
+    Tag[] memory tag1s = new Tag[](length);
+    uint256 hooksCount;
     unchecked {
-      unsaltedPoolId = unpepperedPoolId + uint256(
-        keccak256(abi.encodePacked(msg.sender, unpepperedPoolId)) << 188
-      );
+      for (uint256 k = 0; k < length; ++k) {
+        uint256 unpepperedPoolId = unpepperedPoolIds[k];
+        IIncentive incentive = IIncentive(address(uint160(unpepperedPoolId)));
+
+        // The table is searched from the most recent hook backwards.
+        uint256 index = hooksCount;
+        while (index > 0) {
+          if (hooks[index - 1] == address(incentive)) break;
+          --index;
+        }
+        if (index == 0) {
+          hooks[hooksCount] = address(incentive);
+          tag0s[hooksCount] = incentive.tag0();
+          tag1s[hooksCount] = incentive.tag1();
+          index = ++hooksCount;
+        }
+
+        poolIds[k] = _initialize(
+          unpepperedPoolId,
+          tag0s[index - 1],
+          tag1s[index - 1],
+          kernelCompactArrays[k],
+          curveArrays[k]
+        );
+      }
     }
-    Tag tag0 = IIncentive(address(uint160(unpepperedPoolId))).tag0();
-    Tag tag1 = IIncentive(address(uint160(unpepperedPoolId))).tag1();
-    INofeeswap(nofeeswap).dispatch(
-      abi.encodeWithSelector(
-        INofeeswapDelegatee.initialize.selector,
-        unsaltedPoolId,
-        tag0,
-        tag1,
-        poolGrowthPortion[tag0][tag1],
-        kernelCompactArray,
-        curveArray,
-        ""
-      )
-    );
-    uint256 poolId;
+  }
+
+  /// @inheritdoc IIncentivePoolFactory
+  function syncedPoolGrowthPortion(
+    uint256 poolId
+  ) external view override returns (X47 growthPortion) {
+    return _unpackPortion(_poolData[poolId]);
+  }
+
+  /// @inheritdoc IIncentivePoolFactory
+  function poolsCount(
+    Tag tag0,
+    Tag tag1
+  ) external view override returns (
+    uint256 count
+  ) {
+    count = _pairs[_pairKey(tag0, tag1)].poolIds.length;
+  }
+
+  /// @inheritdoc IIncentivePoolFactory
+  function pools(
+    Tag tag0,
+    Tag tag1,
+    uint256 start,
+    uint256 count
+  ) external view override returns (
+    uint256[] memory poolIds
+  ) {
+    uint256[] storage registry = _pairs[_pairKey(tag0, tag1)].poolIds;
+    uint256 length = registry.length;
     unchecked {
-      poolId = unsaltedPoolId + uint256(
-        keccak256(abi.encodePacked(address(this), unsaltedPoolId)) << 188
-      );
+      // The page is clamped to the end of the registry.
+      if (start > length) start = length;
+      if (count > length - start) count = length - start;
+      poolIds = new uint256[](count);
+      for (uint256 k = 0; k < count; ++k) {
+        poolIds[k] = registry[start + k];
+      }
     }
-    _mint(msg.sender, poolId);
   }
 
   /// @inheritdoc IIncentivePoolFactory
@@ -238,14 +339,58 @@ contract IncentivePoolFactory is
 
     amount = INofeeswap(nofeeswap).balanceOf(address(this), tag);
 
-    // Unlocking nofeeswap in order to perform swaps.
-    nofeeAmount = abi.decode(
-      INofeeswap(nofeeswap).unlock(
-        address(this),
-        abi.encode(tag, amount)
-      ),
-      (uint256)
-    );
+    Tag[] memory tags = new Tag[](1);
+    uint256[] memory amounts = new uint256[](1);
+    tags[0] = tag;
+    amounts[0] = amount;
+    nofeeAmount = _disburse(tags, amounts);
+  }
+
+  /// @inheritdoc IIncentivePoolFactory
+  function disburseBatch(
+    Tag[] calldata tags
+  ) external override returns (
+    uint256[] memory amounts,
+    uint256 nofeeAmount
+  ) {
+    uint256 length = tags.length;
+    amounts = new uint256[](length);
+
+    // The tags which are due are gathered to be converted in a single unlock.
+    Tag[] memory dueTags = new Tag[](length);
+    uint256[] memory dueAmounts = new uint256[](length);
+    uint256 count;
+    uint256 _disburseGap = disburseGap;
+    for (uint256 k = 0; k < length; ++k) {
+      Tag tag = tags[k];
+
+      // Tags which are not yet due or which are already disbursed in this
+      // block, e.g., repeated tags, are skipped.
+      uint256 lastDisbursedBlock = lastDisbursed[tag];
+      if (block.number < lastDisbursedBlock + _disburseGap) continue;
+      if (lastDisbursedBlock == block.number) continue;
+
+      // Tags with no balance are skipped without resetting their gap.
+      uint256 amount = INofeeswap(nofeeswap).balanceOf(address(this), tag);
+      if (amount == 0) continue;
+
+      lastDisbursed[tag] = block.number;
+      amounts[k] = amount;
+      dueTags[count] = tag;
+      dueAmounts[count] = amount;
+      unchecked {
+        ++count;
+      }
+    }
+
+    if (count == 0) return (amounts, 0);
+
+    // The arrays are shrunk to the number of tags which are due.
+    assembly {
+      mstore(dueTags, count)
+      mstore(dueAmounts, count)
+    }
+    nofeeAmount = _disburse(dueTags, dueAmounts);
   }
 
   modifier onlyNofeeswap() {
@@ -260,24 +405,36 @@ contract IncentivePoolFactory is
   ) external payable override onlyNofeeswap returns (bytes memory ) {
     require(caller == address(this), CallerMustBeIncentivePoolFactory(caller));
 
-    (Tag tag, int256 accruedAmount) = abi.decode(data, (Tag, int256));
-
-    (int256 amount0, int256 amount1) = INofeeswap(msg.sender).swap(
-      conversionPools[tag],
-      accruedAmount,
-      tag <= address(nofee).tag() ? minX59 : maxX59,
-      0x100000000000000000000000000000002,
-      ""
+    (Tag[] memory tags, int256[] memory accruedAmounts) = abi.decode(
+      data,
+      (Tag[], int256[])
     );
 
-    INofeeswap(msg.sender).modifyBalance(
-      address(this),
-      tag,
-      0 - (amount0 > amount1 ? amount0 : amount1)
-    );
+    // Every tag is converted in its own conversion pool and the resulting
+    // nofees are aggregated.
+    int256 nofeeAmount = 0;
+    uint256 length = tags.length;
+    for (uint256 k = 0; k < length; ++k) {
+      Tag tag = tags[k];
+
+      (int256 amount0, int256 amount1) = INofeeswap(msg.sender).swap(
+        conversionPools[tag],
+        accruedAmounts[k],
+        tag <= address(nofee).tag() ? minX59 : maxX59,
+        0x100000000000000000000000000000002,
+        ""
+      );
+
+      INofeeswap(msg.sender).modifyBalance(
+        address(this),
+        tag,
+        0 - (amount0 > amount1 ? amount0 : amount1)
+      );
 
-    int256 nofeeAmount = 0 - (amount0 < amount1 ? amount0 : amount1);
+      nofeeAmount -= (amount0 < amount1 ? amount0 : amount1);
+    }
 
+    // A single 'take' for all of the converted tags.
     INofeeswap(msg.sender).take(
       address(nofee),
       address(xNofee),
@@ -287,6 +444,74 @@ contract IncentivePoolFactory is
     return abi.encode(nofeeAmount);
   }
 
+  /// @notice Unlocks nofeeswap in order to convert each of the given tags
+  /// to nofee in its conversion pool.
+  /// @param tags The tags to be converted.
+  /// @param amounts The amount of each tag to be converted.
+  /// @return nofeeAmount The total amount of nofees transferred to 'xNofee'.
+  function _disburse(
+    Tag[] memory tags,
+    uint256[] memory amounts
+  ) private returns (
+    uint256 nofeeAmount
+  ) {
+    nofeeAmount = abi.decode(
+      INofeeswap(nofeeswap).unlock(
+        address(this),
+        abi.encode(tags, amounts)
+      ),
+      (uint256)
+    );
+  }
+
+  /// @notice Initializes a pool with the given tags of its incentive hook,
+  /// registers it and mints its NFT to 'msg.sender'.
+  /// @return poolId The resulting pool identifier.
+  function _initialize(
+    uint256 unpepperedPoolId,
+    Tag tag0,
+    Tag tag1,
+    uint256[] calldata kernelCompactArray,
+    uint256[] calldata curveArray
+  ) private returns (
+    uint256 poolId
+  ) {
+    uint256 unsaltedPoolId;
+    unchecked {
+      unsaltedPoolId = unpepperedPoolId + uint256(
+        keccak256(abi.encodePacked(msg.sender, unpepperedPoolId)) << 188
+      );
+    }
+    X47 portion = poolGrowthPortion[tag0][tag1];
+    INofeeswap(nofeeswap).dispatch(
+      abi.encodeWithSelector(
+        INofeeswapDelegatee.initialize.selector,
+        unsaltedPoolId,
+        tag0,
+        tag1,
+        portion,
+        kernelCompactArray,
+        curveArray,
+        ""
+      )
+    );
+    unchecked {
+      poolId = unsaltedPoolId + uint256(
+        keccak256(abi.encodePacked(address(this), unsaltedPoolId)) << 188
+      );
+    }
+    uint256 pairKey = _pairKey(tag0, tag1);
+    Pair storage pair = _pairs[pairKey];
+    if (Tag.unwrap(pair.tag1) == 0) {
+      pair.tag0 = tag0;
+      pair.tag1 = tag1;
+    }
+    pair.poolIds.push(poolId);
+    _poolData[poolId] = (pairKey << 48) | _packPortion(portion);
+    _mint(msg.sender, poolId);
+    emit NewPool(tag0, tag1, poolId);
+  }
+
   /// @inheritdoc IHook
   function preInitialize(
     bytes calldata hookInput
@@ -334,7 +559,7 @@ contract IncentivePoolFactory is
 
   function _readTags(
     uint256 poolId
-  ) private view returns (Tag tag0, Tag tag1) {
+  ) internal view returns (Tag tag0, Tag tag1) {
     address storageAddress = getStaticParamsStorageAddress(
       address(nofeeswap),
       poolId,
@@ -346,4 +571,47 @@ contract IncentivePoolFactory is
       tag1 := mload(32)
     }
   }
+
+  /// @notice Returns the tags of every pool in 'poolIds'. The tags are read
+  /// from '_pairs', once for every run of consecutive pools of the same pair.
+  /// Every pool should be initialized by this contract.
+  function _readTagsBatch(
+    uint256[] memory poolIds
+  ) private view returns (
+    Tag[] memory tag0s,
+    Tag[] memory tag1s
+  ) {
+    uint256 length = poolIds.length;
+    tag0s = new Tag[](length);
+    tag1s = new Tag[](length);
+
+    uint256 lastPairKey;
+    Tag tag0;
+    Tag tag1;
+    for (uint256 k = 0; k < length; ++k) {
+      uint256 pairKey = _poolData[poolIds[k]] >> 48;
+      require(pairKey != 0, UnregisteredPool(poolIds[k]));
+      if (pairKey != lastPairKey) {
+        Pair storage pair = _pairs[pairKey];
+        tag0 = pair.tag0;
+        tag1 = pair.tag1;
+        lastPairKey = pairKey;
+      }
+      tag0s[k] = tag0;
+      tag1s[k] = tag1;
+    }
+  }
+
+  /// @notice The key of a pair of tags in '_pairs'.
+  function _pairKey(Tag tag0, Tag tag1) private pure returns (uint256) {
+    return uint256(keccak256(abi.encodePacked(tag0, tag1))) >> 48;
+  }
+
+  function _packPortion(X47 portion) internal pure returns (uint256) {
+    return uint256(X47.unwrap(portion));
+  }
+
+  function _unpackPortion(uint256 data) internal pure returns (X47) {
+    return X47.wrap(int256(data & 0xFFFFFFFFFFFF));
+  }
 }
\ No newline at end of file
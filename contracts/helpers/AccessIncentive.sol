@@ -9,7 +9,9 @@ import {
   getPoolDataSlot,
   readPoolData,
   getIncentiveDataSlot,
-  totalEvanescentPointsOwedSlot
+  evanescentPointsOwedOverflow,
+  totalEvanescentPointsOwedSlot,
+  totalEvanescentPointsOwedMask
 } from "../utilities/StorageIncentive.sol";
 
 contract AccessIncentive is Access {
@@ -63,17 +65,12 @@ contract AccessIncentive is Access {
       ++storageSlot;
     }
     uint256 value1 = uint256(incentive.storageAccess(bytes32(storageSlot)));
-    unchecked {
-      ++storageSlot;
-    }
-    evanescentPointsOwed = uint256(
-      incentive.storageAccess(bytes32(storageSlot))
-    );
     assembly {
       poolId := or(
         and(value0, shl(160, 0xFFFFFFFFFFFFFFFFFFFFFFFF)),
         incentive
       )
+      evanescentPointsOwed := and(shr(96, value0), 0xFFFFFFFFFFFFFFFF)
       evanescentPointsPerShareSubtrahend := and(
         value0,
         0xFFFFFFFFFFFFFFFFFFFFFFFF
@@ -83,6 +80,14 @@ contract AccessIncentive is Access {
       qMax := and(shr(128, value1), 0xFFFFFFFFFFFFFFFF)
       shares := and(value1, 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFF)
     }
+    if (evanescentPointsOwed == evanescentPointsOwedOverflow) {
+      unchecked {
+        ++storageSlot;
+      }
+      evanescentPointsOwed = uint256(
+        incentive.storageAccess(bytes32(storageSlot))
+      );
+    }
   }
 
   function _readTotalEvanescentPointsOwedSlot(
@@ -96,5 +101,8 @@ contract AccessIncentive is Access {
     assembly {
       value := storageSlot
     }
+
+    // The most significant byte holds the number of reward programs.
+    value &= totalEvanescentPointsOwedMask;
   }
 }
\ No newline at end of file
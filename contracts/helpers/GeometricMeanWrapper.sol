@@ -14,4 +14,42 @@ contract GeometricMeanWrapper {
   ) {
     return geometricMean(x, y);
   }
+
+  function geometricMeanFastWrapper(
+    X216 x,
+    X216 y
+  ) public returns (
+    uint256 result
+  ) {
+    return geometricMeanFast(x, y);
+  }
+
+  /// @notice Measures the gas spent by both 'geometricMean' and
+  /// 'geometricMeanFast' over the given inputs. The results are returned so
+  /// that neither call is optimized away.
+  function geometricMeanGas(
+    X216[] calldata x,
+    X216[] calldata y
+  ) public view returns (
+    uint256[] memory results,
+    uint256[] memory resultsFast,
+    uint256 gasUsed,
+    uint256 gasUsedFast
+  ) {
+    uint256 length = x.length;
+    results = new uint256[](length);
+    resultsFast = new uint256[](length);
+
+    uint256 gasBefore = gasleft();
+    for (uint256 k = 0; k < length; ++k) {
+      results[k] = geometricMean(x[k], y[k]);
+    }
+    gasUsed = gasBefore - gasleft();
+
+    gasBefore = gasleft();
+    for (uint256 k = 0; k < length; ++k) {
+      resultsFast[k] = geometricMeanFast(x[k], y[k]);
+    }
+    gasUsedFast = gasBefore - gasleft();
+  }
 }
\ No newline at end of file
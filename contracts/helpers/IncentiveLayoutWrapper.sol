@@ -0,0 +1,89 @@
+// Copyright 2025, NoFeeSwap LLC - All rights reserved.
+pragma solidity ^0.8.28;
+
+import {INofee} from "@governance/interfaces/INofee.sol";
+import {INofeeswap} from "@core/interfaces/INofeeswap.sol";
+import {Tag} from "@core/utilities/Tag.sol";
+import {X111} from "@core/utilities/X111.sol";
+import {X59} from "@core/utilities/X59.sol";
+import {Incentive} from "../Incentive.sol";
+import {IIncentivePoolFactory} from "../interfaces/IIncentivePoolFactory.sol";
+import {
+  modifyIncentiveSharesThreeSlots,
+  collectEvanescentPointsThreeSlots,
+  writeIncentiveDataThreeSlots
+} from "./StorageIncentiveThreeSlots.sol";
+
+/// @title This contract keeps incentive positions in the three-slot layout,
+/// i.e., with 'evanescentPointsOwed' always in the third slot, for gas
+/// benchmarking purposes. Only mint, 'midMint', 'midBurn' and 'collect' are
+/// meant to be used since the views decode the two-slot layout.
+contract IncentiveLayoutWrapper is Incentive {
+  constructor(
+    INofeeswap _nofeeswap,
+    address _permit2,
+    address _weth9,
+    address _quoter,
+    IIncentivePoolFactory _incentivePoolFactory,
+    Tag _tag0,
+    Tag _tag1,
+    address _payMaster,
+    INofee _rewardToken,
+    uint32 _startBlock,
+    uint32 _endBlock,
+    X111 _maxIncentiveGrowth
+  ) Incentive(
+    _nofeeswap,
+    _permit2,
+    _weth9,
+    _quoter,
+    _incentivePoolFactory,
+    _tag0,
+    _tag1,
+    _payMaster,
+    _rewardToken,
+    _startBlock,
+    _endBlock,
+    _maxIncentiveGrowth
+  ) {}
+
+  function _modifyIncentiveShares(
+    uint256 tokenId,
+    uint256 evanescentPointsPerShare,
+    int256 sharesIncrement
+  ) internal override {
+    modifyIncentiveSharesThreeSlots(
+      tokenId,
+      evanescentPointsPerShare,
+      sharesIncrement
+    );
+  }
+
+  function _collectEvanescentPoints(
+    uint256 tokenId
+  ) internal override returns (
+    uint256 evanescentPointsOwed
+  ) {
+    return collectEvanescentPointsThreeSlots(tokenId);
+  }
+
+  function _writeIncentiveData(
+    uint256 storageSlot,
+    uint256 poolId,
+    X59 qMin,
+    X59 qMax,
+    uint256 shares,
+    uint256 evanescentPointsPerShareSubtrahend,
+    uint256 evanescentPointsOwed
+  ) internal override {
+    writeIncentiveDataThreeSlots(
+      storageSlot,
+      poolId,
+      qMin,
+      qMax,
+      shares,
+      evanescentPointsPerShareSubtrahend,
+      evanescentPointsOwed
+    );
+  }
+}
@@ -0,0 +1,54 @@
+// Copyright 2025, NoFeeSwap LLC - All rights reserved.
+pragma solidity ^0.8.28;
+
+import {INofee} from "@governance/interfaces/INofee.sol";
+import {IXNofee} from "@vault/interfaces/IXNofee.sol";
+import {INofeeswap} from "@core/interfaces/INofeeswap.sol";
+import {INofeeswapDelegatee} from "@core/interfaces/INofeeswapDelegatee.sol";
+import {Tag} from "@core/utilities/Tag.sol";
+import {X47} from "@core/utilities/X47.sol";
+import {IncentivePoolFactory} from "../IncentivePoolFactory.sol";
+
+/// @title This contract exposes the implementation of
+/// 'updatePoolGrowthPortion' which reads the tags of every pool from the
+/// static parameters of nofeeswap for gas benchmarking purposes.
+contract IncentivePoolFactoryLegacyWrapper is IncentivePoolFactory {
+  constructor(
+    INofeeswap _nofeeswap,
+    INofee _nofee,
+    IXNofee _xNofee,
+    address _admin,
+    uint256 _disburseGap,
+    uint256 _delay
+  ) IncentivePoolFactory(
+    _nofeeswap,
+    _nofee,
+    _xNofee,
+    _admin,
+    _disburseGap,
+    _delay
+  ) {}
+
+  function updatePoolGrowthPortionLegacy(uint256[] memory poolIds) public {
+    unchecked {
+      uint256 length = poolIds.length;
+      for (uint256 k = 0; k < length; ++k) {
+        uint256 poolId = poolIds[k];
+        (Tag tag0, Tag tag1) = _readTags(poolId);
+        X47 portion = poolGrowthPortion[tag0][tag1];
+
+        uint256 data = _poolData[poolId];
+        if (_unpackPortion(data) == portion) continue;
+        _poolData[poolId] = ((data >> 48) << 48) | _packPortion(portion);
+
+        INofeeswap(nofeeswap).dispatch(
+          abi.encodeWithSelector(
+            INofeeswapDelegatee.modifyPoolGrowthPortion.selector,
+            poolId,
+            portion
+          )
+        );
+      }
+    }
+  }
+}
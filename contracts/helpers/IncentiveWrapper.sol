@@ -6,7 +6,8 @@ import {ERC20} from "@openzeppelin/token/ERC20/ERC20.sol";
 import {Incentive} from "../Incentive.sol";
 
 /// @title This contract attempts a just in time liquidity attack on the
-/// incentive hook.
+/// incentive hook. It also compares the pending views of the incentive hook
+/// against an actual collect within the same block.
 contract IncentiveWrapper {
   function badCollect(
     address nofeeswap,
@@ -37,4 +38,38 @@ contract IncentiveWrapper {
       )
     );
   }
+
+  /// @notice Reads 'pendingPoints' and 'pendingRewards' for 'tokenId', then
+  /// accounts the pool via 'accountData' and collects the position in the same
+  /// block.
+  function pendingCollect(
+    address nofeeswap,
+    address incentive,
+    uint256 tokenId,
+    address token0,
+    address token1,
+    bytes calldata accountData
+  ) public returns (
+    uint256 pendingPoints,
+    uint256 pendingReward,
+    uint256 amount
+  ) {
+    ERC20(token0).approve(incentive, type(uint256).max);
+    ERC20(token1).approve(incentive, type(uint256).max);
+    Nofeeswap(nofeeswap).setOperator(incentive, true);
+
+    uint256[] memory tokenIds = new uint256[](1);
+    tokenIds[0] = tokenId;
+    pendingPoints = Incentive(payable(incentive)).pendingPoints(tokenId);
+    pendingReward = Incentive(payable(incentive)).pendingRewards(tokenIds)[0];
+
+    nofeeswap.call(
+      abi.encodeWithSelector(
+        Nofeeswap.unlock.selector,
+        incentive,
+        accountData
+      )
+    );
+    amount = Incentive(payable(incentive)).collect(tokenId);
+  }
 }
\ No newline at end of file
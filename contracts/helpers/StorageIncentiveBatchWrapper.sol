@@ -0,0 +1,79 @@
+// Copyright 2025, NoFeeSwap LLC - All rights reserved.
+pragma solidity ^0.8.28;
+
+import "../utilities/StorageIncentive.sol";
+
+/// @title This contract evaluates vectors of cases of the internal functions
+/// of 'StorageIncentive.sol' in one call for testing purposes. Every case
+/// writes all of the slots that it reads. Hence, the result of each case is
+/// the same as that of the corresponding call to 'StorageIncentiveWrapper'.
+contract StorageIncentiveBatchWrapper {
+  function _collectEvanescentPointsBatch(
+    uint256[] calldata tokenIds,
+    uint256[3][] calldata incentiveData,
+    uint256[] calldata values,
+    uint256[4][] calldata storageSlots,
+    uint256[4][] calldata contents
+  ) public returns (
+    uint256[4][] memory results
+  ) {
+    results = new uint256[4][](tokenIds.length);
+    unchecked {
+      for (uint256 k = 0; k < tokenIds.length; ++k) {
+        uint256 storageSlot = getIncentiveDataSlot(tokenIds[k]);
+        writeStorage(storageSlot + 0, incentiveData[k][0]);
+        writeStorage(storageSlot + 1, incentiveData[k][1]);
+        writeStorage(storageSlot + 2, incentiveData[k][2]);
+        writeStorage(
+          getPoolDataSlot(
+            (
+              incentiveData[k][0] & (0xffffffffffffffffffffffff << 160)
+            ) + uint256(uint160(address(this)))
+          ),
+          values[k]
+        );
+        for (uint256 kk = 0; kk < 4; kk++) {
+          writeStorage(storageSlots[k][kk], contents[k][kk]);
+        }
+        results[k][0] = collectEvanescentPoints(tokenIds[k]);
+        results[k][1] = readStorage(storageSlot + 0);
+        results[k][2] = readStorage(storageSlot + 1);
+        results[k][3] = readStorage(storageSlot + 2);
+      }
+    }
+  }
+
+  function _calculateEvanescentPointsPerShareBatch(
+    uint256[] calldata poolIds,
+    X59[] calldata qMins,
+    X59[] calldata qMaxs,
+    uint256[] calldata values,
+    uint256[4][] calldata storageSlots,
+    uint256[4][] calldata contents
+  ) public returns (
+    uint256[] memory results
+  ) {
+    results = new uint256[](poolIds.length);
+    unchecked {
+      for (uint256 k = 0; k < poolIds.length; ++k) {
+        writeStorage(getPoolDataSlot(poolIds[k]), values[k]);
+        for (uint256 kk = 0; kk < 4; kk++) {
+          writeStorage(storageSlots[k][kk], contents[k][kk]);
+        }
+        results[k] = calculateEvanescentPointsPerShare(
+          poolIds[k],
+          qMins[k],
+          qMaxs[k]
+        );
+        require(
+          results[k] == calculateEvanescentPointsPerShare(
+            poolIds[k],
+            qMins[k],
+            qMaxs[k],
+            values[k]
+          )
+        );
+      }
+    }
+  }
+}
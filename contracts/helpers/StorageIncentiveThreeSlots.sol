@@ -0,0 +1,251 @@
+// Copyright 2025, NoFeeSwap LLC - All rights reserved.
+pragma solidity ^0.8.28;
+
+import {readStorage, writeStorage} from "@core/utilities/Storage.sol";
+import {X59} from "@core/utilities/X59.sol";
+import {IIncentive} from "../interfaces/IIncentive.sol";
+import {
+  getPoolIdFromCalldata,
+  getLogPriceMinOffsettedFromCalldata,
+  getLogPriceMaxOffsettedFromCalldata
+} from "@core/hooks/HookCalldata.sol";
+import {
+  getIncentiveDataSlot,
+  calculateEvanescentPointsPerShare
+} from "../utilities/StorageIncentive.sol";
+
+// The storage operations on incentive positions as they were prior to
+// 'evanescentPointsOwed' being packed in the first slot of a position, i.e.,
+// with 'evanescentPointsOwed' always in the third slot. They are kept for gas
+// benchmarking purposes only.
+
+
+/// @notice Increments or decrements shares for an incentive position.
+/// @param tokenId The tokenId whose shares to be modified.
+/// @param evanescentPointsPerShare The new value for 
+/// 'evanescentPointsPerShare' which is used to update 'evanescentPointsOwed'.
+/// @param sharesIncrement The number of shares to be added/subtracted.
+function modifyIncentiveSharesThreeSlots(
+  uint256 tokenId,
+  uint256 evanescentPointsPerShare,
+  int256 sharesIncrement
+) {
+  unchecked {
+    //          12 bytes        8 bytes              12 bytes
+    //    +------------------+----------+------------------------------------+
+    //    | poolId (96 msbs) |     -    | evanescentPointsPerShareSubtrahend |
+    //    +------------------+----------+------------------------------------+
+    //
+    uint256 storageSlot = getIncentiveDataSlot(tokenId);
+    uint256 evanescentPointsPerShareSubtrahend;
+    {
+      uint256 poolId;
+      uint256 value = readStorage(storageSlot);
+      assembly {
+        poolId := or(
+          and(value, shl(160, 0xFFFFFFFFFFFFFFFFFFFFFFFF)),
+          address()
+        )
+        evanescentPointsPerShareSubtrahend := and(
+          value,
+          0xFFFFFFFFFFFFFFFFFFFFFFFF
+        )
+        value := or(
+          and(value, not(0xFFFFFFFFFFFFFFFFFFFFFFFF)),
+          evanescentPointsPerShare
+        )
+      }
+      require(
+        poolId == getPoolIdFromCalldata(),
+        IIncentive.InvalidPoolId(poolId, getPoolIdFromCalldata())
+      );
+      writeStorage(storageSlot, value);
+    }
+
+    //       8 bytes    8 bytes                    16 bytes
+    //    +----------+----------+--------------------------------------------+
+    //    |   qMin   |   qMax   |                   shares                   |
+    //    +----------+----------+--------------------------------------------+
+    //
+    ++storageSlot;
+    int256 shares;
+    {
+      uint256 value = readStorage(storageSlot);
+      X59 qMin;
+      X59 qMax;
+      assembly {
+        qMin := and(shr(192, value), 0xFFFFFFFFFFFFFFFF)
+        qMax := and(shr(128, value), 0xFFFFFFFFFFFFFFFF)
+        shares := and(value, 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFF)
+      }
+      require(
+        qMin == getLogPriceMinOffsettedFromCalldata(),
+        IIncentive.InvalidLogPriceMin(
+          qMin,
+          getLogPriceMinOffsettedFromCalldata()
+        )
+      );
+      require(
+        qMax == getLogPriceMaxOffsettedFromCalldata(),
+        IIncentive.InvalidLogPriceMax(
+          qMax,
+          getLogPriceMaxOffsettedFromCalldata()
+        )
+      );
+      int256 sharesUpdated = shares + sharesIncrement;
+      require(sharesUpdated >= 0, IIncentive.InsufficientShares(tokenId));
+      assembly {
+        value := or(
+          and(value, not(0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFF)),
+          sharesUpdated
+        )
+      }
+      writeStorage(storageSlot, value);
+    }
+
+    //                                  32 bytes
+    //    +------------------------------------------------------------------+
+    //    |                       evanescentPointsOwed                       |
+    //    +------------------------------------------------------------------+
+    //
+    ++storageSlot;
+    writeStorage(
+      storageSlot,
+      readStorage(storageSlot) + uint256(shares) * 
+        (evanescentPointsPerShare - evanescentPointsPerShareSubtrahend)
+    );
+  }
+}
+
+/// @notice Increments or decrements shares for an incentive position.
+/// @param tokenId The tokenId whose evanescent points to be collected.
+/// @return evanescentPointsOwed The amount of evanescent points to be granted.
+function collectEvanescentPointsThreeSlots(
+  uint256 tokenId
+) returns (
+  uint256 evanescentPointsOwed
+) {
+  uint256 storageSlot = getIncentiveDataSlot(tokenId);
+  unchecked {
+    //       8 bytes    8 bytes                    16 bytes
+    //    +----------+----------+--------------------------------------------+
+    //    |   qMin   |   qMax   |                   shares                   |
+    //    +----------+----------+--------------------------------------------+
+    //
+    uint256 value = readStorage(storageSlot + 1);
+    X59 qMin;
+    X59 qMax;
+    uint256 shares;
+    assembly {
+      qMin := shr(192, value)
+      qMax := and(shr(128, value), 0xFFFFFFFFFFFFFFFF)
+      shares := and(value, 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFF)
+    }
+
+    //          12 bytes        8 bytes              12 bytes
+    //    +------------------+----------+------------------------------------+
+    //    | poolId (96 msbs) |     -    | evanescentPointsPerShareSubtrahend |
+    //    +------------------+----------+------------------------------------+
+    //
+    value = readStorage(storageSlot);
+    uint256 poolId;
+    uint256 evanescentPointsPerShareSubtrahend;
+    assembly {
+      poolId := or(
+        and(value, shl(160, 0xFFFFFFFFFFFFFFFFFFFFFFFF)),
+        address()
+      )
+      evanescentPointsPerShareSubtrahend := and(
+        value,
+        0xFFFFFFFFFFFFFFFFFFFFFFFF
+      )
+    }
+    uint256 evanescentPointsPerShare = calculateEvanescentPointsPerShare(
+      poolId,
+      qMin,
+      qMax
+    );
+    assembly {
+      value := or(
+        and(value, not(0xFFFFFFFFFFFFFFFFFFFFFFFF)),
+        evanescentPointsPerShare
+      )
+    }
+    writeStorage(storageSlot, value);
+
+    //                                  32 bytes
+    //    +------------------------------------------------------------------+
+    //    |                       evanescentPointsOwed                       |
+    //    +------------------------------------------------------------------+
+    //
+    // All operations are safe because 
+    // 'evanescentPointsPerShareSubtrahend <= evanescentPointsPerShareNew <= 
+    // 2 ** 96 - 1'
+    storageSlot += 2;
+    evanescentPointsOwed = readStorage(storageSlot) + shares * (
+      evanescentPointsPerShare - evanescentPointsPerShareSubtrahend
+    );
+    writeStorage(storageSlot, 0);
+  }
+}
+
+/// @notice Encodes incentive data and writes them in 'storageSlot'.
+/// @param storageSlot Output of 'getIncentiveDataSlot'.
+/// @param poolId THe poolId for the corresponding position.
+/// @param qMin Left boundary of the corresponding position.
+/// @param qMax Right boundary of the corresponding position.
+/// @param shares The number of shares for the corresponding position.
+/// @param evanescentPointsPerShareSubtrahend evanescent points per share at
+/// the time when this position is created or the last time it is touched.
+/// @param evanescentPointsOwed Evanescent points accrued since the creation of
+/// this incentive position until the last time it is touched. Collect and 
+/// modify position affect this value.
+/// At any moment, the total number of evanescent points owed to this position
+/// is equal to:
+/// 'evanescentPointsOwed + shares * 
+/// (positionEvanescentPointsPerShare - evanescentPointsPerShareSubtrahend)'
+function writeIncentiveDataThreeSlots(
+  uint256 storageSlot,
+  uint256 poolId,
+  X59 qMin,
+  X59 qMax,
+  uint256 shares,
+  uint256 evanescentPointsPerShareSubtrahend,
+  uint256 evanescentPointsOwed
+) {
+  //
+  //          12 bytes        8 bytes              12 bytes
+  //    +------------------+----------+------------------------------------+
+  //    | poolId (96 msbs) |     -    | evanescentPointsPerShareSubtrahend |
+  //    +------------------+----------+------------------------------------+
+  //
+  //       8 bytes    8 bytes                    16 bytes
+  //    +----------+----------+--------------------------------------------+
+  //    |   qMin   |   qMax   |                   shares                   |
+  //    +----------+----------+--------------------------------------------+
+  //
+  //                                  32 bytes
+  //    +------------------------------------------------------------------+
+  //    |                       evanescentPointsOwed                       |
+  //    +------------------------------------------------------------------+
+  //
+
+  uint256 value0;
+  uint256 value1;
+  assembly {
+    value0 := or(
+      and(poolId, shl(160, 0xFFFFFFFFFFFFFFFFFFFFFFFF)),
+      evanescentPointsPerShareSubtrahend
+    )
+    value1 := or(or(shl(192, qMin), shl(128, qMax)), shares)
+  }
+  writeStorage(storageSlot, value0);
+  unchecked {
+    ++storageSlot;
+  }
+  writeStorage(storageSlot, value1);
+  unchecked {
+    ++storageSlot;
+  }
+  writeStorage(storageSlot, evanescentPointsOwed);
+}
@@ -75,14 +75,15 @@ contract StorageIncentiveWrapper {
   ) public returns (
     uint256 content
   ) {
-    writePoolData(
+    uint256 value = writePoolData(
       storageSlot,
       blockNumber,
       qLower,
       qUpper,
       activeEvanescentPointsPerShare
     );
-    return readStorage(storageSlot);
+    content = readStorage(storageSlot);
+    require(value == content);
   }
 
   function _incentiveDataSlot() public returns (
@@ -210,6 +211,27 @@ contract StorageIncentiveWrapper {
     }
   }
 
+  function _clearIncentiveData(
+    uint256 storageSlot,
+    uint256 content0,
+    uint256 content1,
+    uint256 content2
+  ) public returns (
+    uint256 content0New,
+    uint256 content1New,
+    uint256 content2New
+  ) {
+    unchecked {
+      writeStorage(storageSlot + 0, content0);
+      writeStorage(storageSlot + 1, content1);
+      writeStorage(storageSlot + 2, content2);
+      clearIncentiveData(storageSlot);
+      content0New = readStorage(storageSlot + 0);
+      content1New = readStorage(storageSlot + 1);
+      content2New = readStorage(storageSlot + 2);
+    }
+  }
+
   function _evanescentPointsPerShareMappingSlot() public returns (
     uint256 storageSlot
   ) {
@@ -239,6 +261,179 @@ contract StorageIncentiveWrapper {
     for (uint256 kk = 0; kk < storageSlots.length; kk++) {
       writeStorage(storageSlots[kk], contents[kk]);
     }
-    return calculateEvanescentPointsPerShare(poolId, qMin, qMax);
+    evanescentPointsPerShare = calculateEvanescentPointsPerShare(
+      poolId,
+      qMin,
+      qMax
+    );
+    require(
+      evanescentPointsPerShare == calculateEvanescentPointsPerShare(
+        poolId,
+        qMin,
+        qMax,
+        value
+      )
+    );
+  }
+
+  function _readRewardProgramsCount(
+    uint256 content
+  ) public returns (
+    uint256 count
+  ) {
+    writeStorage(totalEvanescentPointsOwedSlot, content);
+    return readRewardProgramsCount();
+  }
+
+  function _getEvanescentPointsPerShareSnapshotSlot(
+    uint256 storageSlot,
+    uint32 blockNumber
+  ) public returns (
+    uint256 snapshotSlot
+  ) {
+    return getEvanescentPointsPerShareSnapshotSlot(storageSlot, blockNumber);
+  }
+
+  function _writeEvanescentPointsPerShare(
+    uint256 storageSlot,
+    uint256 content,
+    uint256 evanescentPointsPerShare,
+    uint32 blockNumber,
+    uint256[] calldata boundaries
+  ) public returns (
+    uint256 contentNew,
+    uint256[] memory snapshots
+  ) {
+    writeStorage(storageSlot, content);
+    writeEvanescentPointsPerShare(
+      storageSlot,
+      evanescentPointsPerShare,
+      blockNumber,
+      boundaries
+    );
+    contentNew = readStorage(storageSlot);
+    snapshots = new uint256[](boundaries.length);
+    for (uint256 kk = 0; kk < boundaries.length; kk++) {
+      snapshots[kk] = readEvanescentPointsPerShare(
+        storageSlot,
+        uint32(boundaries[kk])
+      );
+    }
+  }
+
+  function _getPoolDataSnapshotSlot(
+    uint256 poolId,
+    uint32 blockNumber
+  ) public returns (
+    uint256 storageSlot
+  ) {
+    return getPoolDataSnapshotSlot(poolId, blockNumber);
+  }
+
+  function _getRewardProgramsStateSlot(
+    uint256 tokenId
+  ) public returns (
+    uint256 storageSlot
+  ) {
+    return getRewardProgramsStateSlot(tokenId);
+  }
+
+  function _getRewardProgramPointsSlot(
+    uint256 tokenId,
+    uint256 programId
+  ) public returns (
+    uint256 storageSlot
+  ) {
+    return getRewardProgramPointsSlot(tokenId, programId);
+  }
+
+  function _getUnpaidRewardProgramPointsSlot(
+    address owner,
+    uint256 programId
+  ) public returns (
+    uint256 storageSlot
+  ) {
+    return getUnpaidRewardProgramPointsSlot(owner, programId);
+  }
+
+  function _rewardProgramSlot() public returns (
+    uint256 storageSlot
+  ) {
+    return rewardProgramSlot;
+  }
+
+  function _getRewardProgramSlot(
+    uint256 programId
+  ) public returns (
+    uint256 storageSlot
+  ) {
+    return getRewardProgramSlot(programId);
+  }
+
+  function _readRewardProgram(
+    uint256 storageSlot,
+    uint256 content0,
+    uint256 content1
+  ) public returns (
+    INofee rewardToken,
+    uint32 startBlock,
+    uint32 endBlock,
+    address payMaster
+  ) {
+    unchecked {
+      writeStorage(storageSlot + 0, content0);
+      writeStorage(storageSlot + 1, content1);
+    }
+    return readRewardProgram(storageSlot);
+  }
+
+  function _writeRewardProgram(
+    uint256 storageSlot,
+    INofee rewardToken,
+    uint32 startBlock,
+    uint32 endBlock,
+    address payMaster
+  ) public returns (
+    uint256 content0,
+    uint256 content1
+  ) {
+    writeRewardProgram(
+      storageSlot,
+      rewardToken,
+      startBlock,
+      endBlock,
+      payMaster
+    );
+    unchecked {
+      content0 = readStorage(storageSlot + 0);
+      content1 = readStorage(storageSlot + 1);
+    }
+  }
+
+  function _rewardProgramAcceptedFlag() public returns (
+    uint256 flag
+  ) {
+    return rewardProgramAcceptedFlag;
+  }
+
+  function _readRewardProgramAccepted(
+    uint256 storageSlot,
+    uint256 content0
+  ) public returns (
+    bool accepted
+  ) {
+    writeStorage(storageSlot, content0);
+    return readRewardProgramAccepted(storageSlot);
+  }
+
+  function _writeRewardProgramAccepted(
+    uint256 storageSlot,
+    uint256 content0
+  ) public returns (
+    uint256 content
+  ) {
+    writeStorage(storageSlot, content0);
+    writeRewardProgramAccepted(storageSlot);
+    return readStorage(storageSlot);
   }
 }
\ No newline at end of file
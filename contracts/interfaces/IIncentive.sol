@@ -69,6 +69,73 @@ interface IIncentive is
   /// owner.
   error NotTokenOwner(address recipient);
 
+  /// @notice Thrown when attempting to burn an incentive position whose
+  /// shares are not fully withdrawn.
+  error PositionNotEmpty(uint256 tokenId, uint256 shares);
+
+  /// @notice Thrown when attempting to merge incentive positions with
+  /// different owners or ranges.
+  error IncompatiblePositions(uint256 tokenId, uint256 otherTokenId);
+
+  /// @notice Thrown when attempting to merge an empty list of incentive
+  /// positions.
+  error NoPositionsToMerge();
+
+  /// @notice Thrown when any address other than 'payMaster' attempts to add a
+  /// reward program.
+  error OnlyByPayMaster(address sender);
+
+  /// @notice Thrown when the window of a new reward program is not within
+  /// 'startBlock' and 'endBlock'.
+  error RewardProgramOutOfWindow(uint32 startBlock, uint32 endBlock);
+
+  /// @notice Thrown when attempting to exceed the maximum number of reward
+  /// programs.
+  error TooManyRewardPrograms();
+
+  /// @notice Thrown when the given 'programId' does not refer to an added
+  /// reward program.
+  error InvalidRewardProgram(uint256 programId);
+
+  /// @notice Thrown when 'totalEvanescentPointsOwed' exceeds 248 bits.
+  error TotalEvanescentPointsOwedOverflow();
+
+  /// @notice Emitted when the shares of an incentive position are modified,
+  /// i.e., on mint, burn, merge and split.
+  event ModifyShares(
+    uint256 indexed tokenId,
+    uint256 indexed poolId,
+    X59 qMin,
+    X59 qMax,
+    int256 sharesIncrement
+  );
+
+  /// @notice Emitted when evanescent points are collected and paid.
+  event Collect(
+    address indexed recipient,
+    uint256 evanescentPointsOwed,
+    uint256 amount
+  );
+
+  /// @notice Emitted for every additional reward program which is paid on
+  /// collect. 'evanescentPointsOwed' is the number of points that the
+  /// collected positions accrued within the program's window.
+  event CollectRewardProgram(
+    address indexed recipient,
+    uint256 indexed programId,
+    uint256 evanescentPointsOwed,
+    uint256 amount
+  );
+
+  /// @notice Emitted when the payment of an additional reward program fails,
+  /// e.g., because its 'payMaster' revokes the allowance. The points are
+  /// kept for 'recipient' who may claim them via 'collectRewardProgram'.
+  event RewardProgramPaymentFailed(
+    address indexed recipient,
+    uint256 indexed programId,
+    uint256 evanescentPointsOwed
+  );
+
   /// @notice IncentivePoolFactory's contract address.
   function incentivePoolFactory() external returns (IIncentivePoolFactory);
 
@@ -94,8 +161,156 @@ interface IIncentive is
   function maxIncentiveGrowth() external returns (X111);
 
   /// @notice Collects incentive rewards for LPs. It should be run by the NFT
-  /// holder of the LP position.
+  /// holder of the LP position. The additional reward programs are paid as
+  /// well and reported by 'CollectRewardProgram' events.
   /// @param tokenId The corresponding tokenId of the incentive position.
-  /// @return amount The amount of rewards collected.
+  /// @return amount The amount of 'rewardToken' collected, i.e., the amount
+  /// paid by 'programId == 0'.
   function collect(uint256 tokenId) external returns (uint256 amount);
+
+  /// @notice Collects incentive rewards for several LP positions at once
+  /// with a single transfer. It should be run by the NFT holder of every
+  /// given LP position.
+  /// @param tokenIds The corresponding tokenIds of the incentive positions.
+  /// @return amount The total amount of rewards collected.
+  function collectBatch(
+    uint256[] calldata tokenIds
+  ) external returns (uint256 amount);
+
+  /// @notice Burns an incentive position whose shares are fully withdrawn.
+  /// Any remaining evanescent points are collected first and the position's
+  /// storage is cleared.
+  /// @param tokenId The corresponding tokenId of the incentive position.
+  /// @return amount The amount of rewards collected.
+  function burn(
+    uint256 tokenId
+  ) external returns (uint256 amount);
+
+  /// @notice Merges incentive positions of the same owner and range into
+  /// 'tokenIds[0]'. Shares are summed and the points accrued by every
+  /// position are settled in 'tokenIds[0]'. The other tokens are burned.
+  /// @param tokenIds The corresponding tokenIds of the incentive positions.
+  /// @return tokenId The tokenId of the merged position, i.e., 'tokenIds[0]'.
+  function merge(
+    uint256[] calldata tokenIds
+  ) external returns (uint256 tokenId);
+
+  /// @notice Moves 'shares' of an incentive position to a new token of the
+  /// same owner and range. The points accrued so far remain with 'tokenId'.
+  /// @param tokenId The corresponding tokenId of the incentive position.
+  /// @param shares The number of shares to be moved.
+  /// @return newTokenId The tokenId of the new position.
+  function split(
+    uint256 tokenId,
+    uint256 shares
+  ) external returns (uint256 newTokenId);
+
+  /// @notice Calculates the evanescent points that would be granted to an
+  /// incentive position if it were collected in the current block, including
+  /// the points accrued by its pool since the last block accounted.
+  /// @param tokenId The corresponding tokenId of the incentive position.
+  /// @return evanescentPointsOwed The pending evanescent points.
+  function pendingPoints(
+    uint256 tokenId
+  ) external view returns (uint256 evanescentPointsOwed);
+
+  /// @notice Estimates the amount of rewards that each of the given incentive
+  /// positions would collect on its own in the current block. The points
+  /// accrued by the position's own pool since its last block accounted are
+  /// included in both the position's points and 'totalEvanescentPointsOwed'.
+  /// The points accrued by other pools which are not accounted yet are not
+  /// included in 'totalEvanescentPointsOwed'. Hence, the estimate may exceed
+  /// the amount that 'collect' pays. It is exact if no other pool has
+  /// pending points, e.g., once 'endBlock' is passed and every pool is
+  /// accounted. Only the base program, i.e., 'programId == 0', is covered.
+  /// Additional reward programs are not included.
+  /// @param tokenIds The corresponding tokenIds of the incentive positions.
+  /// @return amounts The estimated amount of rewards for each position.
+  function pendingRewards(
+    uint256[] calldata tokenIds
+  ) external view returns (uint256[] memory amounts);
+
+  /// @notice Returns the owners and the raw storage records of the given
+  /// incentive positions in one call. Nonexistent tokens are reported with
+  /// 'address(0)' as owner. The records follow the layout of
+  /// 'readIncentiveData' in 'StorageIncentive.sol' where the 20 lsbs of the
+  /// poolId are omitted since they are equal to this contract's address. The
+  /// third word is zero unless 'evanescentPointsOwed' overflows the first.
+  /// @param tokenIds The corresponding tokenIds of the incentive positions.
+  /// @return owners The owner of each position.
+  /// @return data The three storage slots of each position.
+  function incentiveData(
+    uint256[] calldata tokenIds
+  ) external view returns (address[] memory owners, bytes32[3][] memory data);
+
+  /// @notice Adds a reward program which distributes '_rewardToken' from
+  /// '_payMaster' over the evanescent points accrued from '_startBlock' to
+  /// '_endBlock'. Reward programs share the accounting of evanescent points
+  /// with the program given to the constructor which is identified by
+  /// 'programId == 0'. Can only be called by 'payMaster'. The program accrues
+  /// no points and pays nothing until '_payMaster' accepts it via
+  /// 'acceptRewardProgram'.
+  ///
+  /// Every position is paid by the program only for the points that it
+  /// accrues after '_startBlock' and up to '_endBlock'. To this end, the hook
+  /// preserves 'evanescentPointsPerShare' of every pool as of both blocks.
+  /// The payment of the program may fail on its own without blocking the
+  /// collect, in which case the points can be claimed later via
+  /// 'collectRewardProgram'.
+  /// @param _rewardToken The token to be distributed by the program.
+  /// @param _payMaster The address from which rewards are paid.
+  /// @param _startBlock The block from which the program accrues points.
+  /// Should be within 'startBlock' and 'endBlock'.
+  /// @param _endBlock The block after which the program accrues no points.
+  /// Should be within 'startBlock' and 'endBlock'.
+  /// @return programId The identifier of the new program.
+  function addRewardProgram(
+    INofee _rewardToken,
+    address _payMaster,
+    uint32 _startBlock,
+    uint32 _endBlock
+  ) external returns (uint256 programId);
+
+  /// @notice Accepts a reward program on behalf of its 'payMaster'. Can only
+  /// be called by the program's 'payMaster' before the program's
+  /// 'startBlock'.
+  /// @param programId The identifier of the program.
+  function acceptRewardProgram(uint256 programId) external;
+
+  /// @notice The number of reward programs added on top of 'programId == 0'.
+  function rewardProgramsCount() external view returns (uint256);
+
+  /// @notice Pays the points of 'msg.sender' whose payment by the given
+  /// reward program has failed on an earlier collect. If the payment fails
+  /// again, the points are kept.
+  /// @param programId The identifier of the program.
+  /// @return amount The amount of the program's reward token collected.
+  function collectRewardProgram(
+    uint256 programId
+  ) external returns (uint256 amount);
+
+  /// @notice The points of 'owner' whose payment by the given reward program
+  /// has failed and which are not claimed yet.
+  /// @param owner The owner of the points.
+  /// @param programId The identifier of the program.
+  function unpaidRewardProgramPoints(
+    address owner,
+    uint256 programId
+  ) external view returns (uint256);
+
+  /// @notice Returns the parameters of a reward program along with whether
+  /// it is accepted by its 'payMaster' and the evanescent points that it owes.
+  /// Reverts if 'programId' exceeds 'rewardProgramsCount()'.
+  /// @param programId The identifier of the program. 'programId == 0' refers
+  /// to the program given to the constructor.
+  function rewardProgram(
+    uint256 programId
+  ) external view returns (
+    INofee programRewardToken,
+    address programPayMaster,
+    uint32 programStartBlock,
+    uint32 programEndBlock,
+    bool accepted,
+    uint256 totalEvanescentPointsOwed
+  );
 }
\ No newline at end of file
@@ -47,6 +47,10 @@ interface IIncentivePoolFactory is IUnlockCallback, IHook, IERC721 {
   /// subscribed to the 'IncentivePoolFactory' hook.
   error InvalidConversionPool(uint256 poolId);
 
+  /// @notice Thrown when attempting to sync the growth portion of a pool which
+  /// is not initialized by this contract.
+  error UnregisteredPool(uint256 poolId);
+
   /// @notice Thrown when attempting to disburse prior to the next disbursement
   /// block.
   error TooEarlyToDisburse(
@@ -83,6 +87,15 @@ interface IIncentivePoolFactory is IUnlockCallback, IHook, IERC721 {
     uint256 indexed poolId
   );
 
+  /// @notice Emitted when a new pool is initialized by incentive pool
+  /// factory. Filtering by 'tag0' and 'tag1' enumerates the pools which are
+  /// affected by a change of 'poolGrowthPortion' for that pair of tags.
+  event NewPool(
+    Tag indexed tag0,
+    Tag indexed tag1,
+    uint256 indexed poolId
+  );
+
   /// @notice Emitted when a new value for disburseGap is set
   /// incentivePoolFactory.
   event NewDisburseGap(
@@ -127,6 +140,14 @@ interface IIncentivePoolFactory is IUnlockCallback, IHook, IERC721 {
     Tag tag1
   ) external returns (X47 growthPortion);
 
+  /// @notice The mapping of the latest poolGrowthPortion that is set by this
+  /// contract for every pool which is initialized by this contract.
+  /// @param poolId The pool whose poolGrowthPortion to be determined.
+  /// @return growthPortion The resulting poolGrowthPortion.
+  function syncedPoolGrowthPortion(
+    uint256 poolId
+  ) external returns (X47 growthPortion);
+
   /// @notice The mapping of pools that are used to convert tokens to nofee
   /// tokens.
   /// @param tag The tag whose conversion pool to be determined.
@@ -167,7 +188,10 @@ interface IIncentivePoolFactory is IUnlockCallback, IHook, IERC721 {
   function modifyConversionPools(uint256[] memory poolIds) external;
 
   /// @notice Syncs pool growth portion for previously initialized pools with
-  /// the current pool growth portion of this contract.
+  /// the current pool growth portion of this contract. Pools which are
+  /// already synced are skipped. Reverts if any of the pools is not
+  /// initialized by this contract. The pools of a pair of tags can be
+  /// enumerated through 'pools'.
   /// @param poolIds The pools whose poolGrowthPortion to by synced.
   function updatePoolGrowthPortion(uint256[] memory poolIds) external;
 
@@ -383,6 +407,44 @@ interface IIncentivePoolFactory is IUnlockCallback, IHook, IERC721 {
     uint256[] calldata curveArray
   ) external;
 
+  /// @notice Same as 'initialize' for several pools at once. The tags of
+  /// every distinct incentive hook are looked up once, regardless of the
+  /// order of the pools.
+  /// @param unpepperedPoolIds The 'unpepperedPoolId' of each pool.
+  /// @param kernelCompactArrays The 'kernelCompactArray' of each pool.
+  /// @param curveArrays The 'curveArray' of each pool.
+  /// @return poolIds The resulting pool identifiers.
+  function initializeBatch(
+    uint256[] calldata unpepperedPoolIds,
+    uint256[][] calldata kernelCompactArrays,
+    uint256[][] calldata curveArrays
+  ) external returns (uint256[] memory poolIds);
+
+  /// @notice The number of pools which are initialized by this contract for
+  /// a pair of tags.
+  /// @param tag0 The arithmetically smaller Tag.
+  /// @param tag1 The arithmetically larger Tag.
+  /// @return count The resulting number of pools.
+  function poolsCount(
+    Tag tag0,
+    Tag tag1
+  ) external view returns (uint256 count);
+
+  /// @notice A page of the pools which are initialized by this contract for a
+  /// pair of tags, in the order of initialization. The page is clamped to
+  /// the number of pools.
+  /// @param tag0 The arithmetically smaller Tag.
+  /// @param tag1 The arithmetically larger Tag.
+  /// @param start The index of the first pool in the page.
+  /// @param count The maximum number of pools in the page.
+  /// @return poolIds The resulting poolIds.
+  function pools(
+    Tag tag0,
+    Tag tag1,
+    uint256 start,
+    uint256 count
+  ) external view returns (uint256[] memory poolIds);
+
   /// @notice This function provides a new pending 'kernel' for pools that are
   /// initialized by this contract. Can be called by the NFT owner or their
   /// operator only.
@@ -405,4 +467,20 @@ interface IIncentivePoolFactory is IUnlockCallback, IHook, IERC721 {
     uint256 amount,
     uint256 nofeeAmount
   );
+
+  /// @notice Same as 'disburse' for several tags at once, where all of the
+  /// conversions are performed within a single unlock of nofeeswap and the
+  /// resulting nofees are transferred to 'xNofeeToken' with a single 'take'.
+  /// Tags which are not yet due, which are repeated or which have no balance
+  /// are skipped instead of reverting.
+  /// @param tags The tag values to be converted to nofee and disbursed.
+  /// @return amounts The converted balance of 'this' with respect to each tag
+  /// or zero if the tag is skipped.
+  /// @return nofeeAmount The total resulting amount of nofees.
+  function disburseBatch(
+    Tag[] calldata tags
+  ) external returns (
+    uint256[] memory amounts,
+    uint256 nofeeAmount
+  );
 }
\ No newline at end of file
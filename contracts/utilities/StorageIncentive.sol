@@ -3,6 +3,7 @@ pragma solidity ^0.8.28;
 
 import {readStorage, writeStorage} from "@core/utilities/Storage.sol";
 import {X59} from "@core/utilities/X59.sol";
+import {INofee} from "@governance/interfaces/INofee.sol";
 import {IIncentive} from "../interfaces/IIncentive.sol";
 import {
   getPoolIdFromCalldata,
@@ -33,17 +34,39 @@ function incrementTokenId() returns (
 uint256 constant totalEvanescentPointsOwedSlot = 
   0x15DDCE81810DC72EA0A787EE057ABA4C00DC9587828A137DDB1AF46D6B42C9B6;
 
+// The most significant byte of 'totalEvanescentPointsOwedSlot' holds the
+// number of reward programs added on top of the one given to the constructor.
+// Hence, every accounting reads this number along with
+// 'totalEvanescentPointsOwed' which occupies the remaining 248 bits.
+uint256 constant totalEvanescentPointsOwedMask = (1 << 248) - 1;
+
 /// @notice Increments 'totalEvanescentPointsOwed' for all subscribing pools.
+/// The number of reward programs in the same slot remains intact.
 /// @param increment The increment to be added.
 function updateTotalEvanescentPointsOwed(
   uint256 increment
 ) {
+  uint256 value = readStorage(totalEvanescentPointsOwedSlot);
+  uint256 totalEvanescentPointsOwed = 
+    (value & totalEvanescentPointsOwedMask) + increment;
+  require(
+    totalEvanescentPointsOwed <= totalEvanescentPointsOwedMask,
+    IIncentive.TotalEvanescentPointsOwedOverflow()
+  );
   writeStorage(
     totalEvanescentPointsOwedSlot,
-    readStorage(totalEvanescentPointsOwedSlot) + increment
+    (value & ~totalEvanescentPointsOwedMask) | totalEvanescentPointsOwed
   );
 }
 
+/// @notice Reads the number of reward programs added on top of the one given
+/// to the constructor.
+function readRewardProgramsCount() view returns (
+  uint256 count
+) {
+  count = readStorage(totalEvanescentPointsOwedSlot) >> 248;
+}
+
 /////////////////////////////////////////////////////////////// pool data slots
 
 // uint128(uint256(keccak256("poolData"))) - 1
@@ -114,12 +137,15 @@ function readPoolData(
 /// @param qUpper Most recent 'qUpper' boundary of the active interval.
 /// @param activeEvanescentPointsPerShare Evanescent points per share for the
 /// active interval.
+/// @return value The encoded content of 'storageSlot'.
 function writePoolData(
   uint256 storageSlot,
   uint32 blockNumber,
   X59 qLower,
   X59 qUpper,
   uint256 activeEvanescentPointsPerShare
+) returns (
+  uint256 value
 ) {
   //
   //      4 bytes      8 bytes     8 bytes               12 bytes
@@ -127,7 +153,6 @@ function writePoolData(
   //  | blockNumber |  qLower   |  qUpper   | activeEvanescentPointsPerShare |
   //  +-------------+-----------+-----------+--------------------------------+
   //
-  uint256 value;
   assembly {
     value := or(
       or(shl(224, blockNumber), shl(160, qLower)),
@@ -171,6 +196,11 @@ function getIncentiveDataSlot(
   }
 }
 
+// If 'evanescentPointsOwed' does not fit in the 8 unused bytes of the first
+// slot of a position, these bytes are set to 'evanescentPointsOwedOverflow'
+// and the full value is stored in a third slot.
+uint256 constant evanescentPointsOwedOverflow = 0xFFFFFFFFFFFFFFFF;
+
 /// @notice Decodes incentive data from the content of 'storageSlot'.
 /// @param storageSlot Output of 'getIncentiveDataSlot'.
 /// @return poolId The poolId for the corresponding position.
@@ -197,7 +227,7 @@ function readIncentiveData(
   //
   //          12 bytes        8 bytes              12 bytes
   //    +------------------+----------+------------------------------------+
-  //    | poolId (96 msbs) |     -    | evanescentPointsPerShareSubtrahend |
+  //    | poolId (96 msbs) |   owed   | evanescentPointsPerShareSubtrahend |
   //    +------------------+----------+------------------------------------+
   //
   //       8 bytes    8 bytes                    16 bytes
@@ -205,6 +235,8 @@ function readIncentiveData(
   //    |   qMin   |   qMax   |                   shares                   |
   //    +----------+----------+--------------------------------------------+
   //
+  // Only if 'owed == evanescentPointsOwedOverflow':
+  //
   //                                  32 bytes
   //    +------------------------------------------------------------------+
   //    |                       evanescentPointsOwed                       |
@@ -215,12 +247,9 @@ function readIncentiveData(
     ++storageSlot;
   }
   uint256 value1 = readStorage(storageSlot);
-  unchecked {
-    ++storageSlot;
-  }
-  evanescentPointsOwed = readStorage(storageSlot);
   assembly {
     poolId := or(and(value0, shl(160, 0xFFFFFFFFFFFFFFFFFFFFFFFF)), address())
+    evanescentPointsOwed := and(shr(96, value0), 0xFFFFFFFFFFFFFFFF)
     evanescentPointsPerShareSubtrahend := and(
       value0,
       0xFFFFFFFFFFFFFFFFFFFFFFFF
@@ -230,6 +259,12 @@ function readIncentiveData(
     qMax := and(shr(128, value1), 0xFFFFFFFFFFFFFFFF)
     shares := and(value1, 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFF)
   }
+  if (evanescentPointsOwed == evanescentPointsOwedOverflow) {
+    unchecked {
+      ++storageSlot;
+    }
+    evanescentPointsOwed = readStorage(storageSlot);
+  }
 }
 
 /// @notice Increments or decrements shares for an incentive position.
@@ -245,33 +280,30 @@ function modifyIncentiveShares(
   unchecked {
     //          12 bytes        8 bytes              12 bytes
     //    +------------------+----------+------------------------------------+
-    //    | poolId (96 msbs) |     -    | evanescentPointsPerShareSubtrahend |
+    //    | poolId (96 msbs) |   owed   | evanescentPointsPerShareSubtrahend |
     //    +------------------+----------+------------------------------------+
     //
     uint256 storageSlot = getIncentiveDataSlot(tokenId);
+    uint256 value0 = readStorage(storageSlot);
     uint256 evanescentPointsPerShareSubtrahend;
+    uint256 evanescentPointsOwed;
     {
       uint256 poolId;
-      uint256 value = readStorage(storageSlot);
       assembly {
         poolId := or(
-          and(value, shl(160, 0xFFFFFFFFFFFFFFFFFFFFFFFF)),
+          and(value0, shl(160, 0xFFFFFFFFFFFFFFFFFFFFFFFF)),
           address()
         )
+        evanescentPointsOwed := and(shr(96, value0), 0xFFFFFFFFFFFFFFFF)
         evanescentPointsPerShareSubtrahend := and(
-          value,
+          value0,
           0xFFFFFFFFFFFFFFFFFFFFFFFF
         )
-        value := or(
-          and(value, not(0xFFFFFFFFFFFFFFFFFFFFFFFF)),
-          evanescentPointsPerShare
-        )
       }
       require(
         poolId == getPoolIdFromCalldata(),
         IIncentive.InvalidPoolId(poolId, getPoolIdFromCalldata())
       );
-      writeStorage(storageSlot, value);
     }
 
     //       8 bytes    8 bytes                    16 bytes
@@ -279,10 +311,9 @@ function modifyIncentiveShares(
     //    |   qMin   |   qMax   |                   shares                   |
     //    +----------+----------+--------------------------------------------+
     //
-    ++storageSlot;
     int256 shares;
     {
-      uint256 value = readStorage(storageSlot);
+      uint256 value = readStorage(storageSlot + 1);
       X59 qMin;
       X59 qMax;
       assembly {
@@ -312,20 +343,30 @@ function modifyIncentiveShares(
           sharesUpdated
         )
       }
-      writeStorage(storageSlot, value);
+      writeStorage(storageSlot + 1, value);
     }
 
-    //                                  32 bytes
-    //    +------------------------------------------------------------------+
-    //    |                       evanescentPointsOwed                       |
-    //    +------------------------------------------------------------------+
-    //
-    ++storageSlot;
-    writeStorage(
-      storageSlot,
-      readStorage(storageSlot) + uint256(shares) * 
-        (evanescentPointsPerShare - evanescentPointsPerShareSubtrahend)
-    );
+    // The points accrued since the last time the position is touched are
+    // added to 'evanescentPointsOwed'. Since 'evanescentPointsOwed' never
+    // decreases here, an overflowed position remains overflowed.
+    if (evanescentPointsOwed == evanescentPointsOwedOverflow) {
+      evanescentPointsOwed = readStorage(storageSlot + 2);
+    }
+    evanescentPointsOwed += uint256(shares) * 
+      (evanescentPointsPerShare - evanescentPointsPerShareSubtrahend);
+    uint256 owed = evanescentPointsOwed < evanescentPointsOwedOverflow ? 
+      evanescentPointsOwed : 
+      evanescentPointsOwedOverflow;
+    assembly {
+      value0 := or(
+        and(value0, shl(160, 0xFFFFFFFFFFFFFFFFFFFFFFFF)),
+        or(shl(96, owed), evanescentPointsPerShare)
+      )
+    }
+    writeStorage(storageSlot, value0);
+    if (owed == evanescentPointsOwedOverflow) {
+      writeStorage(storageSlot + 2, evanescentPointsOwed);
+    }
   }
 }
 
@@ -356,7 +397,7 @@ function collectEvanescentPoints(
 
     //          12 bytes        8 bytes              12 bytes
     //    +------------------+----------+------------------------------------+
-    //    | poolId (96 msbs) |     -    | evanescentPointsPerShareSubtrahend |
+    //    | poolId (96 msbs) |   owed   | evanescentPointsPerShareSubtrahend |
     //    +------------------+----------+------------------------------------+
     //
     value = readStorage(storageSlot);
@@ -367,6 +408,7 @@ function collectEvanescentPoints(
         and(value, shl(160, 0xFFFFFFFFFFFFFFFFFFFFFFFF)),
         address()
       )
+      evanescentPointsOwed := and(shr(96, value), 0xFFFFFFFFFFFFFFFF)
       evanescentPointsPerShareSubtrahend := and(
         value,
         0xFFFFFFFFFFFFFFFFFFFFFFFF
@@ -377,27 +419,29 @@ function collectEvanescentPoints(
       qMin,
       qMax
     );
+
+    // 'owed' is set to zero.
     assembly {
       value := or(
-        and(value, not(0xFFFFFFFFFFFFFFFFFFFFFFFF)),
+        and(value, shl(160, 0xFFFFFFFFFFFFFFFFFFFFFFFF)),
         evanescentPointsPerShare
       )
     }
     writeStorage(storageSlot, value);
 
-    //                                  32 bytes
-    //    +------------------------------------------------------------------+
-    //    |                       evanescentPointsOwed                       |
-    //    +------------------------------------------------------------------+
-    //
+    // If the position is overflowed, the third slot is read and cleared.
+    if (evanescentPointsOwed == evanescentPointsOwedOverflow) {
+      storageSlot += 2;
+      evanescentPointsOwed = readStorage(storageSlot);
+      writeStorage(storageSlot, 0);
+    }
+
     // All operations are safe because 
     // 'evanescentPointsPerShareSubtrahend <= evanescentPointsPerShareNew <= 
     // 2 ** 96 - 1'
-    storageSlot += 2;
-    evanescentPointsOwed = readStorage(storageSlot) + shares * (
+    evanescentPointsOwed += shares * (
       evanescentPointsPerShare - evanescentPointsPerShareSubtrahend
     );
-    writeStorage(storageSlot, 0);
   }
 }
 
@@ -411,7 +455,9 @@ function collectEvanescentPoints(
 /// the time when this position is created or the last time it is touched.
 /// @param evanescentPointsOwed Evanescent points accrued since the creation of
 /// this incentive position until the last time it is touched. Collect and 
-/// modify position affect this value.
+/// modify position affect this value. The third slot is written if
+/// 'evanescentPointsOwed' overflows and cleared if a previously overflowed
+/// position no longer does.
 /// At any moment, the total number of evanescent points owed to this position
 /// is equal to:
 /// 'evanescentPointsOwed + shares * 
@@ -428,7 +474,7 @@ function writeIncentiveData(
   //
   //          12 bytes        8 bytes              12 bytes
   //    +------------------+----------+------------------------------------+
-  //    | poolId (96 msbs) |     -    | evanescentPointsPerShareSubtrahend |
+  //    | poolId (96 msbs) |   owed   | evanescentPointsPerShareSubtrahend |
   //    +------------------+----------+------------------------------------+
   //
   //       8 bytes    8 bytes                    16 bytes
@@ -436,18 +482,29 @@ function writeIncentiveData(
   //    |   qMin   |   qMax   |                   shares                   |
   //    +----------+----------+--------------------------------------------+
   //
+  // Only if 'owed == evanescentPointsOwedOverflow':
+  //
   //                                  32 bytes
   //    +------------------------------------------------------------------+
   //    |                       evanescentPointsOwed                       |
   //    +------------------------------------------------------------------+
   //
 
+  // Reading the first slot before it is written costs no more than writing
+  // it cold.
+  bool overflowed = (
+    (readStorage(storageSlot) >> 96) & evanescentPointsOwedOverflow
+  ) == evanescentPointsOwedOverflow;
+
+  uint256 owed = evanescentPointsOwed < evanescentPointsOwedOverflow ? 
+    evanescentPointsOwed : 
+    evanescentPointsOwedOverflow;
   uint256 value0;
   uint256 value1;
   assembly {
     value0 := or(
       and(poolId, shl(160, 0xFFFFFFFFFFFFFFFFFFFFFFFF)),
-      evanescentPointsPerShareSubtrahend
+      or(shl(96, owed), evanescentPointsPerShareSubtrahend)
     )
     value1 := or(or(shl(192, qMin), shl(128, qMax)), shares)
   }
@@ -459,7 +516,31 @@ function writeIncentiveData(
   unchecked {
     ++storageSlot;
   }
-  writeStorage(storageSlot, evanescentPointsOwed);
+  if (owed == evanescentPointsOwedOverflow) {
+    writeStorage(storageSlot, evanescentPointsOwed);
+  } else if (overflowed) {
+    // A stale 'evanescentPointsOwed' is not left in the third slot.
+    writeStorage(storageSlot, 0);
+  }
+}
+
+/// @notice Clears the incentive data in 'storageSlot' so that the slots of a
+/// burned position are refunded.
+/// @param storageSlot Output of 'getIncentiveDataSlot'.
+function clearIncentiveData(
+  uint256 storageSlot
+) {
+  uint256 value0 = readStorage(storageSlot);
+  writeStorage(storageSlot, 0);
+  unchecked {
+    writeStorage(storageSlot + 1, 0);
+    if (
+      ((value0 >> 96) & evanescentPointsOwedOverflow) == 
+      evanescentPointsOwedOverflow
+    ) {
+      writeStorage(storageSlot + 2, 0);
+    }
+  }
 }
 
 ///////////////////////////////////// Evanescent points per share mapping slots
@@ -508,6 +589,156 @@ function getEvanescentPointsPerShareMappingSlot(
   }
 }
 
+// The 4 most significant bytes of every entry of
+// 'evanescentPointsPerShareMapping' hold the 'lastBlockAccounted' of the pool
+// when the entry is written. The remaining bytes hold the entry itself.
+uint256 constant evanescentPointsPerShareMask = (1 << 224) - 1;
+
+// uint64(uint256(keccak256("evanescentPointsPerShareSnapshot"))) - 1;
+uint64 constant evanescentPointsPerShareSnapshotSlot = 0x2508F54EA2C8829C;
+
+/// @notice Calculates the slot which preserves the content of an entry of
+/// 'evanescentPointsPerShareMapping' as of 'blockNumber'.
+/// @param storageSlot Output of 'getEvanescentPointsPerShareMappingSlot'.
+/// @param blockNumber The block as of which the entry is preserved.
+/// @return snapshotSlot The resulting slot in storage.
+function getEvanescentPointsPerShareSnapshotSlot(
+  uint256 storageSlot,
+  uint32 blockNumber
+) pure returns (
+  uint256 snapshotSlot
+) {
+  assembly {
+    // We populate the first two memory slots from right to left:
+    //
+    //    0             32            36                                     44
+    //    |             |             |                                      |
+    //    +-------------+-------------+--------------------------------------+
+    //    | storageSlot | blockNumber | evanescentPointsPerShareSnapshotSlot |
+    //    +-------------+-------------+--------------------------------------+
+    //
+
+    // Populates bytes 36 to 44 of memory.
+    mstore(12, evanescentPointsPerShareSnapshotSlot) // 12 = 44 - 32
+
+    // Populates bytes 32 to 36 of memory.
+    mstore(4, blockNumber) // 4 = 36 - 32
+
+    // Populates the entire memory slot 0.
+    mstore(0, storageSlot) // 0 = 32 - 32
+
+    // Caculates the resulting hash.
+    snapshotSlot := keccak256(0, 44)
+  }
+}
+
+/// @notice Reads an entry of 'evanescentPointsPerShareMapping' as of the end
+/// of 'blockNumber'.
+/// @param storageSlot Output of 'getEvanescentPointsPerShareMappingSlot'.
+/// @param blockNumber The block as of which the entry is read which should
+/// not exceed the pool's 'lastBlockAccounted'. 'type(uint32).max' gives the
+/// current content of the entry.
+/// @return evanescentPointsPerShare The content of the entry.
+function readEvanescentPointsPerShare(
+  uint256 storageSlot,
+  uint32 blockNumber
+) view returns (
+  uint256 evanescentPointsPerShare
+) {
+  uint256 value = readStorage(storageSlot);
+
+  // If the entry is written after 'blockNumber', its former content is
+  // preserved by 'writeEvanescentPointsPerShare'.
+  if ((value >> 224) > blockNumber) {
+    return readStorage(
+      getEvanescentPointsPerShareSnapshotSlot(storageSlot, blockNumber)
+    );
+  }
+  return value & evanescentPointsPerShareMask;
+}
+
+/// @notice Writes an entry of 'evanescentPointsPerShareMapping'. If the
+/// former content of the entry is still valid as of any of the given
+/// 'boundaries' prior to 'blockNumber', it is preserved so that
+/// 'readEvanescentPointsPerShare' can look it up as of that boundary.
+/// @param storageSlot Output of 'getEvanescentPointsPerShareMappingSlot'.
+/// @param evanescentPointsPerShare The new content of the entry.
+/// @param blockNumber The pool's 'lastBlockAccounted' as of which the new
+/// content is valid.
+/// @param boundaries The start and end blocks of the accepted reward programs
+/// which are prior to 'blockNumber'.
+function writeEvanescentPointsPerShare(
+  uint256 storageSlot,
+  uint256 evanescentPointsPerShare,
+  uint32 blockNumber,
+  uint256[] memory boundaries
+) {
+  uint256 length = boundaries.length;
+  if (length != 0) {
+    uint256 value = readStorage(storageSlot);
+    uint256 content = value & evanescentPointsPerShareMask;
+
+    // A missing snapshot is read as '0'. Hence, empty entries are skipped.
+    if (content != 0) {
+      uint256 lastBlock = value >> 224;
+      for (uint256 k = 0; k < length; ++k) {
+        uint256 boundary = boundaries[k];
+        if (lastBlock <= boundary) {
+          writeStorage(
+            getEvanescentPointsPerShareSnapshotSlot(
+              storageSlot,
+              uint32(boundary)
+            ),
+            content
+          );
+        }
+      }
+    }
+  }
+  writeStorage(
+    storageSlot,
+    (uint256(blockNumber) << 224) | evanescentPointsPerShare
+  );
+}
+
+// uint128(uint256(keccak256("poolDataSnapshot"))) - 1
+uint128 constant poolDataSnapshotSlot = 0x8B7626FB2B2C2AEB2C57848F36532ABB;
+
+/// @notice Calculates the slot which preserves the data of a pool as of the
+/// end of 'blockNumber'.
+/// @param poolId The poolId whose corresponding slot to be calculated.
+/// @param blockNumber The block as of which the pool's data is preserved.
+/// @return storageSlot The resulting slot in storage.
+function getPoolDataSnapshotSlot(
+  uint256 poolId,
+  uint32 blockNumber
+) pure returns (
+  uint256 storageSlot
+) {
+  assembly {
+    // We populate the first two memory slots from right to left:
+    //
+    //    0             32            36                      52
+    //    |             |             |                       |
+    //    +-------------+-------------+-----------------------+
+    //    |    poolId   | blockNumber | poolDataSnapshotSlot  |
+    //    +-------------+-------------+-----------------------+
+    //
+
+    // Populates bytes 36 to 52 of memory.
+    mstore(20, poolDataSnapshotSlot) // 20 = 52 - 32
+
+    // Populates bytes 32 to 36 of memory.
+    mstore(4, blockNumber) // 4 = 36 - 32
+
+    // Populates the entire memory slot 0.
+    mstore(0, poolId) // 0 = 32 - 32
+
+    // Caculates the resulting hash.
+    storageSlot := keccak256(0, 52)
+  }
+}
+
 /// @notice Given a liquidity range, this function calculates the amount of
 /// evanescent points per a single share within the range.
 function calculateEvanescentPointsPerShare(
@@ -517,19 +748,93 @@ function calculateEvanescentPointsPerShare(
 ) view returns (
   uint256 evanescentPointsPerShare
 ) {
-  uint256 storageSlot = getPoolDataSlot(poolId);
+  return calculateEvanescentPointsPerShare(
+    poolId,
+    qMin,
+    qMax,
+    readStorage(getPoolDataSlot(poolId))
+  );
+}
+
+/// @notice Same as above, except that the content of the pool's data slot is
+/// given by the caller, e.g., right after it is written by the hook.
+/// @param poolData Output of 'readStorage(getPoolDataSlot(poolId))' or '0'
+/// in which case the pool's data slot is read. The data slot of an
+/// initialized pool is never '0' because its 'blockNumber' is positive.
+function calculateEvanescentPointsPerShare(
+  uint256 poolId,
+  X59 qMin,
+  X59 qMax,
+  uint256 poolData
+) view returns (
+  uint256 evanescentPointsPerShare
+) {
+  if (poolData == 0) poolData = readStorage(getPoolDataSlot(poolId));
+  return calculateEvanescentPointsPerShare(
+    poolId,
+    qMin,
+    qMax,
+    poolData,
+    type(uint32).max
+  );
+}
+
+/// @notice Same as above, except that the result is as of the end of
+/// 'blockNumber' which should not exceed the pool's 'lastBlockAccounted'.
+/// Reward programs use this to settle positions at their boundaries.
+/// @param blockNumber A start or end block of an accepted reward program.
+function calculateEvanescentPointsPerShareAt(
+  uint256 poolId,
+  X59 qMin,
+  X59 qMax,
+  uint32 blockNumber
+) view returns (
+  uint256 evanescentPointsPerShare
+) {
+  uint256 poolData = readStorage(getPoolDataSlot(poolId));
+
+  // If the pool is accounted after 'blockNumber', its data as of
+  // 'blockNumber' is preserved by the hook. A missing snapshot means that the
+  // pool is initialized after 'blockNumber'.
+  if ((poolData >> 224) > blockNumber) {
+    poolData = readStorage(getPoolDataSnapshotSlot(poolId, blockNumber));
+    if (poolData == 0) return 0;
+  }
+  return calculateEvanescentPointsPerShare(
+    poolId,
+    qMin,
+    qMax,
+    poolData,
+    blockNumber
+  );
+}
+
+/// @notice Same as above, except that the entries of
+/// 'evanescentPointsPerShareMapping' are read as of 'blockNumber' and
+/// 'poolData' should be valid as of 'blockNumber'.
+function calculateEvanescentPointsPerShare(
+  uint256 poolId,
+  X59 qMin,
+  X59 qMax,
+  uint256 poolData,
+  uint32 blockNumber
+) view returns (
+  uint256 evanescentPointsPerShare
+) {
   (
     ,
     X59 lower,
     X59 upper,
     uint256 activeEvanescentPointsPerShare
-  ) = readPoolData(readStorage(storageSlot));
+  ) = readPoolData(poolData);
 
-  uint256 pointsMin = readStorage(
-    getEvanescentPointsPerShareMappingSlot(poolId, qMin)
+  uint256 pointsMin = readEvanescentPointsPerShare(
+    getEvanescentPointsPerShareMappingSlot(poolId, qMin),
+    blockNumber
   );
-  uint256 pointsMax = readStorage(
-    getEvanescentPointsPerShareMappingSlot(poolId, qMax)
+  uint256 pointsMax = readEvanescentPointsPerShare(
+    getEvanescentPointsPerShareMappingSlot(poolId, qMax),
+    blockNumber
   );
 
   unchecked {
@@ -559,11 +864,299 @@ function calculateEvanescentPointsPerShare(
       // - Additionally, the total number of points per share is capped by
       //   'totalEvanescentPointsOwed'.
       evanescentPointsPerShare = 
-        activeEvanescentPointsPerShare + readStorage(
-          getEvanescentPointsPerShareMappingSlot(poolId, upper)
-        ) - pointsMax + readStorage(
-          getEvanescentPointsPerShareMappingSlot(poolId, lower)
+        activeEvanescentPointsPerShare + readEvanescentPointsPerShare(
+          getEvanescentPointsPerShareMappingSlot(poolId, upper),
+          blockNumber
+        ) - pointsMax + readEvanescentPointsPerShare(
+          getEvanescentPointsPerShareMappingSlot(poolId, lower),
+          blockNumber
         ) - pointsMin;
     }     
   }
-}
\ No newline at end of file
+}
+
+/////////////////////////////////////////////////////// reward program slots
+
+/// @notice The maximum number of reward programs that can be added on top of
+/// the one given to the constructor.
+uint256 constant maxRewardPrograms = 8;
+
+// uint128(uint256(keccak256("rewardProgram"))) - 1
+uint128 constant rewardProgramSlot = 0x3DE403D19327D648EDD7D64351387303;
+
+/// @notice The flag which marks a reward program as accepted by its
+/// 'payMaster'. It occupies the lsb of the unused bytes of the program's
+/// first slot.
+uint256 constant rewardProgramAcceptedFlag = 1 << 160;
+
+/// @notice Calculates 'rewardProgramSlot' for a given 'programId'.
+/// @param programId The programId whose corresponding slot to be calculated.
+/// @return storageSlot The resulting slot in storage.
+function getRewardProgramSlot(
+  uint256 programId
+) pure returns (
+  uint256 storageSlot
+) {
+  assembly {
+    // We populate the first two memory slots from right to left:
+    //
+    //    0                              32                  48
+    //    |                              |                   |
+    //    +------------------------------+-------------------+
+    //    |           programId          | rewardProgramSlot |
+    //    +------------------------------+-------------------+
+    //
+
+    // Populates the most signifacnt 16 bytes of the memory slot 1.
+    mstore(16, rewardProgramSlot) // 16 = 32 - 16
+
+    // Populates the entire memory slot 0.
+    mstore(0, programId) // 0 = 32 - 32
+
+    // Caculates the resulting hash.
+    storageSlot := keccak256(0, 48)
+  }
+}
+
+/// @notice Decodes a reward program from the content of 'storageSlot'. The
+/// program's 'totalEvanescentPointsOwed' is stored separately in
+/// 'storageSlot + 2'.
+/// @param storageSlot Output of 'getRewardProgramSlot'.
+/// @return rewardToken The token which is distributed by the program.
+/// @return startBlock The block from which the program accrues points.
+/// @return endBlock The block after which the program accrues no points.
+/// @return payMaster The address from which the rewards are paid.
+function readRewardProgram(
+  uint256 storageSlot
+) view returns (
+  INofee rewardToken,
+  uint32 startBlock,
+  uint32 endBlock,
+  address payMaster
+) {
+  //
+  //     4 bytes      4 bytes    4 bytes               20 bytes
+  //  +------------+----------+---------+--------------------------------------+
+  //  | startBlock | endBlock | accepted|             rewardToken              |
+  //  +------------+----------+---------+--------------------------------------+
+  //
+  //                 12 bytes                          20 bytes
+  //  +-------------------------------------+----------------------------------+
+  //  |                  -                  |            payMaster             |
+  //  +-------------------------------------+----------------------------------+
+  //
+  uint256 value0 = readStorage(storageSlot);
+  unchecked {
+    ++storageSlot;
+  }
+  uint256 value1 = readStorage(storageSlot);
+  assembly {
+    startBlock := shr(224, value0)
+    endBlock := and(shr(192, value0), 0xFFFFFFFF)
+    rewardToken := and(value0, 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFF)
+    payMaster := and(value1, 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFF)
+  }
+}
+
+/// @notice Encodes a reward program and writes it in 'storageSlot'. The
+/// program is not accepted by its 'payMaster' yet.
+/// @param storageSlot Output of 'getRewardProgramSlot'.
+/// @param rewardToken The token which is distributed by the program.
+/// @param startBlock The block from which the program accrues points.
+/// @param endBlock The block after which the program accrues no points.
+/// @param payMaster The address from which the rewards are paid.
+function writeRewardProgram(
+  uint256 storageSlot,
+  INofee rewardToken,
+  uint32 startBlock,
+  uint32 endBlock,
+  address payMaster
+) {
+  //
+  //     4 bytes      4 bytes    4 bytes               20 bytes
+  //  +------------+----------+---------+--------------------------------------+
+  //  | startBlock | endBlock | accepted|             rewardToken              |
+  //  +------------+----------+---------+--------------------------------------+
+  //
+  //                 12 bytes                          20 bytes
+  //  +-------------------------------------+----------------------------------+
+  //  |                  -                  |            payMaster             |
+  //  +-------------------------------------+----------------------------------+
+  //
+  uint256 value0;
+  uint256 value1;
+  assembly {
+    value0 := or(
+      or(shl(224, startBlock), shl(192, endBlock)),
+      and(rewardToken, 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFF)
+    )
+    value1 := and(payMaster, 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFF)
+  }
+  writeStorage(storageSlot, value0);
+  unchecked {
+    ++storageSlot;
+  }
+  writeStorage(storageSlot, value1);
+}
+
+/// @notice Determines whether the reward program in 'storageSlot' is accepted
+/// by its 'payMaster'.
+/// @param storageSlot Output of 'getRewardProgramSlot'.
+/// @return accepted Whether the program is accepted.
+function readRewardProgramAccepted(
+  uint256 storageSlot
+) view returns (
+  bool accepted
+) {
+  accepted = (readStorage(storageSlot) & rewardProgramAcceptedFlag) != 0;
+}
+
+/// @notice Marks the reward program in 'storageSlot' as accepted by its
+/// 'payMaster'.
+/// @param storageSlot Output of 'getRewardProgramSlot'.
+function writeRewardProgramAccepted(
+  uint256 storageSlot
+) {
+  writeStorage(
+    storageSlot,
+    readStorage(storageSlot) | rewardProgramAcceptedFlag
+  );
+}
+
+// uint128(uint256(keccak256("rewardProgramsState"))) - 1
+uint128 constant rewardProgramsStateSlot = 0xBD237F4D0A7C774DC41A168AE5ED4846;
+
+/// @notice Calculates 'rewardProgramsStateSlot' for a given 'tokenId'. For
+/// every reward program, the slot holds two flags of the position:
+///
+///  'rewardProgramStartedFlag(programId)' which is set once the position's
+///  'evanescentPointsPerShareSubtrahend' is as of a block after the program's
+///  'startBlock',
+///
+///  'rewardProgramEndedFlag(programId)' which is set once the position's
+///  points are settled up to the program's 'endBlock'.
+///
+/// @param tokenId The tokenId whose corresponding slot to be calculated.
+/// @return storageSlot The resulting slot in storage.
+function getRewardProgramsStateSlot(
+  uint256 tokenId
+) pure returns (
+  uint256 storageSlot
+) {
+  assembly {
+    // We populate the first two memory slots from right to left:
+    //
+    //    0                              32                        48
+    //    |                              |                         |
+    //    +------------------------------+-------------------------+
+    //    |            tokenId           | rewardProgramsStateSlot |
+    //    +------------------------------+-------------------------+
+    //
+
+    // Populates the most signifacnt 16 bytes of the memory slot 1.
+    mstore(16, rewardProgramsStateSlot) // 16 = 32 - 16
+
+    // Populates the entire memory slot 0.
+    mstore(0, tokenId) // 0 = 32 - 32
+
+    // Caculates the resulting hash.
+    storageSlot := keccak256(0, 48)
+  }
+}
+
+/// @notice The flag of 'rewardProgramsStateSlot' which marks that a position
+/// has started accruing points for the given reward program.
+function rewardProgramStartedFlag(
+  uint256 programId
+) pure returns (
+  uint256 flag
+) {
+  unchecked {
+    // 'programId' is between '1' and 'maxRewardPrograms'.
+    flag = 1 << (2 * programId - 2);
+  }
+}
+
+/// @notice The flag of 'rewardProgramsStateSlot' which marks that a position
+/// has accrued all of its points for the given reward program.
+function rewardProgramEndedFlag(
+  uint256 programId
+) pure returns (
+  uint256 flag
+) {
+  unchecked {
+    // 'programId' is between '1' and 'maxRewardPrograms'.
+    flag = 1 << (2 * programId - 1);
+  }
+}
+
+// uint128(uint256(keccak256("rewardProgramPoints"))) - 1
+uint128 constant rewardProgramPointsSlot = 0xD7A3D56DED6486A6509674E59154B1F8;
+
+/// @notice Calculates the slot which holds the points that a position has
+/// accrued but not yet collected for a reward program.
+/// @param tokenId The corresponding tokenId.
+/// @param programId The corresponding programId.
+/// @return storageSlot The resulting slot in storage.
+function getRewardProgramPointsSlot(
+  uint256 tokenId,
+  uint256 programId
+) pure returns (
+  uint256 storageSlot
+) {
+  assembly {
+    // We populate the first two memory slots from right to left:
+    //
+    //    0                32                48                         64
+    //    |                |                 |                          |
+    //    +----------------+-----------------+--------------------------+
+    //    |     tokenId    |    programId    | rewardProgramPointsSlot  |
+    //    +----------------+-----------------+--------------------------+
+    //
+
+    // Populates the entire memory slot 1.
+    mstore(32, or(shl(128, programId), rewardProgramPointsSlot))
+
+    // Populates the entire memory slot 0.
+    mstore(0, tokenId)
+
+    // Caculates the resulting hash.
+    storageSlot := keccak256(0, 64)
+  }
+}
+
+// uint128(uint256(keccak256("unpaidRewardProgramPoints"))) - 1
+uint128 constant unpaidRewardProgramPointsSlot = 
+  0x45BFF4CAEAF9E50D42D45101E19E0711;
+
+/// @notice Calculates the slot which holds the collected points of an owner
+/// for a reward program whose payment has failed.
+/// @param owner The owner whose points are not paid.
+/// @param programId The corresponding programId.
+/// @return storageSlot The resulting slot in storage.
+function getUnpaidRewardProgramPointsSlot(
+  address owner,
+  uint256 programId
+) pure returns (
+  uint256 storageSlot
+) {
+  assembly {
+    // We populate the first two memory slots from right to left:
+    //
+    //    0              32               48                              64
+    //    |              |                |                               |
+    //    +--------------+----------------+-------------------------------+
+    //    |     owner    |    programId   | unpaidRewardProgramPointsSlot |
+    //    +--------------+----------------+-------------------------------+
+    //
+
+    // Populates the entire memory slot 1.
+    mstore(32, or(shl(128, programId), unpaidRewardProgramPointsSlot))
+
+    // Populates the entire memory slot 0.
+    mstore(0, and(owner, 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFF))
+
+    // Caculates the resulting hash.
+    storageSlot := keccak256(0, 64)
+  }
+}
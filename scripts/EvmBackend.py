@@ -0,0 +1,430 @@
+# Copyright 2025, NoFeeSwap LLC - All rights reserved.
+#
+# An optional pytest plugin which runs the compiled artifacts of 'build/' in
+# an in-process EVM instead of a hardhat node. It provides the subset of
+# brownie's API that the test modules use, i.e., 'accounts', 'chain',
+# 'reverts', one container per contract with 'deploy' and 'at', contract
+# methods with 'call' and receipts with 'return_value', 'events',
+# 'gas_used' and 'block_number', together with the 'module_isolation' and
+# 'fn_isolation' fixtures. The contracts should be compiled beforehand and
+# 'eth-tester[py-evm]' should be installed. The plugin is loaded by
+# 'tests/conftest.py' only if the '--evm-backend' flag is given:
+#
+#     brownie compile
+#     python -m pytest -p no:pytest-brownie --evm-backend tests/StorageIncentive_test.py
+#
+# Calls and transactions skip JSON-RPC and serialization altogether. The
+# return value of a transaction is taken from a call made right before the
+# transaction on the same state, instead of from a trace as in brownie.
+#
+# 'tests/EvmBackend_test.py' runs the same transactions on brownie's network
+# and on this backend and compares the results.
+import json
+from pathlib import Path
+import pytest
+from eth_abi import encode, decode
+from eth_utils import to_checksum_address, function_abi_to_4byte_selector, event_abi_to_log_topic
+from hexbytes import HexBytes
+
+buildPath = Path(__file__).resolve().parents[1] / 'build' / 'contracts'
+
+gasLimit = 30000000
+
+# Selector of 'Error(string)'.
+errorSelector = bytes.fromhex('08c379a0')
+
+def errorAbis(abi):
+    # Maps the selectors of the custom errors in 'abi' to their entries.
+    return {
+        function_abi_to_4byte_selector(entry): entry
+        for entry in abi if entry['type'] == 'error'
+    }
+
+def eventAbis(abi):
+    # Maps the topics of the non-anonymous events in 'abi' to their entries.
+    return {
+        event_abi_to_log_topic(entry): entry
+        for entry in abi
+        if entry['type'] == 'event' and not entry.get('anonymous')
+    }
+
+def formatRevert(errors, data):
+    # Formats the revert data as brownie does, i.e., 'Error(string)' reasons
+    # as is and custom errors as '<name>: <arg0>, <arg1>, ...' where addresses
+    # are lower case.
+    if isinstance(data, str):
+        if not data.startswith('0x'):
+            return data
+        data = bytes(HexBytes(data))
+    if data[:4] == errorSelector:
+        return decode(['string'], data[4:])[0]
+    entry = errors.get(data[:4])
+    if entry is None:
+        return '0x' + data.hex() if data else None
+    values = decode([abiType(item) for item in entry['inputs']], data[4:])
+    return entry['name'] + ': ' + ', '.join(
+        str(value).lower() if item['type'] == 'address' else str(value)
+        for item, value in zip(entry['inputs'], values)
+    )
+
+def decodeLog(events, log):
+    # Returns the name and the arguments of the event in 'log' or 'None' if its
+    # topic is unknown.
+    topics = [bytes(HexBytes(topic)) for topic in log['topics']]
+    entry = events.get(topics[0]) if topics else None
+    if entry is None:
+        return None
+    indexed = [item for item in entry['inputs'] if item['indexed']]
+    other = [item for item in entry['inputs'] if not item['indexed']]
+    data = decode([abiType(item) for item in other], bytes(HexBytes(log['data'])))
+    values = {item['name']: fromAbi(item, value) for item, value in zip(other, data)}
+    for item, topic in zip(indexed, topics[1:]):
+        # Indexed dynamic types are only available as their hash.
+        if item['type'] in ['string', 'bytes'] or item['type'].endswith(']'):
+            values[item['name']] = HexBytes(topic)
+        else:
+            values[item['name']] = fromAbi(item, decode([abiType(item)], topic)[0])
+    return entry['name'], values
+
+def abiType(entry):
+    # Canonical type of an ABI input or output where tuples are expanded.
+    if entry['type'].startswith('tuple'):
+        return '(' + ','.join(abiType(component) for component in entry['components']) + ')' + entry['type'][5:]
+    return entry['type']
+
+def toAbi(entry, value):
+    # Converts the arguments given by the tests, e.g., contracts, accounts and
+    # hex strings, to the values expected by 'eth_abi'.
+    kind = entry['type']
+    if kind.endswith(']'):
+        inner = dict(entry, type=kind[:kind.rindex('[')])
+        return [toAbi(inner, item) for item in value]
+    if kind == 'tuple':
+        return tuple(toAbi(component, item) for component, item in zip(entry['components'], value))
+    if hasattr(value, 'address'):
+        value = value.address
+    if kind == 'address':
+        return to_checksum_address(value)
+    if kind.startswith('bytes'):
+        return bytes(HexBytes(value))
+    if kind.startswith('uint') or kind.startswith('int'):
+        return int(value, 16) if isinstance(value, str) else int(value)
+    return value
+
+def fromAbi(entry, value):
+    # Converts decoded values to those returned by brownie, i.e., checksummed
+    # addresses and 'HexBytes'.
+    kind = entry['type']
+    if kind.endswith(']'):
+        inner = dict(entry, type=kind[:kind.rindex('[')])
+        return tuple(fromAbi(inner, item) for item in value)
+    if kind == 'tuple':
+        return tuple(fromAbi(component, item) for component, item in zip(entry['components'], value))
+    if kind == 'address':
+        return to_checksum_address(value)
+    if kind.startswith('bytes'):
+        return HexBytes(value)
+    return value
+
+class VirtualMachineError(Exception):
+    def __init__(self, revert_msg):
+        super().__init__(revert_msg)
+        self.revert_msg = revert_msg
+
+class reverts:
+    # Same as 'brownie.reverts'. Custom errors are formatted as
+    # '<name>: <arg0>, <arg1>, ...'.
+    def __init__(self, revert_msg=None):
+        self.revert_msg = revert_msg
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            raise AssertionError('Transaction did not revert')
+        if exc_type is not VirtualMachineError:
+            return False
+        if self.revert_msg is not None and exc_value.revert_msg != self.revert_msg:
+            raise AssertionError('Unexpected revert string \'' + str(exc_value.revert_msg) + '\'')
+        return True
+
+class Account:
+    def __init__(self, address, private_key=None):
+        self.address = to_checksum_address(address)
+        self.private_key = private_key
+
+    def __str__(self):
+        return self.address
+
+    def __eq__(self, other):
+        return str(self).lower() == str(getattr(other, 'address', other)).lower()
+
+    def __hash__(self):
+        return hash(self.address.lower())
+
+class Accounts(list):
+    def __init__(self, backend):
+        super().__init__(Account(address) for address in backend.tester.get_accounts())
+        self.backend = backend
+
+    def add(self):
+        from eth_account import Account as LocalAccount
+        local = LocalAccount.create()
+        privateKey = '0x' + bytes(local.key).hex()
+        self.backend.tester.add_account(privateKey)
+        account = Account(local.address, privateKey)
+        self.append(account)
+        return account
+
+class Block:
+    def __init__(self, block):
+        self.number = block['number']
+        self.timestamp = block['timestamp']
+
+class Chain:
+    def __init__(self, backend):
+        self.backend = backend
+
+    def __getitem__(self, index):
+        if index < 0:
+            index = self.height + 1 + index
+        return Block(self.backend.tester.get_block_by_number(index))
+
+    @property
+    def height(self):
+        return self.backend.tester.get_block_by_number('latest')['number']
+
+    def mine(self, blocks=1):
+        self.backend.tester.mine_blocks(blocks)
+
+class EventItem(list):
+    # A list of the events with the same name where string keys refer to the
+    # first event, as in brownie's 'EventDict'.
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return list.__getitem__(self, 0)[key]
+        return list.__getitem__(self, key)
+
+class TransactionReceipt:
+    def __init__(self, backend, receipt, return_value):
+        self.return_value = return_value
+        self.gas_used = receipt['gas_used']
+        self.block_number = receipt['block_number']
+        self.contract_address = receipt['contract_address']
+        self.events = {}
+        for log in receipt['logs']:
+            event = decodeLog(backend.events, log)
+            if event is not None:
+                self.events.setdefault(event[0], EventItem()).append(event[1])
+
+class ContractMethod:
+    def __init__(self, contract, abi):
+        self.contract = contract
+        self.abi = abi
+        self.selector = function_abi_to_4byte_selector(abi)
+        self.inputTypes = [abiType(entry) for entry in abi['inputs']]
+        self.outputTypes = [abiType(entry) for entry in abi['outputs']]
+
+    def encodeInput(self, args):
+        return self.selector + encode(
+            self.inputTypes,
+            [toAbi(entry, arg) for entry, arg in zip(self.abi['inputs'], args)]
+        )
+
+    def decodeOutput(self, data):
+        values = [
+            fromAbi(entry, value) for entry, value in zip(
+                self.abi['outputs'],
+                decode(self.outputTypes, data)
+            )
+        ]
+        if len(values) == 0:
+            return None
+        return values[0] if len(values) == 1 else tuple(values)
+
+    def call(self, *args):
+        args, tx = splitArgs(args, len(self.inputTypes))
+        return self.decodeOutput(self.contract.backend.call(
+            tx,
+            self.contract.address,
+            self.encodeInput(args)
+        ))
+
+    def transact(self, *args):
+        args, tx = splitArgs(args, len(self.inputTypes))
+        data = self.encodeInput(args)
+        backend = self.contract.backend
+        returnValue = self.decodeOutput(backend.call(tx, self.contract.address, data))
+        return TransactionReceipt(
+            backend,
+            backend.send(tx, self.contract.address, data),
+            returnValue
+        )
+
+    def __call__(self, *args):
+        if self.abi['stateMutability'] in ['view', 'pure']:
+            return self.call(*args)
+        return self.transact(*args)
+
+class OverloadedMethod:
+    # Overloads are told apart by their number of inputs.
+    def __init__(self, methods):
+        self.methods = methods
+
+    def select(self, args):
+        for method in self.methods:
+            if len(splitArgs(args, len(method.inputTypes))[0]) == len(method.inputTypes):
+                return method
+        raise TypeError('No overload matches ' + str(len(args)) + ' arguments')
+
+    def call(self, *args):
+        return self.select(args).call(*args)
+
+    def __call__(self, *args):
+        return self.select(args)(*args)
+
+def splitArgs(args, count):
+    # Separates the trailing transaction dictionary, if any.
+    if len(args) == count + 1 and isinstance(args[-1], dict):
+        return args[:-1], args[-1]
+    return args, {}
+
+class Contract:
+    def __init__(self, container, address):
+        self.backend = container.backend
+        self.address = to_checksum_address(address)
+        methods = {}
+        for entry in container.abi:
+            if entry['type'] == 'function':
+                methods.setdefault(entry['name'], []).append(ContractMethod(self, entry))
+        for name, overloads in methods.items():
+            setattr(self, name, overloads[0] if len(overloads) == 1 else OverloadedMethod(overloads))
+
+    def __str__(self):
+        return self.address
+
+class ContractContainer:
+    def __init__(self, backend, name, build):
+        self.backend = backend
+        self._name = name
+        self.abi = build['abi']
+        self.bytecode = build['bytecode']
+
+    def deploy(self, *args):
+        constructor = next((entry for entry in self.abi if entry['type'] == 'constructor'), {'inputs': []})
+        args, tx = splitArgs(args, len(constructor['inputs']))
+        if '__' in self.bytecode:
+            raise ValueError(self._name + ' requires linked libraries')
+        data = bytes.fromhex(self.bytecode) + encode(
+            [abiType(entry) for entry in constructor['inputs']],
+            [toAbi(entry, arg) for entry, arg in zip(constructor['inputs'], args)]
+        )
+        receipt = self.backend.send(tx, None, data)
+        return Contract(self, receipt['contract_address'])
+
+    def at(self, address):
+        return Contract(self, str(getattr(address, 'address', address)))
+
+class EvmBackend:
+    def __init__(self):
+        from eth_tester import EthereumTester, PyEVMBackend
+        from eth_tester.exceptions import TransactionFailed
+        from eth.vm.forks import CancunVM
+        self.transactionFailed = TransactionFailed
+        # The fork is pinned to 'evm_version' of 'brownie-config.yaml'.
+        self.tester = EthereumTester(PyEVMBackend(
+            genesis_parameters=PyEVMBackend.generate_genesis_params(
+                overrides={'gas_limit': gasLimit}
+            ),
+            vm_configuration=((0, CancunVM),)
+        ))
+        self.genesis = self.tester.take_snapshot()
+        self.accounts = Accounts(self)
+        self.chain = Chain(self)
+        self.containers = {}
+        self.errors = {}
+        self.events = {}
+        for path in sorted(buildPath.glob('*.json')):
+            build = json.loads(path.read_text())
+            if not build.get('bytecode') and not build.get('abi'):
+                continue
+            self.containers[path.stem] = ContractContainer(self, path.stem, build)
+            self.errors.update(errorAbis(build['abi']))
+            self.events.update(eventAbis(build['abi']))
+
+    def reset(self):
+        self.tester.revert_to_snapshot(self.genesis)
+        self.genesis = self.tester.take_snapshot()
+
+    def transaction(self, tx, to, data):
+        sender = tx.get('from', self.accounts[0])
+        transaction = {
+            'from': to_checksum_address(str(getattr(sender, 'address', sender))),
+            'gas': tx.get('gas', gasLimit),
+            'value': tx.get('value', 0),
+            'data': '0x' + data.hex()
+        }
+        if to is not None:
+            transaction['to'] = to
+        return transaction
+
+    def call(self, tx, to, data):
+        try:
+            return bytes(HexBytes(self.tester.call(self.transaction(tx, to, data))))
+        except self.transactionFailed as error:
+            raise VirtualMachineError(self.decodeError(error)) from None
+
+    def send(self, tx, to, data):
+        try:
+            transactionHash = self.tester.send_transaction(self.transaction(tx, to, data))
+        except self.transactionFailed as error:
+            raise VirtualMachineError(self.decodeError(error)) from None
+        return self.tester.get_transaction_receipt(transactionHash)
+
+    def decodeError(self, error):
+        return formatRevert(self.errors, error.args[0] if error.args else b'')
+
+backend = None
+
+def pytest_configure(config):
+    # Exposes the backend through 'brownie' so that the test modules import
+    # it unchanged.
+    global backend
+    if config.pluginmanager.has_plugin('pytest-brownie'):
+        raise pytest.UsageError(
+            '--evm-backend requires brownie\'s plugin to be disabled, i.e., '
+            '-p no:pytest-brownie'
+        )
+    try:
+        backend = EvmBackend()
+    except ImportError as error:
+        raise pytest.UsageError(
+            'scripts.EvmBackend requires eth-tester[py-evm]: ' + str(error)
+        )
+    import brownie
+    for name, container in backend.containers.items():
+        setattr(brownie, name, container)
+    brownie.accounts = backend.accounts
+    brownie.chain = backend.chain
+    brownie.reverts = reverts
+
+@pytest.fixture(scope='session')
+def accounts():
+    return backend.accounts
+
+@pytest.fixture(scope='session')
+def chain():
+    return backend.chain
+
+@pytest.fixture(scope='module')
+def module_isolation():
+    backend.reset()
+    yield
+    backend.reset()
+
+@pytest.fixture
+def fn_isolation():
+    snapshot = backend.tester.take_snapshot()
+    yield
+    backend.tester.revert_to_snapshot(snapshot)
@@ -0,0 +1,110 @@
+# Copyright 2025, NoFeeSwap LLC - All rights reserved.
+from concurrent.futures import ThreadPoolExecutor
+import math
+import numpy as np
+
+def emissionRate(growth, integral0, integral1, outgoingMax, maxIncentiveGrowth):
+    # Evanescent points per share per block accrued by the active interval,
+    # i.e., 'growth * geometricMean(integral0, integral1) / outgoingMax' as in
+    # 'Incentive._calculatePointsPerShareIncrement'. Integer division is left
+    # to the caller since it depends on the number of blocks accounted at
+    # once. As in 'Incentive._accountEvanescentPoints', no points accrue if
+    # 'growth' exceeds 'maxIncentiveGrowth'.
+    if growth > maxIncentiveGrowth:
+        return 0.0
+    return growth * math.isqrt((integral0 * integral1) >> 208) / outgoingMax
+
+def readPools(access, nofeeswap, poolIds, maxIncentiveGrowth, workers=16):
+    # Pulls the dynamic and static parameters of 'poolIds' concurrently
+    # through 'AccessIncentive' and returns a dictionary of columns with one
+    # entry per pool. 'maxIncentiveGrowth' is that of the incentive hook of
+    # 'poolIds'.
+    def read(poolId):
+        _, growth, integral0, integral1, sharesTotal, pointer, logPriceCurrent = access._readDynamicParams(nofeeswap, poolId)
+        outgoingMax = access._readStaticParams1(nofeeswap, poolId, pointer)[0]
+        return (
+            emissionRate(growth, integral0, integral1, outgoingMax, maxIncentiveGrowth),
+            logPriceCurrent,
+            sharesTotal
+        )
+
+    with ThreadPoolExecutor(workers) as executor:
+        rows = list(executor.map(read, poolIds))
+    return {
+        'poolId': list(poolIds),
+        'rate': np.array([row[0] for row in rows], dtype=np.float64),
+        'logPriceCurrent': np.array([row[1] for row in rows], dtype=np.uint64),
+        'sharesTotal': np.array([row[2] for row in rows], dtype=np.float64)
+    }
+
+def rangeGrid(logPriceCurrent, spacing, widths, shifts):
+    # Candidate ranges around 'logPriceCurrent', aligned to 'spacing'. Each
+    # range spans 'width' intervals and its lower boundary is 'shift'
+    # intervals below the one of the active interval. Returns '(qMin, qMax)'
+    # arrays of shape '(len(widths) * len(shifts),)'. Boundaries beyond the
+    # range of 'uint64' are clamped to it.
+    lower = (int(logPriceCurrent) // spacing) * spacing
+    qMin = [lower - shift * spacing for width in widths for shift in shifts]
+    qMax = [lower + (width - shift) * spacing for width in widths for shift in shifts]
+    clamp = lambda q: min(max(q, 0), (1 << 64) - 1)
+    return (
+        np.array([clamp(q) for q in qMin], dtype=np.uint64),
+        np.array([clamp(q) for q in qMax], dtype=np.uint64)
+    )
+
+def currentRates(pools, qMin, qMax):
+    # Points per share per block that a position over '(qMin, qMax)' earns in
+    # each pool right now, as an array of shape '(pools, ranges)'. As in
+    # 'Incentive._pendingPoints', only a range which contains the active
+    # interval earns points.
+    logPriceCurrent = pools['logPriceCurrent'][:, None]
+    inRange = (qMin[None, :] < logPriceCurrent) & (logPriceCurrent < qMax[None, :])
+    return pools['rate'][:, None] * inRange
+
+def normalCdf(x):
+    # Abramowitz and Stegun 7.1.26, with an absolute error below '1.5e-7'.
+    z = np.abs(x) / math.sqrt(2)
+    t = 1 / (1 + 0.3275911 * z)
+    erf = 1 - t * (
+        0.254829592 + t * (
+            -0.284496736 + t * (
+                1.421413741 + t * (-1.453152027 + t * 1.061405429)
+            )
+        )
+    ) * np.exp(-z * z)
+    return 0.5 * (1 + np.sign(x) * erf)
+
+def projectedRates(pools, qMin, qMax, volatility, horizon, steps=64):
+    # Expected points per share per block over the next 'horizon' blocks,
+    # as an array of shape '(pools, ranges)'. The log price is modeled as a
+    # driftless random walk with a standard deviation of 'volatility' per
+    # square root of a block, in the same units as 'qMin' and 'qMax', and the
+    # emission rate of every pool is held at its current value. The fraction
+    # of the horizon spent in range is averaged over 'steps' evenly spaced
+    # blocks.
+    logPriceCurrent = pools['logPriceCurrent'].astype(np.float64)[:, None, None]
+    deviation = volatility * np.sqrt(np.linspace(1, horizon, steps))[None, None, :]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        lower = (qMin.astype(np.float64)[None, :, None] - logPriceCurrent) / deviation
+        upper = (qMax.astype(np.float64)[None, :, None] - logPriceCurrent) / deviation
+    inRange = (normalCdf(upper) - normalCdf(lower)).mean(axis=2)
+    return pools['rate'][:, None] * inRange
+
+def rewardPerPoint(allowance, totalEvanescentPointsOwed):
+    # The amount of reward token that one evanescent point is worth when
+    # collected right now, as in 'Incentive._payRewards'.
+    return allowance / totalEvanescentPointsOwed if totalEvanescentPointsOwed else 0.0
+
+def main(access, nofeeswap, *poolIds):
+    # brownie run IncentiveAnalytics main <access> <nofeeswap> <poolId> ...
+    # All pools should share the same incentive hook, i.e., the 20 lsbs of
+    # their poolIds.
+    from brownie import AccessIncentive, Incentive
+    poolIds = [int(poolId, 0) for poolId in poolIds]
+    hooks = {poolId % (1 << 160) for poolId in poolIds}
+    assert len(hooks) == 1, 'poolIds of different incentive hooks'
+    incentive = Incentive.at('0x' + format(hooks.pop(), '040x'))
+    pools = readPools(AccessIncentive.at(access), nofeeswap, poolIds, incentive.maxIncentiveGrowth())
+    for poolId, rate in zip(pools['poolId'], pools['rate']):
+        print(hex(poolId), rate)
+    return pools
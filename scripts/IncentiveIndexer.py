@@ -0,0 +1,212 @@
+# Copyright 2025, NoFeeSwap LLC - All rights reserved.
+import sqlite3
+
+# keccak256("Transfer(address,address,uint256)")
+transferTopic = '0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef'
+
+# keccak256("ModifyShares(uint256,uint256,int256,int256,int256)")
+modifySharesTopic = '0xe753576ff0c78a2b2614542c5589d81346077c8af5adb6ab9dcc7de428c05227'
+
+address0 = '0x0000000000000000000000000000000000000000'
+
+# 'poolId', 'qMin', 'qMax' and 'shares' exceed the signed 64-bit integers of
+# SQLite. Hence, they are stored as fixed width big endian blobs whose byte
+# order agrees with the numerical order so that range queries remain
+# index-backed.
+def toBlob(value, width):
+    return value.to_bytes(width, 'big')
+
+def fromBlob(value):
+    return int.from_bytes(value, 'big')
+
+def toInt(value):
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str):
+        return int(value, 16)
+    return int.from_bytes(bytes(value), 'big')
+
+def toAddress(topic):
+    return '0x' + format(toInt(topic) % (1 << 160), '040x')
+
+class IncentiveIndex:
+    # A local index of the positions of a single 'Incentive' contract, built
+    # from its 'Transfer' logs and the 'incentiveData' view. Every page of
+    # logs is applied in one transaction together with the block cursor, so
+    # an interrupted catch-up resumes from the last complete page.
+    def __init__(self, path=':memory:'):
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript('''
+            CREATE TABLE IF NOT EXISTS positions (
+                tokenId INTEGER PRIMARY KEY,
+                owner TEXT NOT NULL,
+                poolId BLOB,
+                qMin BLOB,
+                qMax BLOB,
+                shares BLOB
+            );
+            CREATE INDEX IF NOT EXISTS positionsByOwner ON positions (owner);
+            CREATE INDEX IF NOT EXISTS positionsByRange ON positions (poolId, qMin, qMax);
+            CREATE TABLE IF NOT EXISTS cursor (
+                id INTEGER PRIMARY KEY CHECK (id = 0),
+                blockNumber INTEGER NOT NULL
+            );
+        ''')
+
+    def readCursor(self):
+        row = self.connection.execute('SELECT blockNumber FROM cursor WHERE id = 0').fetchone()
+        return row[0] if row else -1
+
+    def writeCursor(self, blockNumber):
+        self.connection.execute(
+            'INSERT INTO cursor (id, blockNumber) VALUES (0, ?) '
+            'ON CONFLICT (id) DO UPDATE SET blockNumber = excluded.blockNumber',
+            (blockNumber,)
+        )
+
+    def applyTransfer(self, sender, recipient, tokenId):
+        # Mints insert a position whose data is filled by 'applyPosition'.
+        # Burns remove it.
+        if recipient == address0:
+            self.connection.execute('DELETE FROM positions WHERE tokenId = ?', (tokenId,))
+        elif sender == address0:
+            self.connection.execute(
+                'INSERT OR REPLACE INTO positions (tokenId, owner) VALUES (?, ?)',
+                (tokenId, recipient)
+            )
+        else:
+            self.connection.execute(
+                'UPDATE positions SET owner = ? WHERE tokenId = ?',
+                (recipient, tokenId)
+            )
+
+    def applyPosition(self, tokenId, poolId, qMin, qMax, shares):
+        self.connection.execute(
+            'UPDATE positions SET poolId = ?, qMin = ?, qMax = ?, shares = ? WHERE tokenId = ?',
+            (toBlob(poolId, 32), toBlob(qMin, 8), toBlob(qMax, 8), toBlob(shares, 16), tokenId)
+        )
+
+    def applyLogs(self, logs):
+        # Applies a page of 'Transfer' and 'ModifyShares' logs in chain order
+        # and returns the tokenIds which still exist and whose data should be
+        # refreshed.
+        touched = set()
+        for log in sorted(logs, key=lambda log: (log['blockNumber'], log['logIndex'])):
+            topics = log['topics']
+            if toInt(topics[0]) == toInt(modifySharesTopic):
+                if self.connection.execute(
+                    'SELECT 1 FROM positions WHERE tokenId = ?',
+                    (toInt(topics[1]),)
+                ).fetchone():
+                    touched.add(toInt(topics[1]))
+                continue
+            tokenId = toInt(topics[3])
+            recipient = toAddress(topics[2])
+            self.applyTransfer(toAddress(topics[1]), recipient, tokenId)
+            if recipient == address0:
+                touched.discard(tokenId)
+            else:
+                touched.add(tokenId)
+        return sorted(touched)
+
+    def decodePosition(self, row):
+        tokenId, owner, poolId, qMin, qMax, shares = row
+        return (
+            tokenId,
+            owner,
+            None if poolId is None else fromBlob(poolId),
+            None if qMin is None else fromBlob(qMin),
+            None if qMax is None else fromBlob(qMax),
+            None if shares is None else fromBlob(shares)
+        )
+
+    def positionsOf(self, owner):
+        return [self.decodePosition(row) for row in self.connection.execute(
+            'SELECT * FROM positions WHERE owner = ? ORDER BY tokenId',
+            (owner.lower(),)
+        )]
+
+    def positionsIn(self, poolId, logPriceMin=None, logPriceMax=None):
+        # Positions of 'poolId' whose range intersects
+        # '(logPriceMin, logPriceMax)'. All positions of the pool are returned
+        # if no bounds are given.
+        query = 'SELECT * FROM positions WHERE poolId = ?'
+        args = [toBlob(poolId, 32)]
+        if logPriceMax is not None:
+            query += ' AND qMin < ?'
+            args += [toBlob(logPriceMax, 8)]
+        if logPriceMin is not None:
+            query += ' AND qMax > ?'
+            args += [toBlob(logPriceMin, 8)]
+        query += ' ORDER BY tokenId'
+        return [self.decodePosition(row) for row in self.connection.execute(query, args)]
+
+def getLogs(web3, address, fromBlock, toBlock, pageSize):
+    # Pages 'eth_getLogs' over '[fromBlock, toBlock]'. A page which the node
+    # rejects, e.g., for exceeding its result limit, is split in halves.
+    # Yields '(lastBlock, logs)' for consecutive pages.
+    while fromBlock <= toBlock:
+        lastBlock = min(toBlock, fromBlock + pageSize - 1)
+        try:
+            logs = web3.eth.get_logs({
+                'address': address,
+                'fromBlock': fromBlock,
+                'toBlock': lastBlock,
+                'topics': [[transferTopic, modifySharesTopic]]
+            })
+        except ValueError:
+            if lastBlock == fromBlock:
+                raise
+            pageSize = (lastBlock - fromBlock + 1) // 2
+            continue
+        yield lastBlock, logs
+        fromBlock = lastBlock + 1
+
+def readPositions(incentive, tokenIds, batchSize=500):
+    # Reads the records of 'tokenIds' through 'incentiveData' in batches and
+    # yields '(tokenId, poolId, qMin, qMax, shares)'.
+    address = toInt(incentive.address)
+    for k in range(0, len(tokenIds), batchSize):
+        batch = tokenIds[k:k + batchSize]
+        owners, data = incentive.incentiveData(batch)
+        for tokenId, owner, (value0, value1, _) in zip(batch, owners, data):
+            if toInt(owner) == 0:
+                continue
+            value0 = toInt(value0)
+            value1 = toInt(value1)
+            yield (
+                tokenId,
+                (value0 & (((1 << 96) - 1) << 160)) | address,
+                (value1 >> 192) % (1 << 64),
+                (value1 >> 128) % (1 << 64),
+                value1 % (1 << 128)
+            )
+
+def catchUp(index, web3, incentive, toBlock=None, fromBlock=0, pageSize=10000):
+    # Brings 'index' up to 'toBlock', starting right after its cursor.
+    if toBlock is None:
+        toBlock = web3.eth.block_number
+    fromBlock = max(fromBlock, index.readCursor() + 1)
+    for lastBlock, logs in getLogs(web3, incentive.address, fromBlock, toBlock, pageSize):
+        with index.connection:
+            touched = index.applyLogs(logs)
+            for position in readPositions(incentive, touched):
+                index.applyPosition(*position)
+            index.writeCursor(lastBlock)
+    return index
+
+def refresh(index, incentive):
+    # Re-reads every indexed position, e.g., for deployments which predate
+    # 'ModifyShares'.
+    tokenIds = [row[0] for row in index.connection.execute('SELECT tokenId FROM positions')]
+    with index.connection:
+        for position in readPositions(incentive, tokenIds):
+            index.applyPosition(*position)
+    return index
+
+def main(incentive, path='incentive.sqlite', fromBlock=0):
+    # brownie run IncentiveIndexer main <incentive> [path] [fromBlock]
+    from brownie import web3, Incentive
+    index = IncentiveIndex(path)
+    catchUp(index, web3, Incentive.at(incentive), fromBlock=int(fromBlock))
+    return index
@@ -0,0 +1,287 @@
+# Copyright 2025, NoFeeSwap LLC - All rights reserved.
+import asyncio
+import copy
+import math
+from sympy import Integer, floor, exp
+from scripts.PoolModel import Pool, getGrowthMultiplier
+
+def toInt(value):
+    return value if isinstance(value, int) else int(value, 16)
+
+def decodeKernel(kernelArray):
+    # Inverse of 'encodeKernel'. Every breakpoint occupies two words whose
+    # first 80 bits are the height and the position of the breakpoint.
+    kernel = [[0, 0]]
+    for k in range(0, len(kernelArray), 2):
+        word = int(kernelArray[k])
+        kernel += [[(word >> 176) % (1 << 64), word >> 240]]
+    return kernel
+
+def decodeCurve(curveArray):
+    # Inverse of 'encodeCurve'. The unused tail of the last word is zero.
+    curve = []
+    for word in curveArray:
+        for shift in [192, 128, 64, 0]:
+            point = (int(word) >> shift) % (1 << 64)
+            if point != 0:
+                curve += [point]
+    return curve
+
+def readPool(nofeeswap, access, poolId, numberOfIntervals=8):
+    # Seeds the 'Pool' model of 'PoolModel.py' with the state of 'poolId' over
+    # 'numberOfIntervals' intervals on each side of the active one. The
+    # growth and the total shares of every interval are read as in
+    # 'checkPool'.
+    _, growth, _, _, sharesTotal, pointer, logPriceCurrent = access._readDynamicParams(nofeeswap, poolId)
+    _, _, _, poolGrowthPortion, _, protocolGrowthPortion, _ = access._readStaticParams1(nofeeswap, poolId, pointer)
+    kernel = decodeKernel(access._readKernel(nofeeswap, poolId, pointer + 1))
+    curve = decodeCurve(access._readCurve.call(nofeeswap, poolId, logPriceCurrent))
+    logOffset = (poolId >> 180) % 256
+    if logOffset >= 128:
+        logOffset -= 256
+
+    pool = Pool(
+        logOffset,
+        curve,
+        kernel,
+        Integer(protocolGrowthPortion) / (1 << 47),
+        Integer(poolGrowthPortion) / (1 << 47),
+        numberOfIntervals
+    )
+
+    lower = min(curve[0], curve[1])
+    upper = max(curve[0], curve[1])
+    spacing = upper - lower
+    pool.growth[lower] = Integer(growth) / (1 << 111)
+    pool.sharesTotal[lower] = Integer(sharesTotal)
+    for logPrice in range(lower - spacing, min(pool.growth) - 1, - spacing):
+        pool.sharesTotal[logPrice] = pool.sharesTotal[logPrice + spacing] - access._readSharesDelta(nofeeswap, poolId, logPrice + spacing)
+        pool.growth[logPrice] = floor(((getGrowthMultiplier(nofeeswap, access, poolId, lower, upper, logPrice + spacing) - getGrowthMultiplier(nofeeswap, access, poolId, lower, upper, logPrice)) * exp(- Integer(logPrice + spacing - (2 ** 63)) / (2 ** 60))) / (2 ** 97)) / Integer(1 << 111)
+    for logPrice in range(lower + spacing, max(pool.growth) + 1, + spacing):
+        pool.sharesTotal[logPrice] = pool.sharesTotal[logPrice - spacing] + access._readSharesDelta(nofeeswap, poolId, logPrice)
+        pool.growth[logPrice] = floor(((getGrowthMultiplier(nofeeswap, access, poolId, lower, upper, logPrice) - getGrowthMultiplier(nofeeswap, access, poolId, lower, upper, logPrice + spacing)) * exp(+ Integer(logPrice - (2 ** 63)) / (2 ** 60))) / (2 ** 97)) / Integer(1 << 111)
+    return pool
+
+def swapTo(pool, target, zeroForOne):
+    # Amounts in and out of a swap of a copy of 'pool' to 'target'.
+    pool = copy.deepcopy(pool)
+    amount0 = pool.amount0
+    amount1 = pool.amount1
+    pool.swap(target, target)
+    if zeroForOne:
+        return float(pool.amount0 - amount0), float(amount1 - pool.amount1)
+    return float(pool.amount1 - amount1), float(amount0 - pool.amount0)
+
+def marginalPrice(pool, zeroForOne):
+    # The amount out per unit in of a swap over '1 / 65536' of the active
+    # interval, as the price at which an infinitesimal amount is converted.
+    lower = min(pool.curve[0], pool.curve[1])
+    upper = max(pool.curve[0], pool.curve[1])
+    step = max((upper - lower) >> 16, 1)
+    amountIn, amountOut = swapTo(
+        pool,
+        pool.curve[-1] - step if zeroForOne else pool.curve[-1] + step,
+        zeroForOne
+    )
+    return amountOut / amountIn
+
+def simulateConversion(pool, amount, zeroForOne, iterations=32):
+    # Simulates the conversion swap of 'unlockCallback' which sells 'amount'
+    # with no price limit. The target of the swap is found by bisection and
+    # the amount out is interpolated between the last two targets. Returns
+    # '(amountIn, amountOut)' where 'amountIn < amount' if the modeled
+    # intervals cannot absorb 'amount'.
+    current = pool.curve[-1]
+    lower = min(pool.curve[0], pool.curve[1])
+    upper = max(pool.curve[0], pool.curve[1])
+    bound = min(pool.growth) if zeroForOne else max(pool.growth) + (upper - lower)
+
+    amountInBound, amountOutBound = swapTo(pool, bound, zeroForOne)
+    if amountInBound <= amount:
+        return amountInBound, amountOutBound
+
+    near, far = current, bound
+    amountInNear, amountOutNear = 0.0, 0.0
+    amountInFar, amountOutFar = amountInBound, amountOutBound
+    for _ in range(iterations):
+        if abs(far - near) <= 1:
+            break
+        middle = (near + far) // 2
+        amountIn, amountOut = swapTo(pool, middle, zeroForOne)
+        if amountIn <= amount:
+            near, amountInNear, amountOutNear = middle, amountIn, amountOut
+        else:
+            far, amountInFar, amountOutFar = middle, amountIn, amountOut
+
+    return amount, amountOutNear + (amountOutFar - amountOutNear) * (
+        (amount - amountInNear) / (amountInFar - amountInNear)
+    )
+
+def simulateValue(pool, amount, zeroForOne, iterations=32):
+    # Returns '(value, amountOut)' where 'value' is the value of 'amount' at
+    # the marginal price and 'amountOut' is the simulated amount out of its
+    # conversion, or 'None' if the modeled intervals cannot absorb 'amount'.
+    value = amount * marginalPrice(pool, zeroForOne)
+    amountIn, amountOut = simulateConversion(pool, amount, zeroForOne, iterations)
+    if amountIn < amount:
+        return None
+    return value, amountOut
+
+def loss(conversion, gasCost):
+    # The share of the value of a conversion, as given by 'simulateValue',
+    # which is lost to price impact and to 'gasCost', the latter being given
+    # in units of the token out, i.e., nofee.
+    if conversion is None:
+        return math.inf
+    value, amountOut = conversion
+    return (value - amountOut + gasCost) / value
+
+def lossFraction(pool, amount, zeroForOne, gasCost, iterations=32):
+    return loss(simulateValue(pool, amount, zeroForOne, iterations), gasCost)
+
+def chooseTags(conversions, gasCost, gasCostPerTag):
+    # Given '(now, later)' conversions for every due tag, returns the tags to
+    # be disbursed now. The tags are disbursed in one transaction. Hence,
+    # every chosen tag bears 'gasCostPerTag' and an equal share of the base
+    # cost 'gasCost'. A tag is chosen unless waiting lowers its loss. Every
+    # rejected tag raises the share of the others, so the choice is repeated
+    # until no tag is rejected.
+    tags = list(conversions)
+    while tags:
+        share = gasCostPerTag + gasCost / len(tags)
+        chosen = [
+            tag for tag in tags
+            if loss(conversions[tag][0], share) <= loss(conversions[tag][1], share)
+        ]
+        if len(chosen) == len(tags):
+            break
+        tags = chosen
+    return tags
+
+class DisbursementKeeper:
+    # Watches the balance of 'IncentivePoolFactory' in every tag of 'tags'
+    # and calls 'disburseBatch' for the tags that are worth converting. A tag
+    # is considered once 'max(disburseGap, delay)' blocks have passed since
+    # its last disbursement, i.e., once the conversion pool has been open to
+    # arbitrage for long enough to recover from the previous conversion. It
+    # is then disbursed unless waiting another 'lookahead' blocks, at the
+    # accrual rate observed so far, lowers the loss per unit of value. The
+    # loss accounts for the price impact, simulated on the conversion pool as
+    # seeded from the chain, and the share of the gas borne by the tag, i.e.,
+    # 'gasCostPerTag' plus an equal share of the base cost 'gasCost' of the
+    # 'disburseBatch' transaction among the tags in it. All chain reads and
+    # simulations run concurrently in worker threads.
+    def __init__(
+        self,
+        web3,
+        factory,
+        nofeeswap,
+        access,
+        tags,
+        gasCost,
+        sender,
+        lookahead=100,
+        numberOfIntervals=8,
+        iterations=32,
+        loadPool=None,
+        gasCostPerTag=0
+    ):
+        self.web3 = web3
+        self.factory = factory
+        self.nofeeswap = nofeeswap
+        self.access = access
+        self.tags = list(tags)
+        self.gasCost = gasCost
+        self.gasCostPerTag = gasCostPerTag
+        self.sender = sender
+        self.lookahead = lookahead
+        self.numberOfIntervals = numberOfIntervals
+        self.iterations = iterations
+        self.loadPool = loadPool or (
+            lambda poolId: readPool(nofeeswap, access, poolId, numberOfIntervals)
+        )
+        self.nofeeTag = toInt(factory.nofee())
+        self.observations = {}
+
+    def accrualRate(self, tag, blockNumber, balance):
+        # Balance accrued per block since the previous observation of 'tag'.
+        previous = self.observations.get(tag)
+        self.observations[tag] = (blockNumber, balance)
+        if previous is None or blockNumber <= previous[0] or balance < previous[1]:
+            return 0
+        return (balance - previous[1]) / (blockNumber - previous[0])
+
+    async def evaluate(self, tag, blockNumber, wait):
+        # Returns the conversions of 'tag', as given by 'simulateValue', if it
+        # is disbursed in 'blockNumber' and if it is disbursed 'lookahead'
+        # blocks later, or 'None' if 'tag' is not due.
+        lastDisbursed = await asyncio.to_thread(self.factory.lastDisbursed, tag)
+        if blockNumber < lastDisbursed + wait:
+            return None
+        balance = await asyncio.to_thread(
+            self.nofeeswap.balanceOf,
+            self.factory.address,
+            tag
+        )
+        rate = self.accrualRate(tag, blockNumber, balance)
+        if balance == 0:
+            return None
+
+        poolId = await asyncio.to_thread(self.factory.conversionPools, tag)
+        pool = await asyncio.to_thread(self.loadPool, poolId)
+        zeroForOne = toInt(tag) < self.nofeeTag
+        return await asyncio.gather(
+            asyncio.to_thread(simulateValue, pool, balance, zeroForOne, self.iterations),
+            asyncio.to_thread(simulateValue, pool, balance + rate * self.lookahead, zeroForOne, self.iterations)
+        )
+
+    async def step(self):
+        # Evaluates every tag in the current block and disburses the chosen
+        # ones in a single transaction. Returns the disbursed tags.
+        blockNumber = self.web3.eth.block_number
+        disburseGap, delay = await asyncio.gather(
+            asyncio.to_thread(self.factory.disburseGap),
+            asyncio.to_thread(self.factory.delay)
+        )
+        conversions = await asyncio.gather(*[
+            self.evaluate(tag, blockNumber, max(disburseGap, delay))
+            for tag in self.tags
+        ])
+        tags = chooseTags(
+            {
+                tag: conversion
+                for tag, conversion in zip(self.tags, conversions)
+                if conversion is not None
+            },
+            self.gasCost,
+            self.gasCostPerTag
+        )
+        if tags:
+            await asyncio.to_thread(self.factory.disburseBatch, tags, {'from': self.sender})
+        return tags
+
+    async def run(self, interval=12, steps=None):
+        while steps is None or steps > 0:
+            tags = await self.step()
+            if tags:
+                print('disbursed', [hex(toInt(tag)) for tag in tags])
+            if steps is not None:
+                steps -= 1
+            await asyncio.sleep(interval)
+
+def main(factory, access, gasCost, gasCostPerTag, *tags):
+    # brownie run IncentiveKeeper main <factory> <access> <gasCost>
+    # <gasCostPerTag> <tag> ...
+    from brownie import accounts, web3, IncentivePoolFactory, Nofeeswap, Access
+    factory = IncentivePoolFactory.at(factory)
+    keeper = DisbursementKeeper(
+        web3,
+        factory,
+        Nofeeswap.at(factory.nofeeswap()),
+        Access.at(access),
+        [int(tag, 0) for tag in tags],
+        float(gasCost),
+        accounts[0],
+        gasCostPerTag=float(gasCostPerTag)
+    )
+    asyncio.run(keeper.run())
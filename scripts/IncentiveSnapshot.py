@@ -0,0 +1,169 @@
+# Copyright 2025, NoFeeSwap LLC - All rights reserved.
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from sha3 import keccak_256
+from scripts.IncentiveIndexer import IncentiveIndex, toInt
+
+# uint128(uint256(keccak256("incentiveData"))) - 1
+incentiveDataSlot = 0x8CC275057B673C0282CE82CEE41466B9
+
+# uint128(uint256(keccak256("poolData"))) - 1
+poolDataSlot = 0x739010B57B0DE36D3FD2252EB66D6A12
+
+# uint64(uint256(keccak256("evanescentPointsPerShareMapping"))) - 1
+evanescentPointsPerShareMappingSlot = 0x194AD8FB35443B37
+
+evanescentPointsOwedOverflow = 0xFFFFFFFFFFFFFFFF
+
+def toWords(values):
+    # A list of integers as an '(n, 32)' array of big endian words.
+    return np.frombuffer(
+        b''.join(value.to_bytes(32, 'big') for value in values),
+        dtype=np.uint8
+    ).reshape(-1, 32)
+
+def fromWords(words):
+    return [int.from_bytes(word.tobytes(), 'big') for word in words]
+
+def readUint64(words, start):
+    # Bytes 'start' to 'start + 8' of every word as 'uint64'.
+    return np.ascontiguousarray(words[:, start:start + 8]).view('>u8').reshape(-1).astype(np.uint64)
+
+def hashRows(preimages):
+    # keccak256 of every row of a contiguous '(n, width)' array.
+    buffer = preimages.tobytes()
+    width = preimages.shape[1]
+    return np.frombuffer(
+        b''.join(
+            keccak_256(buffer[k:k + width]).digest()
+            for k in range(0, len(buffer), width)
+        ),
+        dtype=np.uint8
+    ).reshape(-1, 32)
+
+def getIncentiveDataSlots(tokenIds):
+    # Mirrors 'getIncentiveDataSlot' for an array of tokenIds. The preimages
+    # 'tokenId | incentiveDataSlot' are laid out in one buffer before hashing.
+    preimages = np.empty((len(tokenIds), 48), dtype=np.uint8)
+    preimages[:, :32] = toWords(tokenIds)
+    preimages[:, 32:] = np.frombuffer(incentiveDataSlot.to_bytes(16, 'big'), dtype=np.uint8)
+    return hashRows(preimages)
+
+def getPoolDataSlots(poolIds):
+    # Mirrors 'getPoolDataSlot' for an array of poolIds.
+    preimages = np.empty((len(poolIds), 48), dtype=np.uint8)
+    preimages[:, :32] = toWords(poolIds)
+    preimages[:, 32:] = np.frombuffer(poolDataSlot.to_bytes(16, 'big'), dtype=np.uint8)
+    return hashRows(preimages)
+
+def getEvanescentPointsPerShareMappingSlots(poolIds, logPrices):
+    # Mirrors 'getEvanescentPointsPerShareMappingSlot' for arrays of poolIds
+    # and 'uint64' logPrices of equal length.
+    preimages = np.empty((len(poolIds), 48), dtype=np.uint8)
+    preimages[:, :32] = toWords(poolIds)
+    preimages[:, 32:40] = np.asarray(logPrices, dtype='>u8').view(np.uint8).reshape(-1, 8)
+    preimages[:, 40:] = np.frombuffer(
+        evanescentPointsPerShareMappingSlot.to_bytes(8, 'big'),
+        dtype=np.uint8
+    )
+    return hashRows(preimages)
+
+def readSlots(web3, address, slots, blockNumber, workers=32):
+    # Reads an '(n, 32)' array of slots of 'address' at 'blockNumber' through
+    # a pool of concurrent 'eth_getStorageAt' calls.
+    def read(slot):
+        return bytes(web3.eth.get_storage_at(address, int.from_bytes(slot.tobytes(), 'big'), blockNumber))
+
+    with ThreadPoolExecutor(workers) as executor:
+        contents = list(executor.map(read, slots, chunksize=256))
+    return np.frombuffer(
+        b''.join(content.rjust(32, b'\x00') for content in contents),
+        dtype=np.uint8
+    ).reshape(-1, 32)
+
+def slotOffset(slots, offset):
+    return toWords([(value + offset) % (1 << 256) for value in fromWords(slots)])
+
+def snapshot(web3, incentive, tokenIds, blockNumber=None, workers=32):
+    # Reads every position in 'tokenIds', the data of their pools and the
+    # 'evanescentPointsPerShareMapping' entries at the boundaries of both,
+    # all at the same 'blockNumber'. Returns a dictionary of columns.
+    if blockNumber is None:
+        blockNumber = web3.eth.block_number
+    address = incentive.address
+    tokenIds = sorted(tokenIds)
+
+    # Every position occupies two slots, plus a third one if its points owed
+    # overflow the first.
+    slots = getIncentiveDataSlots(tokenIds)
+    value0 = readSlots(web3, address, slots, blockNumber, workers)
+    value1 = readSlots(web3, address, slotOffset(slots, 1), blockNumber, workers)
+    value2 = np.zeros_like(value0)
+    overflowed = readUint64(value0, 12) == evanescentPointsOwedOverflow
+    if overflowed.any():
+        value2[overflowed] = readSlots(
+            web3,
+            address,
+            slotOffset(slots[overflowed], 2),
+            blockNumber,
+            workers
+        )
+
+    # The 20 lsbs of every poolId are equal to the address of 'incentive'.
+    positionPoolIds = [
+        (value & (((1 << 96) - 1) << 160)) | toInt(address)
+        for value in fromWords(value0)
+    ]
+    poolIds = sorted(set(positionPoolIds))
+    poolData = readSlots(web3, address, getPoolDataSlots(poolIds), blockNumber, workers)
+
+    qMin = readUint64(value1, 0)
+    qMax = readUint64(value1, 8)
+    qLower = readUint64(poolData, 4)
+    qUpper = readUint64(poolData, 12)
+
+    keys = sorted(
+        set(zip(positionPoolIds, qMin.tolist())) |
+        set(zip(positionPoolIds, qMax.tolist())) |
+        set(zip(poolIds, qLower.tolist())) |
+        set(zip(poolIds, qUpper.tolist()))
+    )
+    mappingPoolIds = [poolId for poolId, _ in keys]
+    mappingLogPrices = np.array([logPrice for _, logPrice in keys], dtype=np.uint64)
+    mapping = readSlots(
+        web3,
+        address,
+        getEvanescentPointsPerShareMappingSlots(mappingPoolIds, mappingLogPrices),
+        blockNumber,
+        workers
+    )
+
+    # The 4 msbs of every entry hold the block in which it is written.
+    mapping = np.concatenate([np.zeros_like(mapping[:, :4]), mapping[:, 4:]], axis=1)
+
+    return {
+        'blockNumber': np.array(blockNumber, dtype=np.uint64),
+        'tokenId': np.array(tokenIds, dtype=np.uint64),
+        'incentiveData': np.stack([value0, value1, value2], axis=1),
+        'qMin': qMin,
+        'qMax': qMax,
+        'poolId': toWords(poolIds),
+        'poolData': poolData,
+        'mappingPoolId': toWords(mappingPoolIds),
+        'mappingLogPrice': mappingLogPrices,
+        'mapping': mapping
+    }
+
+def main(incentive, indexPath='incentive.sqlite', output='incentive.npz', blockNumber=None):
+    # brownie run IncentiveSnapshot main <incentive> [indexPath] [output] [blockNumber]
+    from brownie import web3, Incentive
+    index = IncentiveIndex(indexPath)
+    tokenIds = [row[0] for row in index.connection.execute('SELECT tokenId FROM positions')]
+    columns = snapshot(
+        web3,
+        Incentive.at(incentive),
+        tokenIds,
+        None if blockNumber is None else int(blockNumber)
+    )
+    np.savez(output, **columns)
+    return columns
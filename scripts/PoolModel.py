@@ -0,0 +1,398 @@
+# Copyright 2025, NoFeeSwap LLC - All rights reserved.
+from functools import lru_cache
+from sympy import Integer, Symbol, Piecewise, And, floor, piecewise_fold, exp, N, oo
+
+# A symbolic model of a nofeeswap pool which is shared by the tests and by
+# the scripts which simulate swaps off-chain, e.g., 'IncentiveKeeper.py'. The
+# integrals are pure functions of the curve, the kernel and the bounds.
+# Hence, they are memoized since simulations repeat them for every target.
+# The caches are bounded since long running scripts key them on values read
+# from the chain.
+
+X15 = 2**15
+X59 = 2**59
+X63 = 2**63
+X60 = 2**60
+X216 = 2**216
+
+# Maximum number of memoized results of each of the integrals.
+cacheSize = 4096
+
+
+def toRational(input):
+    if type(input) is list:
+        return [(value - X63) / Integer(X59) for value in input]
+    else:
+        return (input - X63) / Integer(X59)
+
+def amend(curve, targetX59):
+    newCurve = [point for point in curve]
+    point0 = newCurve[0]
+    point1 = newCurve[1]
+    if targetX59 <= min(point0, point1):
+        return [max(point0, point1), min(point0, point1)]
+    if targetX59 >= max(point0, point1):
+        return [min(point0, point1), max(point0, point1)]
+    index = 1
+    while (True):
+        if (min(point0, point1) < targetX59 < max(point0, point1)):
+            point0 = point1
+            index += 1
+            if (index < len(newCurve)):
+                point1 = curve[index]
+            else:
+                break
+        else:
+            break
+    if (index < len(newCurve)):
+        newCurve[index] = targetX59
+        newCurve = newCurve[0: (index + 1)]
+    else:
+        newCurve += [targetX59]
+    return newCurve
+
+def getFunctionFromKernel(kernel):
+    h = Symbol('h', real = True)
+    args = []
+    for k in range(len(kernel) - 1):
+        c0 = Integer(kernel[k][1]) / X15
+        c1 = Integer(kernel[k+1][1]) / X15
+        b0 = Integer(kernel[k][0]) / X59
+        b1 = Integer(kernel[k+1][0]) / X59
+        if b1 != b0:
+            args = args + [(
+                c0 + ((c1 - c0) * (h - b0) / (b1 - b0)),
+                And(b0 < h, h < b1)
+            )]
+    args = args + [(0, h < 0), (0, (Integer(kernel[-1][0]) / X59) < h), (0, True)]
+    return Piecewise(*args), h
+
+def getFunctionFromCurve(curve, kernel):
+    zKernel, h = getFunctionFromKernel(kernel)
+    args = []
+    for k in range(len(curve), 1, -1):
+        point0 = (curve[min(k, len(curve) - 1)] - X63) / Integer(X59)
+        point1 = (curve[k - 1] - X63) / Integer(X59)
+        point2 = (curve[k - 2] - X63) / Integer(X59)
+        if point2 > point0:
+            args = args + [(zKernel.subs(h, h - point1), And(point0 < h, h < point2))]
+        else:
+            args = args + [(zKernel.subs(h, point1 - h), And(point2 < h, h < point0))]
+    point1 = min((curve[0] - X63) / Integer(X59), (curve[1] - X63) / Integer(X59))
+    point2 = max((curve[0] - X63) / Integer(X59), (curve[1] - X63) / Integer(X59))
+    args = args + [(0, h < point1), (0, point2 < h), (0, True)]
+    return Piecewise(*args), h
+
+def outgoing(curve, kernel, qMinX59, qMaxX59):
+    return _outgoing(tuple(curve), tuple(map(tuple, kernel)), qMinX59, qMaxX59)
+
+@lru_cache(maxsize=cacheSize)
+def _outgoing(curve, kernel, qMinX59, qMaxX59):
+    if qMinX59 == qMaxX59:
+        return Integer(0)
+    
+    integral = 0
+    h = Symbol('h', real = True)
+
+    if curve[-1] <= qMinX59:
+        for kk in range(len(curve), 1, -1):
+            point0 = curve[min(kk, len(curve) - 1)]
+            point1 = curve[kk - 1]
+            point2 = curve[kk - 2]
+            if point0 < point2:
+                begin = max(qMinX59, point0)
+                end = min(qMaxX59, point2)
+                if begin < end:
+                    for ii in range(len(kernel) - 1):
+                        c0 = Integer(kernel[ii][1]) / X15
+                        c1 = Integer(kernel[ii + 1][1]) / X15
+                        b0 = point1 + kernel[ii][0]
+                        b1 = point1 + kernel[ii + 1][0]
+                        limit0 = max(b0, begin)
+                        limit1 = min(b1, end)
+                        if limit0 < limit1:
+                            f = ((c0 + ((c1 - c0) * (h - toRational(b0)) / (toRational(b1) - toRational(b0)))) * exp(- h / 2)).integrate(h)
+                            integral += N(X216 * exp(-8) * (f.subs(h, toRational(limit1)) - f.subs(h, toRational(limit0))) / 2, 200)
+        return floor(integral)
+    
+    if qMaxX59 <= curve[-1]:
+        for kk in range(len(curve), 1, -1):
+            point0 = curve[min(kk, len(curve) - 1)]
+            point1 = curve[kk - 1]
+            point2 = curve[kk - 2]
+            if point2 < point0:
+                begin = min(qMaxX59, point0)
+                end = max(qMinX59, point2)
+                if end < begin:
+                    for ii in range(len(kernel) - 1):
+                        c0 = Integer(kernel[ii][1]) / X15
+                        c1 = Integer(kernel[ii + 1][1]) / X15
+                        b0 = point1 - kernel[ii][0]
+                        b1 = point1 - kernel[ii + 1][0]
+                        limit0 = max(b1, end)
+                        limit1 = min(b0, begin)
+                        if limit0 < limit1:
+                            f = ((c0 + ((c1 - c0) * (h - toRational(b0)) / (toRational(b1) - toRational(b0)))) * exp(+ h / 2)).integrate(h)
+                            integral += N(X216 * exp(-8) * (f.subs(h, toRational(limit1)) - f.subs(h, toRational(limit0))) / 2, 200)
+        return floor(integral)
+
+def incoming(curve, kernel, qMinX59, qMaxX59):
+    return _incoming(tuple(curve), tuple(map(tuple, kernel)), qMinX59, qMaxX59)
+
+@lru_cache(maxsize=cacheSize)
+def _incoming(curve, kernel, qMinX59, qMaxX59):
+    if qMinX59 == qMaxX59:
+        return Integer(0)
+    
+    integral = 0
+    h = Symbol('h', real = True)
+
+    if curve[-1] <= qMinX59:
+        for kk in range(len(curve), 1, -1):
+            point0 = curve[min(kk, len(curve) - 1)]
+            point1 = curve[kk - 1]
+            point2 = curve[kk - 2]
+            if point0 < point2:
+                begin = max(qMinX59, point0)
+                end = min(qMaxX59, point2)
+                if begin < end:
+                    for ii in range(len(kernel) - 1):
+                        c0 = Integer(kernel[ii][1]) / X15
+                        c1 = Integer(kernel[ii + 1][1]) / X15
+                        b0 = point1 + kernel[ii][0]
+                        b1 = point1 + kernel[ii + 1][0]
+                        limit0 = max(b0, begin)
+                        limit1 = min(b1, end)
+                        if limit0 < limit1:
+                            f = ((c0 + ((c1 - c0) * (h - toRational(b0)) / (toRational(b1) - toRational(b0)))) * exp(+ h / 2)).integrate(h)
+                            integral += N(X216 * exp(-8) * (f.subs(h, toRational(limit1)) - f.subs(h, toRational(limit0))) / 2, 200)
+        return floor(integral)
+    
+    if qMaxX59 <= curve[-1]:
+        for kk in range(len(curve), 1, -1):
+            point0 = curve[min(kk, len(curve) - 1)]
+            point1 = curve[kk - 1]
+            point2 = curve[kk - 2]
+            if point2 < point0:
+                begin = min(qMaxX59, point0)
+                end = max(qMinX59, point2)
+                if end < begin:
+                    for ii in range(len(kernel) - 1):
+                        c0 = Integer(kernel[ii][1]) / X15
+                        c1 = Integer(kernel[ii + 1][1]) / X15
+                        b0 = point1 - kernel[ii][0]
+                        b1 = point1 - kernel[ii + 1][0]
+                        limit0 = max(b1, end)
+                        limit1 = min(b0, begin)
+                        if limit0 < limit1:
+                            f = ((c0 + ((c1 - c0) * (h - toRational(b0)) / (toRational(b1) - toRational(b0)))) * exp(- h / 2)).integrate(h)
+                            integral += N(X216 * exp(-8) * (f.subs(h, toRational(limit1)) - f.subs(h, toRational(limit0))) / 2, 200)
+        return floor(integral)
+
+def getMaxIntegrals(kernel):
+    return _getMaxIntegrals(tuple(map(tuple, kernel)))
+
+@lru_cache(maxsize=cacheSize)
+def _getMaxIntegrals(kernel):
+    lower = 1
+    upper = kernel[-1][0] + 1
+    zKernel, hKernel = getFunctionFromKernel(kernel)
+    zOutgoing = piecewise_fold(zKernel.subs(hKernel, hKernel - (Integer(lower - (2 ** 63)) / (2 ** 59))) * exp(- hKernel / 2), evaluate = True)._eval_integral(hKernel)
+    outgoingMax = floor(N((2 ** 216) * exp(-8) * exp(+ Integer(lower - (2 ** 63)) / (2 ** 60)) * (zOutgoing.subs(hKernel, Integer(upper - 2 ** 63) / (2 ** 59)) - zOutgoing.subs(hKernel, Integer(lower - 2 ** 63) / (2 ** 59))) / 2, 100))
+    zIncoming = piecewise_fold(zKernel.subs(hKernel, hKernel - (Integer(lower - (2 ** 63)) / (2 ** 59))) * exp(+ hKernel / 2), evaluate = True)._eval_integral(hKernel)
+    incomingMax = floor(N((2 ** 216) * exp(-8) * exp(- Integer(upper - (2 ** 63)) / (2 ** 60)) * (zIncoming.subs(hKernel, Integer(upper - 2 ** 63) / (2 ** 59)) - zIncoming.subs(hKernel, Integer(lower - 2 ** 63) / (2 ** 59))) / 2, 100))
+    return outgoingMax, incomingMax
+
+class Pool:
+    def __init__(
+        self,
+        logOffset,
+        curve,
+        kernel,
+        protocolGrowthPortion,
+        poolGrowthPortion,
+        numberOfIntervals
+    ):
+        self.protocolGrowthPortion = protocolGrowthPortion
+        self.poolGrowthPortion = poolGrowthPortion
+        self.logOffset = Integer(logOffset)
+        self.curve = curve
+        self.kernel = kernel
+        self.amount0 = 0
+        self.amount1 = 0
+        self.poolAccrued0 = 0
+        self.poolAccrued1 = 0
+        self.protocolAccrued0 = 0
+        self.protocolAccrued1 = 0
+
+        lower = min(curve[0], curve[1])
+        upper = max(curve[0], curve[1])
+        spacing = upper - lower
+        minLogPrice = max(spacing - ((- lower) % spacing), lower - numberOfIntervals * spacing)
+        maxLogPrice = ((2 ** 64) - 1) - (((2 ** 64) - 1) % spacing) + (lower % spacing)
+        if maxLogPrice > ((2 ** 64) - 1):
+            maxLogPrice -= spacing
+        maxLogPrice = min(maxLogPrice, upper + numberOfIntervals * spacing)
+
+        self.growth = {}
+        self.sharesTotal = {}
+        for logPrice in range(minLogPrice, maxLogPrice, spacing):
+            self.growth[logPrice] = Integer(1)
+            self.sharesTotal[logPrice] = Integer(0)
+
+    def modifyPosition(
+        self,
+        logPriceMin,
+        logPriceMax,
+        shares
+    ):
+        logPriceMinOffsetted = int(logPriceMin - self.logOffset * (1 << 59) + (1 << 63))
+        logPriceMaxOffsetted = int(logPriceMax - self.logOffset * (1 << 59) + (1 << 63))
+        current = self.curve[-1]
+        lower = min(self.curve[0], self.curve[1])
+        upper = max(self.curve[0], self.curve[1])
+        spacing = upper - lower
+
+        outgoingMax, incomingMax = getMaxIntegrals(self.kernel)
+        
+        for logPrice in range(logPriceMinOffsetted, logPriceMaxOffsetted, spacing):
+            growth = self.growth[logPrice]
+            _shares = shares
+            sqrtOffset = exp(self.logOffset / 2)
+
+            if upper <= logPrice:
+                self.amount0 += _shares * growth * (outgoing([logPrice + spacing, logPrice], self.kernel, logPrice, logPrice + spacing) / outgoingMax) / sqrtOffset
+            if logPrice + spacing <= lower:
+                self.amount1 += _shares * growth * (outgoing([logPrice, logPrice + spacing], self.kernel, logPrice, logPrice + spacing) / outgoingMax) * sqrtOffset
+            if (lower <= logPrice) and (logPrice + spacing <= upper):
+                self.amount0 += _shares * growth * (outgoing(self.curve, self.kernel, current, upper) / outgoingMax) / sqrtOffset
+                self.amount1 += _shares * growth * (outgoing(self.curve, self.kernel, lower, current) / outgoingMax) * sqrtOffset
+
+            self.sharesTotal[logPrice] += shares
+
+    def swap(
+        self,
+        target,
+        overshoot
+    ):
+        current = self.curve[-1]
+        if target == current:
+            return Integer(1), Integer(1), Integer(1)
+        zeroForOne = target < current
+        outgoingMax, incomingMax = getMaxIntegrals(self.kernel)
+
+        lower = min(self.curve[0], self.curve[1])
+        upper = max(self.curve[0], self.curve[1])
+        spacing = upper - lower
+
+        g = Integer(0)
+        g_minus = Integer(0)
+        g_plus = Integer(0)
+
+        while (current != target):
+            growth = self.growth[lower]
+            shares = self.sharesTotal[lower]
+            sqrtOffset = exp(self.logOffset / 2)
+
+            _target = max(target, lower) if zeroForOne else min(target, upper)
+
+            self.amount0 -= shares * growth * (outgoing(self.curve, self.kernel, current, upper) / outgoingMax) / sqrtOffset
+            self.amount1 -= shares * growth * (outgoing(self.curve, self.kernel, lower, current) / outgoingMax) * sqrtOffset
+
+            if _target != target:
+                if zeroForOne:
+                    g = (outgoing(self.curve, self.kernel, current, upper) + incoming(self.curve, self.kernel, lower, current)) / outgoing([upper, lower], self.kernel, lower, upper)
+                    self.amount0 += shares * g * growth * (outgoing([upper, lower], self.kernel, lower, upper) / outgoingMax) / sqrtOffset
+                    self.growth[lower] = (1 + (g - 1) * (1 - self.protocolGrowthPortion) * (1 - self.poolGrowthPortion)) * self.growth[lower]
+                    self.curve = [lower - spacing, lower]
+                    current = lower
+                    upper = lower
+                    lower = lower - spacing
+                else:
+                    g = (outgoing(self.curve, self.kernel, lower, current) + incoming(self.curve, self.kernel, current, upper)) / outgoing([lower, upper], self.kernel, lower, upper)
+                    self.amount1 += shares * g * growth * (outgoing([lower, upper], self.kernel, lower, upper) / outgoingMax) * sqrtOffset
+                    self.growth[lower] = (1 + (g - 1) * (1 - self.protocolGrowthPortion) * (1 - self.poolGrowthPortion)) * self.growth[lower]
+                    self.curve = [upper + spacing, upper]
+                    current = upper
+                    lower = upper
+                    upper = upper + spacing
+            else:
+                _curve = amend(amend(self.curve, overshoot), target)
+
+                denominator0 = outgoing(_curve, self.kernel, target, upper)
+                denominator1 = outgoing(_curve, self.kernel, lower, target)
+
+                if zeroForOne:
+                    numerator0 = outgoing(self.curve, self.kernel, current, upper) + incoming(self.curve, self.kernel, target, current)
+                    numerator1 = outgoing(self.curve, self.kernel, lower, target)
+                else:
+                    numerator0 = outgoing(self.curve, self.kernel, target, upper)
+                    numerator1 = outgoing(self.curve, self.kernel, lower, current) + incoming(self.curve, self.kernel, current, target)
+
+                if denominator0 == 0:
+                    g0 = +oo
+                else:
+                    g0 = numerator0 / denominator0
+
+                if denominator1 == 0:
+                    g1 = +oo
+                else:
+                    g1 = numerator1 / denominator1
+
+                g = min(g0, g1)
+
+                self.amount0 += shares * g * growth * (denominator0 / outgoingMax) / sqrtOffset
+                self.amount1 += shares * g * growth * (denominator1 / outgoingMax) * sqrtOffset
+
+                if (overshoot != upper) and not(zeroForOne and (overshoot == target)):
+                    _curve_plus = amend(amend(self.curve, overshoot + 1), target)
+
+                    denominator0 = outgoing(_curve_plus, self.kernel, target, upper)
+                    denominator1 = outgoing(_curve_plus, self.kernel, lower, target)
+
+                    if denominator0 == 0:
+                        g0 = Integer(1)
+                    else:
+                        g0 = numerator0 / denominator0
+
+                    if denominator1 == 0:
+                        g1 = Integer(1)
+                    else:
+                        g1 = numerator1 / denominator1
+
+                    g_plus = min(g0, g1)
+
+                if (overshoot != lower) and not(not(zeroForOne) and (overshoot == target)):
+                    _curve_minus = amend(amend(self.curve, overshoot - 1), target)
+
+                    denominator0 = outgoing(_curve_minus, self.kernel, target, upper)
+                    denominator1 = outgoing(_curve_minus, self.kernel, lower, target)
+
+                    if denominator0 == 0:
+                        g0 = Integer(1)
+                    else:
+                        g0 = numerator0 / denominator0
+
+                    if denominator1 == 0:
+                        g1 = Integer(1)
+                    else:
+                        g1 = numerator1 / denominator1
+
+                    g_plus = min(g0, g1)
+
+                self.curve = _curve
+                self.growth[lower] = (1 + (g - 1) * (1 - self.protocolGrowthPortion) * (1 - self.poolGrowthPortion)) * self.growth[lower]
+                current = target
+
+        return g, g_minus, g_plus
+
+def getGrowthMultiplier(nofeeswap, access, poolId, lower, upper, logPrice):
+    growthMultiplier = access._readGrowthMultiplier(nofeeswap, poolId, logPrice)
+
+    if growthMultiplier != 0:
+        return growthMultiplier
+    else:
+        if logPrice <= lower:
+            return (2 ** 208) * exp(+ Integer(logPrice - (2 ** 63)) / (2 ** 60)) / (1 - exp(- Integer(upper - lower) / (2 ** 60)))
+        else:
+            return (2 ** 208) * exp(- Integer(logPrice - (2 ** 63)) / (2 ** 60)) / (1 - exp(- Integer(upper - lower) / (2 ** 60)))
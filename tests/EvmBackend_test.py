@@ -0,0 +1,149 @@
+# Copyright 2025, NoFeeSwap LLC - All rights reserved.
+import pytest
+from eth_abi import encode
+from eth_utils import function_abi_to_4byte_selector, event_abi_to_log_topic, to_checksum_address
+from hexbytes import HexBytes
+from scripts import EvmBackend
+from scripts.EvmBackend import abiType, toAbi, fromAbi, errorAbis, eventAbis, formatRevert, decodeLog
+
+address1 = '0x' + 38 * '0' + 'ab'
+
+approvalError = {
+    'type': 'error',
+    'name': 'ERC721InsufficientApproval',
+    'inputs': [
+        {'name': 'operator', 'type': 'address'},
+        {'name': 'tokenId', 'type': 'uint256'}
+    ]
+}
+
+collectEvent = {
+    'type': 'event',
+    'name': 'CollectRewardProgram',
+    'anonymous': False,
+    'inputs': [
+        {'name': 'recipient', 'type': 'address', 'indexed': True},
+        {'name': 'programId', 'type': 'uint256', 'indexed': True},
+        {'name': 'evanescentPointsOwed', 'type': 'uint256', 'indexed': False},
+        {'name': 'amount', 'type': 'uint256', 'indexed': False}
+    ]
+}
+
+positionInput = {
+    'name': 'positions',
+    'type': 'tuple[]',
+    'components': [
+        {'name': 'owner', 'type': 'address'},
+        {'name': 'data', 'type': 'bytes32'},
+        {'name': 'shares', 'type': 'int256[2]'}
+    ]
+}
+
+class Owner:
+    address = address1
+
+def plain(value):
+    # Return values of both backends as nested tuples.
+    if isinstance(value, (list, tuple)):
+        return tuple(plain(item) for item in value)
+    return value
+
+def test_abi():
+    assert abiType(positionInput) == '(address,bytes32,int256[2])[]'
+
+    # Accounts, hex strings and integers given by the tests are converted.
+    value = [(Owner(), '0x' + 31 * '00' + '01', ['0x10', -1])]
+    converted = toAbi(positionInput, value)
+    assert converted == [(to_checksum_address(address1), bytes(31) + b'\x01', [16, -1])]
+
+    # Decoded values are returned as brownie does.
+    decoded = fromAbi(positionInput, [(address1, bytes(32), (1, 2))])
+    assert decoded == ((to_checksum_address(address1), HexBytes(bytes(32)), (1, 2)),)
+
+def test_formatRevert():
+    errors = errorAbis([approvalError, collectEvent])
+    assert list(errors.values()) == [approvalError]
+
+    # Same as the revert strings expected by 'Incentive_test.py'.
+    data = function_abi_to_4byte_selector(approvalError) + encode(['address', 'uint256'], [to_checksum_address(address1), 1])
+    assert formatRevert(errors, data) == 'ERC721InsufficientApproval: ' + address1.lower() + ', ' + str(1)
+    assert formatRevert(errors, '0x' + data.hex()) == 'ERC721InsufficientApproval: ' + address1.lower() + ', ' + str(1)
+
+    data = bytes.fromhex('08c379a0') + encode(['string'], ['reason'])
+    assert formatRevert(errors, data) == 'reason'
+    assert formatRevert(errors, 'execution reverted') == 'execution reverted'
+    assert formatRevert(errors, bytes.fromhex('deadbeef')) == '0xdeadbeef'
+    assert formatRevert(errors, b'') == None
+
+def test_decodeLog():
+    events = eventAbis([approvalError, collectEvent])
+    assert list(events.values()) == [collectEvent]
+
+    log = {
+        'topics': [
+            event_abi_to_log_topic(collectEvent),
+            encode(['address'], [to_checksum_address(address1)]),
+            encode(['uint256'], [3])
+        ],
+        'data': encode(['uint256', 'uint256'], [5, 7])
+    }
+    assert decodeLog(events, log) == ('CollectRewardProgram', {
+        'recipient': to_checksum_address(address1),
+        'programId': 3,
+        'evanescentPointsOwed': 5,
+        'amount': 7
+    })
+
+    log['topics'][0] = bytes(32)
+    assert decodeLog(events, log) == None
+
+def scenario(containers, accounts, reverts):
+    # Observable results of a few transactions, calls and reverts which should
+    # not depend on the backend. Addresses are compared with the accounts of
+    # each backend.
+    root = accounts[0]
+    other = accounts[1]
+    results = []
+
+    wrapper = containers['GeometricMeanWrapper'].deploy({'from': root})
+    values = [0, 1, ((1 << 107) - 1) // 5, ((1 << 216) - 1) // 3, (1 << 216) - 1]
+    for value0 in values:
+        for value1 in values:
+            tx = wrapper.geometricMeanWrapper(value0, value1, {'from': root})
+            results += [(tx.return_value, tx.gas_used)]
+    results += [wrapper.geometricMeanGas(values, values[::-1])]
+
+    token = containers['ERC20FixedSupply'].deploy('ERC20', 'ERC20', 2 ** 120, root, {'from': root})
+    tx = token.transfer(other, 5, {'from': root})
+    results += [(
+        tx.return_value,
+        tx.gas_used,
+        tx.events['Transfer']['from'] == root.address,
+        tx.events['Transfer']['to'] == other.address,
+        tx.events['Transfer']['value']
+    )]
+    with reverts('ERC20InsufficientBalance: ' + other.address.lower() + ', 5, 6'):
+        token.transfer(root, 6, {'from': other})
+    results += [token.balanceOf(other)]
+
+    return plain(results)
+
+def test_parity(request):
+    # Runs on brownie's network. The same scenario is then repeated in the
+    # in-process EVM.
+    pytest.importorskip('eth_tester')
+    pytest.importorskip('eth')
+    import brownie
+    if EvmBackend.backend is not None:
+        pytest.skip('brownie is replaced by the in-process EVM')
+    if not brownie.network.is_connected():
+        pytest.skip('brownie\'s network is not connected')
+    request.getfixturevalue('fn_isolation')
+
+    containers = {
+        name: getattr(brownie, name) for name in ['GeometricMeanWrapper', 'ERC20FixedSupply']
+    }
+    expected = scenario(containers, brownie.accounts, brownie.reverts)
+
+    backend = EvmBackend.EvmBackend()
+    assert scenario(backend.containers, backend.accounts, EvmBackend.reverts) == expected
@@ -0,0 +1,80 @@
+# Copyright 2025, NoFeeSwap LLC - All rights reserved.
+import math
+import random
+from fractions import Fraction
+from Nofee import geometricMean, geometricMeanFast, geometricMeanFastEstimate, geometricMeanFastCoefficients, geometricMeanReference, geometricMeanInputs, productX208
+
+# 'geometricMean' computes 'floor(sqrt(a))' for 'a := x * y / (2 ** 208)'
+# exactly, which is asserted by 'GeometricMean_test.py'. Hence, it suffices to
+# show that 'geometricMeanFast' computes 'floor(sqrt(a))' for every
+# 'a < 2 ** 224'.
+
+def test_smallInputs():
+    # Exhaustive below '2 ** 20'.
+    for a in range(1 << 20):
+        assert geometricMeanFast(a, 1 << 208) == math.isqrt(a)
+
+def test_largeInputs():
+    # For 'a >= 2 ** 20', let 's := sqrt(a) >= 2 ** 10'. The relative error of
+    # the initial estimate depends only on the 18 bits 'm' and is bounded
+    # over all of them, with an extra '2 / 2 ** 10' for the floor.
+    c0, c1, c2 = geometricMeanFastCoefficients
+    epsilon = 0
+    for m in range(1 << 16, 1 << 18):
+        estimate = (c0 + c1 * m - c2 * m * m) / 2 ** 64
+        epsilon = max(
+            epsilon,
+            abs(estimate / math.sqrt(m / 2 ** 16) - 1),
+            abs(estimate / math.sqrt((m + 1) / 2 ** 16) - 1)
+        )
+    assert epsilon < 0.0051
+    epsilon = Fraction(epsilon) + Fraction(2, 1 << 10)
+
+    # An integer Newton step maps 'xn == s * (1 + e)' to a value in
+    # '[s * (1 + d) - 1, s * (1 + d)]' with 'd := e ** 2 / (2 * (1 + e))', and
+    # every step after the first one is at least 'floor(s)'. Hence, the
+    # relative error after four steps is at most 'bound(s)' and the last
+    # step is at most 'floor(s) + 1' as long as 's * bound(s) < 1', which is
+    # then corrected by the final comparison.
+    def step(e):
+        return e * e / (2 * (1 - e))
+
+    def bound(s):
+        e = epsilon
+        for _ in range(4):
+            e = step(max(e, Fraction(1, s)))
+        return e
+
+    # 's * bound(s)' is at most the sum of two terms which are respectively
+    # increasing and decreasing in 's'. Hence, it suffices to examine both
+    # ends of the domain.
+    for s in [1 << 10, 1 << 112]:
+        assert s * bound(s) < 1
+
+def test_adversarialInputs():
+    # Powers of two, perfect squares and their neighbours, and random inputs
+    # of every magnitude.
+    random.seed(0)
+    inputs = []
+    for e in range(1, 225):
+        s = math.isqrt(1 << (e - 1))
+        inputs += [(1 << e) - 1, (1 << e), (1 << e) + 1, s * s - 1, s * s, s * s + 1]
+        inputs += [random.randrange(1 << (e - 1), 1 << e) for _ in range(200)]
+    for a in inputs:
+        if a < (1 << 224):
+            assert geometricMeanFast(a, 1 << 208) == geometricMean(a, 1 << 208)
+            if a >= 2:
+                assert abs(geometricMeanFastEstimate(a) / math.sqrt(a) - 1) < 0.0051 + 1 / math.sqrt(a)
+
+def test_reference():
+    # A million adversarial cases checked in-process against the step by step
+    # replicas of 'productX208', 'geometricMean' and 'geometricMeanFast'.
+    # 'GeometricMean_test.py' sends a sample of the same strata to the chain.
+    inputs = geometricMeanInputs(random.Random(0), 250000)
+    for stratum, pairs in inputs.items():
+        for x, y in pairs:
+            a = (x * y) >> 208
+            assert productX208(x, y) == a
+            result = geometricMeanReference(x, y)
+            assert result == math.isqrt(a)
+            assert geometricMeanFast(x, y) == result
@@ -1,16 +1,21 @@
 # Copyright 2025, NoFeeSwap LLC - All rights reserved.
 import pytest
-from Nofee import logTest
+import random
+from Nofee import logTest, geometricMeanReference, geometricMeanInputs
 from brownie import accounts, GeometricMeanWrapper
 from sympy import Integer, floor, sqrt
 
 list0X216 = [((1 << k) - 1) // 5 for k in range(1, 216, 10)]
 list1X216 = [((1 << 216) - 1) // 3, ((1 << 216) - 1)]
 
-@pytest.fixture(autouse=True)
-def wrapper(fn_isolation):
+@pytest.fixture(scope='module', autouse=True)
+def wrapper(module_isolation):
     return GeometricMeanWrapper.deploy({'from': accounts[0]})
 
+@pytest.fixture(autouse=True)
+def isolation(fn_isolation):
+    pass
+
 @pytest.mark.parametrize('value0', list0X216 + list1X216 + [0])
 @pytest.mark.parametrize('value1', list0X216 + list1X216 + [0])
 def test_geometricMean(wrapper, value0, value1, request, worker_id):
@@ -18,4 +23,42 @@ def test_geometricMean(wrapper, value0, value1, request, worker_id):
     
     tx = wrapper.geometricMeanWrapper(value0, value1)
     result = tx.return_value
-    assert (result % (2 ** 256)) == (floor(sqrt(Integer(value0 * value1))) >> 104)
\ No newline at end of file
+    assert (result % (2 ** 256)) == (floor(sqrt(Integer(value0 * value1))) >> 104)
+
+def test_geometricMeanGrid(wrapper, request, worker_id):
+    logTest(request, worker_id)
+
+    # The whole grid is evaluated in one call.
+    grid = list0X216 + list1X216 + [0]
+    values0 = [value0 for value0 in grid for value1 in grid]
+    values1 = [value1 for value0 in grid for value1 in grid]
+    results, resultsFast, _, _ = wrapper.geometricMeanGas(values0, values1)
+    for value0, value1, result, resultFast in zip(values0, values1, results, resultsFast):
+        assert result == (floor(sqrt(Integer(value0 * value1))) >> 104)
+        assert resultFast == result
+
+def test_geometricMeanSample(wrapper, request, worker_id):
+    logTest(request, worker_id)
+
+    # A sample of every stratum of 'GeometricMeanModel_test.py' is checked on
+    # chain against the step by step replica in batches.
+    inputs = geometricMeanInputs(random.Random(1), 512)
+    for stratum, pairs in inputs.items():
+        for k in range(0, len(pairs), 256):
+            batch = pairs[k:k + 256]
+            results, resultsFast, _, _ = wrapper.geometricMeanGas(
+                [x for x, _ in batch],
+                [y for _, y in batch]
+            )
+            for (x, y), result, resultFast in zip(batch, results, resultsFast):
+                assert result == geometricMeanReference(x, y)
+                assert resultFast == result
+
+def test_geometricMeanGas(wrapper, request, worker_id):
+    logTest(request, worker_id)
+
+    values0 = [value0 for value0 in list0X216 + list1X216 for value1 in list0X216 + list1X216]
+    values1 = [value1 for value0 in list0X216 + list1X216 for value1 in list0X216 + list1X216]
+    results, resultsFast, gasUsed, gasUsedFast = wrapper.geometricMeanGas(values0, values1)
+    assert list(results) == list(resultsFast)
+    assert gasUsedFast < gasUsed
\ No newline at end of file
@@ -0,0 +1,58 @@
+# Copyright 2025, NoFeeSwap LLC - All rights reserved.
+import numpy as np
+from Nofee import pointsPerShareIncrement
+from scripts.IncentiveAnalytics import emissionRate, rangeGrid, currentRates, projectedRates, normalCdf
+
+spacing = 1 << 40
+
+def test_emissionRate():
+    outgoingMax = (1 << 216) - 1
+    for growth, integral0, integral1 in [(1 << 111, outgoingMax >> 1, outgoingMax >> 2), (3 << 100, 1 << 200, 1 << 215)]:
+        rate = emissionRate(growth, integral0, integral1, outgoingMax, growth)
+        for blocks in [1, 1000, 1000000]:
+            assert pointsPerShareIncrement(blocks, growth, integral0, integral1, outgoingMax) == int(blocks * rate)
+
+        # No points accrue above 'maxIncentiveGrowth'.
+        assert emissionRate(growth, integral0, integral1, outgoingMax, growth - 1) == 0
+
+def test_normalCdf():
+    x = np.linspace(-8, 8, 1001)
+    assert np.all(np.abs(normalCdf(x) + normalCdf(-x) - 1) < 1e-12)
+    assert abs(normalCdf(np.array([1.0]))[0] - 0.8413447460685429) < 1.5e-7
+
+def test_rangeGrid():
+    # Boundaries below zero or above 'uint64' are clamped instead of wrapped.
+    qMin, qMax = rangeGrid(spacing // 2, spacing, [2], [1])
+    assert qMin.tolist() == [0] and qMax.tolist() == [spacing]
+    qMin, qMax = rangeGrid((1 << 64) - spacing // 2, spacing, [2], [0])
+    assert qMin.tolist() == [(1 << 64) - spacing] and qMax.tolist() == [(1 << 64) - 1]
+
+def test_rates():
+    logPriceCurrent = [(1 << 63) + spacing // 2, (1 << 63) + 10 * spacing + spacing // 3]
+    pools = {
+        'poolId': [1, 2],
+        'rate': np.array([2.0, 3.0]),
+        'logPriceCurrent': np.array(logPriceCurrent, dtype=np.uint64),
+        'sharesTotal': np.array([1.0, 1.0])
+    }
+    widths = list(range(1, 21))
+    shifts = list(range(-10, 11))
+    qMin, qMax = rangeGrid(logPriceCurrent[0], spacing, widths, shifts)
+    assert qMin.shape == qMax.shape == (len(widths) * len(shifts),)
+
+    # A range earns the full rate iff it contains the active interval.
+    current = currentRates(pools, qMin, qMax)
+    assert current.shape == (2, len(qMin))
+    for k, (a, b) in enumerate(zip(qMin.tolist(), qMax.tolist())):
+        for p in range(2):
+            assert current[p, k] == (pools['rate'][p] if a < logPriceCurrent[p] < b else 0)
+
+    # With no volatility, the projection is the current rate. Otherwise, it
+    # increases with the width of a range centered around the current price.
+    assert np.allclose(projectedRates(pools, qMin, qMax, 0, 1000), current)
+    projected = projectedRates(pools, qMin, qMax, spacing / 10, 1000)
+    assert np.all((0 <= projected) & (projected <= pools['rate'][:, None] + 1e-9))
+    qMin = np.array([logPriceCurrent[0] - w * spacing for w in range(1, 10)], dtype=np.uint64)
+    qMax = np.array([logPriceCurrent[0] + w * spacing for w in range(1, 10)], dtype=np.uint64)
+    projected = projectedRates(pools, qMin, qMax, spacing / 10, 1000)[0]
+    assert np.all(np.diff(projected) > 0)
@@ -0,0 +1,89 @@
+# Copyright 2025, NoFeeSwap LLC - All rights reserved.
+import time
+from scripts.IncentiveIndexer import IncentiveIndex, catchUp, transferTopic, modifySharesTopic, address0
+
+incentiveAddress = '0x00000000000000000000000000000000000abcde'
+poolId = (0x123456789 << 160) | int(incentiveAddress, 16)
+
+def topic(value):
+    return '0x' + format(value if isinstance(value, int) else int(value, 16), '064x')
+
+class Chain:
+    # Replays a list of 'Transfer' logs and serves 'incentiveData' from a
+    # dictionary of positions. Pages wider than 'limit' blocks are rejected
+    # as a node would reject a response with too many results.
+    def __init__(self, limit):
+        self.limit = limit
+        self.logs = []
+        self.positions = {}
+        self.block_number = 0
+        self.eth = self
+        self.address = incentiveAddress
+
+    def transfer(self, sender, recipient, tokenId):
+        self.block_number += 1
+        self.logs += [{
+            'blockNumber': self.block_number,
+            'logIndex': 0,
+            'topics': [transferTopic, topic(sender), topic(recipient), topic(tokenId)]
+        }]
+
+    def modifyShares(self, tokenId, sharesIncrement):
+        self.block_number += 1
+        owner, qMin, qMax, shares = self.positions[tokenId]
+        self.positions[tokenId] = (owner, qMin, qMax, shares + sharesIncrement)
+        self.logs += [{
+            'blockNumber': self.block_number,
+            'logIndex': 0,
+            'topics': [modifySharesTopic, topic(tokenId), topic(poolId)]
+        }]
+
+    def get_logs(self, params):
+        assert params['topics'] == [[transferTopic, modifySharesTopic]]
+        if params['toBlock'] - params['fromBlock'] + 1 > self.limit:
+            raise ValueError('query returned more than 10000 results')
+        return [
+            log for log in self.logs
+            if params['fromBlock'] <= log['blockNumber'] <= params['toBlock']
+        ]
+
+    def incentiveData(self, tokenIds):
+        owners = []
+        data = []
+        for tokenId in tokenIds:
+            owner, qMin, qMax, shares = self.positions.get(tokenId, (address0, 0, 0, 0))
+            owners += [owner]
+            data += [(poolId - (poolId % (1 << 160)), (qMin << 192) | (qMax << 128) | shares, 0)]
+        return owners, data
+
+def test_catchUp():
+    owners = ['0x' + format(k + 1, '040x') for k in range(8)]
+    chain = Chain(limit=64)
+    for tokenId in range(1, 1001):
+        qMin = (1 << 63) + (tokenId % 16) * (1 << 40)
+        chain.positions[tokenId] = (owners[tokenId % 8], qMin, qMin + (1 << 40), tokenId)
+        chain.transfer(address0, owners[tokenId % 8], tokenId)
+
+    index = IncentiveIndex()
+    catchUp(index, chain, chain, pageSize=1000)
+    assert index.readCursor() == 1000
+    assert [position[0] for position in index.positionsOf(owners[3])] == list(range(3, 1001, 8))
+
+    # Transfers and burns are applied incrementally from the cursor.
+    chain.positions[3] = (owners[0],) + chain.positions[3][1:]
+    chain.transfer(owners[3], owners[0], 3)
+    del chain.positions[11]
+    chain.transfer(owners[3], address0, 11)
+    chain.modifyShares(5, 7)
+    catchUp(index, chain, chain)
+    assert index.readCursor() == 1003
+    assert index.positionsOf(owners[5])[0][5] == 5 + 7
+    assert [position[0] for position in index.positionsOf(owners[3])] == list(range(19, 1001, 8))
+    assert index.positionsOf(owners[0])[0] == (3, owners[0], poolId, (1 << 63) + 3 * (1 << 40), (1 << 63) + 4 * (1 << 40), 3)
+
+    # Range lookups are local and fast.
+    start = time.perf_counter()
+    positions = index.positionsIn(poolId, (1 << 63) + 5 * (1 << 40), (1 << 63) + 6 * (1 << 40))
+    assert time.perf_counter() - start < 0.01
+    assert [position[0] for position in positions] == list(range(5, 1001, 16))
+    assert len(index.positionsIn(poolId)) == 999
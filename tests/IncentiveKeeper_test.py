@@ -0,0 +1,121 @@
+# Copyright 2025, NoFeeSwap LLC - All rights reserved.
+import asyncio
+from Nofee import Pool, encodeKernel, encodeCurve
+from scripts.IncentiveKeeper import DisbursementKeeper, decodeKernel, decodeCurve, simulateConversion, lossFraction, chooseTags
+
+spacing = 20 * 60 * 57643193118714
+lower = (1 << 63) - spacing - ((1 << 63) - spacing) % spacing
+upper = lower + spacing
+kernel = [[0, 0], [spacing // 2, 2 ** 14], [spacing, 2 ** 15]]
+curve = [lower, upper, lower + spacing // 2]
+nofeeTag = 1 << 150
+
+def getPool():
+    pool = Pool(0, curve, kernel, 0, 0, 2)
+    pool.modifyPosition(lower - (1 << 63) - 2 * spacing, upper - (1 << 63) + 2 * spacing, 10 ** 18)
+    return pool
+
+def test_decode():
+    assert decodeKernel(encodeKernel(kernel)) == kernel
+    assert decodeCurve(encodeCurve(curve)) == curve
+    assert decodeCurve(encodeCurve(curve + [lower + spacing // 3, lower + spacing // 4])) == curve + [lower + spacing // 3, lower + spacing // 4]
+
+def test_simulateConversion():
+    pool = getPool()
+    for zeroForOne in [True, False]:
+        # The loss grows with the amount converted.
+        losses = [lossFraction(pool, amount, zeroForOne, 0, 6) for amount in [10 ** 14, 10 ** 17, 10 ** 18]]
+        assert abs(losses[0]) < 1e-2
+        assert losses[0] < losses[1] < losses[2] < 1
+
+        # Amounts beyond the modeled intervals are reported as such.
+        amountIn, amountOut = simulateConversion(pool, 10 ** 30, zeroForOne, 6)
+        assert amountIn < 10 ** 30
+        assert lossFraction(pool, 10 ** 30, zeroForOne, 0, 6) == float('inf')
+
+def test_chooseTags():
+    # Conversions of 100 now and of 200 later where the later one suffers a
+    # larger price impact. Hence, waiting pays off only if the share of the
+    # gas cost exceeds 4.
+    conversions = {
+        'a': ((100, 99), (200, 194)),
+        'b': ((100, 99), (200, 194)),
+        'c': ((100, 50), (200, 195)),
+        'd': (None, None)
+    }
+
+    # 'c' waits for a lower price impact. Then 'a' and 'b' share the base
+    # cost along with 'd' which cannot be converted either way.
+    assert chooseTags(conversions, 9, 0) == ['a', 'b', 'd']
+    assert chooseTags({'a': conversions['a'], 'b': conversions['b']}, 8, 0) == ['a', 'b']
+    assert chooseTags({'a': conversions['a']}, 8, 0) == []
+
+    # The marginal cost of each tag is borne in full.
+    assert chooseTags({'a': conversions['a'], 'b': conversions['b']}, 2, 2) == ['a', 'b']
+    assert chooseTags({'a': conversions['a'], 'b': conversions['b']}, 2, 4) == []
+
+class Factory:
+    address = '0x00000000000000000000000000000000000fac70'
+
+    def __init__(self, blockNumber):
+        self.lastDisbursed_ = {}
+        self.balances = {}
+        self.disbursed = []
+        self.eth = self
+        self.block_number = blockNumber
+
+    def nofee(self):
+        return '0x' + format(nofeeTag, '040x')
+
+    def disburseGap(self):
+        return 10
+
+    def delay(self):
+        return 20
+
+    def lastDisbursed(self, tag):
+        return self.lastDisbursed_.get(tag, 0)
+
+    def balanceOf(self, owner, tag):
+        return self.balances.get(tag, 0)
+
+    def conversionPools(self, tag):
+        return tag
+
+    def disburseBatch(self, tags, params):
+        for tag in tags:
+            self.lastDisbursed_[tag] = self.block_number
+            self.balances[tag] = 0
+        self.disbursed += [tags]
+
+def test_keeper():
+    pool = getPool()
+    factory = Factory(100)
+    keeper = DisbursementKeeper(
+        factory,
+        factory,
+        factory,
+        None,
+        [1, 2, nofeeTag + 1],
+        10 ** 15,
+        None,
+        lookahead=100,
+        iterations=6,
+        loadPool=lambda poolId: pool
+    )
+
+    # A tag which is disbursed within 'max(disburseGap, delay)' is not due.
+    factory.lastDisbursed_ = {1: 90, 2: 50, nofeeTag + 1: 50}
+    factory.balances = {1: 10 ** 17, 2: 10 ** 15, nofeeTag + 1: 10 ** 17}
+    assert asyncio.run(keeper.step()) == [2, nofeeTag + 1]
+    assert factory.disbursed == [[2, nofeeTag + 1]]
+
+    # A large balance is disbursed since its price impact grows faster than
+    # its share of the gas cost shrinks, while a small one which accrues
+    # quickly is worth waiting for.
+    factory.block_number = 200
+    factory.balances = {1: 5 * 10 ** 17, 2: 10 ** 15}
+    keeper.observations = {1: (190, 5 * 10 ** 17 - 10 ** 16), 2: (190, 10 ** 15 - 10 ** 14)}
+    assert asyncio.run(keeper.step()) == [1]
+    assert factory.lastDisbursed(1) == 200
+    assert factory.lastDisbursed(2) == 100
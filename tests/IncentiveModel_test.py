@@ -0,0 +1,160 @@
+# Copyright 2025, NoFeeSwap LLC - All rights reserved.
+import random
+from hypothesis import settings, strategies as st
+from hypothesis.stateful import RuleBasedStateMachine, initialize, invariant, precondition, rule
+from Nofee import IncentiveModel, pointsPerShareIncrement
+
+poolId = 0x40249 << 160
+spacing = 1 << 40
+base = 1 << 63
+startBlock = 1000
+endBlock = 1000000
+
+def boundary(k):
+    return base + k * spacing
+
+class IncentiveMachine(RuleBasedStateMachine):
+    # Every position is credited directly with 'shares * increment' whenever
+    # the pool is accounted while its range contains the active interval. The
+    # model has to agree with this brute force tally.
+    @initialize(blockNumber=st.integers(min_value=0, max_value=2 * startBlock), k=st.integers(min_value=-4, max_value=4))
+    def preInitialize(self, blockNumber, k):
+        self.incentive = IncentiveModel(startBlock, endBlock, 1 << 120)
+        self.incentive.preInitialize(poolId, blockNumber, boundary(k), boundary(k + 1))
+        self.blockNumber = blockNumber
+        self.k = k
+        self.growth = 1 << 111
+        self.integral0 = 1 << 200
+        self.integral1 = 1 << 200
+        self.outgoingMax = 1 << 210
+        self.pending = {}
+
+    def sharesTotal(self):
+        return sum(
+            shares for _, qMin, qMax, shares, _, _ in self.incentive.positions.values()
+            if qMin <= boundary(self.k) and boundary(self.k + 1) <= qMax
+        )
+
+    def account(self):
+        lastBlockAccounted = self.incentive.poolData[poolId][0]
+        if startBlock < self.blockNumber <= endBlock and self.blockNumber != lastBlockAccounted:
+            increment = 0
+            if self.growth <= 1 << 120:
+                increment = pointsPerShareIncrement(
+                    self.blockNumber - lastBlockAccounted,
+                    self.growth,
+                    self.integral0,
+                    self.integral1,
+                    self.outgoingMax
+                )
+            for tokenId, (_, qMin, qMax, shares, _, _) in self.incentive.positions.items():
+                if qMin <= boundary(self.k) and boundary(self.k + 1) <= qMax:
+                    self.pending[tokenId] += shares * increment
+        self.incentive.accountEvanescentPoints(
+            poolId,
+            self.blockNumber,
+            boundary(self.k),
+            boundary(self.k + 1),
+            self.growth,
+            self.integral0,
+            self.integral1,
+            self.outgoingMax,
+            self.sharesTotal()
+        )
+
+    @rule(
+        blocks=st.integers(min_value=1, max_value=2 ** 16),
+        k=st.integers(min_value=-4, max_value=4),
+        growth=st.integers(min_value=0, max_value=2 ** 121),
+        outgoingMax=st.integers(min_value=2 ** 200, max_value=2 ** 216 - 1),
+        ratio0=st.integers(min_value=0, max_value=2 ** 16),
+        ratio1=st.integers(min_value=0, max_value=2 ** 16)
+    )
+    def swap(self, blocks, k, growth, outgoingMax, ratio0, ratio1):
+        self.blockNumber += blocks
+        self.k = k
+        self.growth = growth
+        self.outgoingMax = outgoingMax
+        self.integral0 = (outgoingMax * ratio0) >> 16
+        self.integral1 = (outgoingMax * ratio1) >> 16
+        self.account()
+
+    @rule(
+        kMin=st.integers(min_value=-5, max_value=4),
+        width=st.integers(min_value=1, max_value=5),
+        shares=st.integers(min_value=1, max_value=2 ** 64)
+    )
+    def mint(self, kMin, width, shares):
+        self.account()
+        tokenId = self.incentive.mint(poolId, boundary(kMin), boundary(kMin + width), shares)
+        self.pending[tokenId] = 0
+
+    @precondition(lambda self: len(self.pending) > 0)
+    @rule(data=st.data())
+    def modifyShares(self, data):
+        self.account()
+        tokenId = data.draw(st.sampled_from(sorted(self.pending)))
+        shares = self.incentive.positions[tokenId][3]
+        sharesIncrement = data.draw(st.integers(min_value=-shares, max_value=2 ** 64))
+        self.incentive.modifyIncentiveShares(tokenId, sharesIncrement)
+
+    @precondition(lambda self: len(self.pending) > 0)
+    @rule(data=st.data(), allowance=st.integers(min_value=0, max_value=2 ** 128))
+    def collect(self, data, allowance):
+        self.account()
+        tokenId = data.draw(st.sampled_from(sorted(self.pending)))
+        total = self.incentive.totalEvanescentPointsOwed
+        points = self.incentive.collectEvanescentPoints(tokenId)
+        assert points == self.pending[tokenId]
+        self.pending[tokenId] = 0
+        amount = self.incentive.payRewards(points, allowance)
+        assert amount == (allowance * points // total if total != 0 else 0)
+
+    @invariant()
+    def pendingPoints(self):
+        for tokenId, points in self.pending.items():
+            assert self.incentive.pendingPoints(tokenId) == points
+
+    @invariant()
+    def totalEvanescentPointsOwed(self):
+        assert self.incentive.totalEvanescentPointsOwed == sum(self.pending.values())
+
+TestIncentiveModel = IncentiveMachine.TestCase
+TestIncentiveModel.settings = settings(max_examples=100, stateful_step_count=100, deadline=None)
+
+def test_emission():
+    # Thousands of positions over a million blocks.
+    random.seed(35)
+    incentive = IncentiveModel(0, 2 ** 32 - 1)
+    incentive.preInitialize(poolId, 1, boundary(0), boundary(1))
+    for _ in range(4000):
+        kMin = random.randint(-64, 63)
+        incentive.mint(poolId, boundary(kMin), boundary(kMin + random.randint(1, 16)), random.randint(1, 2 ** 64))
+
+    outgoingMax = (1 << 216) - 1
+    blockNumber = 1
+    k = 0
+    for _ in range(1000):
+        blockNumber += 1000
+        k = max(-64, min(63, k + random.randint(-4, 4)))
+        sharesTotal = sum(
+            shares for _, qMin, qMax, shares, _, _ in incentive.positions.values()
+            if qMin <= boundary(k) and boundary(k + 1) <= qMax
+        )
+        incentive.accountEvanescentPoints(
+            poolId,
+            blockNumber,
+            boundary(k),
+            boundary(k + 1),
+            1 << 111,
+            outgoingMax >> 1,
+            outgoingMax >> 2,
+            outgoingMax,
+            sharesTotal
+        )
+
+    points = 0
+    for tokenId in incentive.positions:
+        points += incentive.collectEvanescentPoints(tokenId)
+    assert points == incentive.totalEvanescentPointsOwed
+    assert points > 0
@@ -1,13 +1,13 @@
 # Copyright 2025, NoFeeSwap LLC - All rights reserved.
 import pytest
 import brownie
-from brownie import chain, accounts, Access, Nofeeswap, NofeeswapDelegatee, ERC20FixedSupply, Deployer, Operator, IncentivePoolFactory, Incentive
+from brownie import chain, accounts, Access, Nofeeswap, NofeeswapDelegatee, ERC20FixedSupply, Deployer, Operator, IncentivePoolFactory, IncentivePoolFactoryLegacyWrapper, Incentive
 from Nofee import logTest, PUSH32, SWAP, REVERT, mintSequence, swapSequence, mintIncentiveSequence, keccak, address0, toInt, twosComplementInt8, encodeKernelCompact, encodeKernel, encodeCurve, getPoolId
 from eth_abi import encode
 from eth_abi.packed import encode_packed
 
-@pytest.fixture(autouse=True)
-def deployment(chain, fn_isolation):
+@pytest.fixture(scope='module', autouse=True)
+def deployment(chain, module_isolation):
     root = accounts[0]
     owner = accounts[1]
     other = accounts[2]
@@ -70,6 +70,10 @@ def deployment(chain, fn_isolation):
 
     return root, owner, other, token0, token1, rewardToken, nofeeswap, delegatee, operator, access, logOffset, lower, upper, curve, kernel, spacing, deadline
 
+@pytest.fixture(autouse=True)
+def isolation(fn_isolation):
+    pass
+
 def test_incentivePoolFactory(deployment, request, worker_id):
     logTest(request, worker_id)
     
@@ -245,12 +249,21 @@ def test_incentivePoolFactory(deployment, request, worker_id):
     unpepperdPoolId_TOKEN0_TOKEN1 = (3 << 188) + (twosComplementInt8(logOffset) << 180) + (0b11100001001001001001 << 160) + toInt(incentive.address)
     unsaltedPoolId_TOKEN0_TOKEN1 = getPoolId(owner.address, unpepperdPoolId_TOKEN0_TOKEN1)
     poolId_TOKEN0_TOKEN1 = getPoolId(incentivePoolFactory.address, unsaltedPoolId_TOKEN0_TOKEN1)
-    incentivePoolFactory.initialize(
+    tx = incentivePoolFactory.initialize(
         unpepperdPoolId_TOKEN0_TOKEN1,
         encodeKernelCompact(kernel),
         encodeCurve(curve),
         {'from': owner}
     )
+    assert tx.events['NewPool']['tag0'] == tag0
+    assert tx.events['NewPool']['tag1'] == tag1
+    assert tx.events['NewPool']['poolId'] == poolId_TOKEN0_TOKEN1
+    assert incentivePoolFactory.syncedPoolGrowthPortion(poolId_TOKEN0_TOKEN1) == poolGrowthPortionFactory
+    assert incentivePoolFactory.poolsCount(tag0, tag1) == 1
+    assert incentivePoolFactory.pools(tag0, tag1, 0, 10) == [poolId_TOKEN0_TOKEN1]
+    assert incentivePoolFactory.pools(tag0, tag1, 1, 10) == []
+    assert incentivePoolFactory.pools(tag0, tag1, 2, 10) == []
+    assert incentivePoolFactory.pools(tag1, tag0, 0, 10) == []
     qMin = lower - (1 << 63) + (logOffset * (1 << 59))
     qMax = upper - (1 << 63) + (logOffset * (1 << 59))
     shares = 1000000000000000000000000000
@@ -263,6 +276,66 @@ def test_incentivePoolFactory(deployment, request, worker_id):
     assert incentivePoolFactory.balanceOf(owner) == 1
     assert incentivePoolFactory.ownerOf(poolId_TOKEN0_TOKEN1) == owner.address
 
+    # Several pools of the same incentive are initialized at once.
+    unpepperdPoolIds = [(k << 188) + (twosComplementInt8(logOffset) << 180) + (0b11100001001001001001 << 160) + toInt(incentive.address) for k in [4, 5]]
+    poolIds = [getPoolId(incentivePoolFactory.address, getPoolId(owner.address, unpepperdPoolId)) for unpepperdPoolId in unpepperdPoolIds]
+
+    with brownie.reverts('UnequalLengths: 2, 1'):
+        incentivePoolFactory.initializeBatch(
+            unpepperdPoolIds,
+            [encodeKernelCompact(kernel)],
+            [encodeCurve(curve)] * 2,
+            {'from': owner}
+        )
+
+    tx = incentivePoolFactory.initializeBatch(
+        unpepperdPoolIds,
+        [encodeKernelCompact(kernel)] * 2,
+        [encodeCurve(curve)] * 2,
+        {'from': owner}
+    )
+    assert list(tx.return_value) == poolIds
+    assert [event['poolId'] for event in tx.events['NewPool']] == poolIds
+    assert incentivePoolFactory.pools(tag0, tag1, 0, 10) == [poolId_TOKEN0_TOKEN1] + poolIds
+    assert incentivePoolFactory.balanceOf(owner) == 3
+    for poolId in poolIds:
+        assert incentivePoolFactory.ownerOf(poolId) == owner.address
+        assert incentivePoolFactory.syncedPoolGrowthPortion(poolId) == poolGrowthPortionFactory
+
+    # Pools of alternating incentive hooks are initialized at once.
+    otherIncentive = Incentive.deploy(
+        nofeeswap.address,
+        address0,
+        address0,
+        address0,
+        incentivePoolFactory.address,
+        tag0,
+        tag1,
+        other.address,
+        rewardToken.address,
+        startBlock,
+        endBlock,
+        1 << 128,
+        {'from': root}
+    )
+    hooks = [incentive, otherIncentive, incentive, otherIncentive]
+    unpepperdPoolIds = [(k << 188) + (twosComplementInt8(logOffset) << 180) + (0b11100001001001001001 << 160) + toInt(hook.address) for k, hook in zip([6, 7, 8, 9], hooks)]
+    poolIds = [getPoolId(incentivePoolFactory.address, getPoolId(owner.address, unpepperdPoolId)) for unpepperdPoolId in unpepperdPoolIds]
+    tx = incentivePoolFactory.initializeBatch(
+        unpepperdPoolIds,
+        [encodeKernelCompact(kernel)] * 4,
+        [encodeCurve(curve)] * 4,
+        {'from': owner}
+    )
+    assert list(tx.return_value) == poolIds
+    assert [event['poolId'] for event in tx.events['NewPool']] == poolIds
+    assert [event['tag0'] for event in tx.events['NewPool']] == [tag0] * 4
+    assert [event['tag1'] for event in tx.events['NewPool']] == [tag1] * 4
+    assert incentivePoolFactory.balanceOf(owner) == 7
+    assert incentivePoolFactory.poolsCount(tag0, tag1) == 7
+    assert incentivePoolFactory.pools(tag0, tag1, 3, 10) == poolIds
+    assert incentivePoolFactory.pools(tag0, tag1, 5, 1) == poolIds[2:3]
+
     ###########################################
 
     poolGrowthPortionFactory = (3 * (2 ** 47)) // 4
@@ -280,6 +353,23 @@ def test_incentivePoolFactory(deployment, request, worker_id):
     tag0, tag1, sqrtOffset, sqrtInverseOffset, sqrtSpacing, sqrtInverseSpacing = access._readStaticParams0(nofeeswap, poolId_TOKEN0_TOKEN1, staticParamsStoragePointer)
     outgoingMax, outgoingMaxModularInverse, incomingMax, poolGrowthPortion, maxPoolGrowthPortion, protocolGrowthPortion, pendingKernelLength = access._readStaticParams1(nofeeswap, poolId_TOKEN0_TOKEN1, staticParamsStoragePointer)
     assert poolGrowthPortion == poolGrowthPortionFactory
+    assert incentivePoolFactory.syncedPoolGrowthPortion(poolId_TOKEN0_TOKEN1) == poolGrowthPortionFactory
+
+    # A pool which is already synced is skipped.
+    incentivePoolFactory.updatePoolGrowthPortion([poolId_TOKEN0_TOKEN1], {'from': other})
+    assert access._readDynamicParams(nofeeswap, poolId_TOKEN0_TOKEN1)[5] == staticParamsStoragePointer
+
+    # A repeated pool is only synced once.
+    incentivePoolFactory.modifyPoolGrowthPortion([tag0], [tag1], [poolGrowthPortionFactory // 3], {'from': root})
+    incentivePoolFactory.updatePoolGrowthPortion([poolId_TOKEN0_TOKEN1, poolId_TOKEN0_TOKEN1], {'from': other})
+    assert access._readDynamicParams(nofeeswap, poolId_TOKEN0_TOKEN1)[5] == staticParamsStoragePointer + 1
+    assert incentivePoolFactory.syncedPoolGrowthPortion(poolId_TOKEN0_TOKEN1) == poolGrowthPortionFactory // 3
+    incentivePoolFactory.modifyPoolGrowthPortion([tag0], [tag1], [poolGrowthPortionFactory], {'from': root})
+    incentivePoolFactory.updatePoolGrowthPortion([poolId_TOKEN0_TOKEN1], {'from': other})
+
+    # Pools which are not initialized by the factory are rejected.
+    with brownie.reverts('UnregisteredPool: ' + str(poolId_TOKEN0_TOKEN1 + (1 << 188))):
+        incentivePoolFactory.updatePoolGrowthPortion([poolId_TOKEN0_TOKEN1, poolId_TOKEN0_TOKEN1 + (1 << 188)], {'from': other})
 
     ###########################################
 
@@ -436,4 +526,102 @@ def test_incentivePoolFactory(deployment, request, worker_id):
         data = swapSequence(nofeeswap, rewardToken, token1, root, poolId_TOKEN1_REWARD, 1 << 90, upper, zeroForOne, b"", deadline)    
     tx = nofeeswap.unlock(operator, data, {'from': root})
     staticParamsStoragePointerExtension, growth, integral0, integral1, sharesTotal, staticParamsStoragePointer, logPriceCurrent = access._readDynamicParams(nofeeswap, poolId_TOKEN1_REWARD)
-    assert logPriceCurrent != _logPriceCurrent
\ No newline at end of file
+    assert logPriceCurrent != _logPriceCurrent
+    ###########################################
+
+    for k in range(len(target)):
+        amountSpecified = - (1 << 125)
+        limit = target[k] - (1 << 63) + (logOffset * (1 << 59))
+        zeroForOne = 2
+
+        data = swapSequence(nofeeswap, token0, token1, root, poolId_TOKEN0_TOKEN1, amountSpecified, limit, zeroForOne, b"", deadline)
+        tx = nofeeswap.unlock(operator, data, {'from': root})
+
+    tx = nofeeswap.dispatch(
+        delegatee.collectPool.encode_input(poolId_TOKEN0_TOKEN1), {'from': root}
+    )
+
+    chain.mine(disburseGap)
+
+    balance = rewardToken.balanceOf(other)
+    amount0 = nofeeswap.balanceOf(incentivePoolFactory, tag0)
+    amount1 = nofeeswap.balanceOf(incentivePoolFactory, tag1)
+    assert amount0 > 0 and amount1 > 0
+
+    # Both tags are converted within a single unlock and the repeated tag is
+    # skipped.
+    tx = incentivePoolFactory.disburseBatch([tag0, tag1, tag0], {'from': root})
+    amounts, nofeeAmount = tx.return_value
+    assert list(amounts) == [amount0, amount1, 0]
+    assert nofeeAmount > 0
+    assert rewardToken.balanceOf(other) == balance + nofeeAmount
+    assert incentivePoolFactory.lastDisbursed(tag0) == tx.block_number
+    assert incentivePoolFactory.lastDisbursed(tag1) == tx.block_number
+
+    # Tags which are not yet due are skipped instead of reverting.
+    tx = incentivePoolFactory.disburseBatch([tag0, tag1], {'from': root})
+    amounts, nofeeAmount_ = tx.return_value
+    assert list(amounts) == [0, 0]
+    assert nofeeAmount_ == 0
+    assert rewardToken.balanceOf(other) == balance + nofeeAmount
+
+def test_updatePoolGrowthPortionGas(deployment, request, worker_id):
+    logTest(request, worker_id)
+
+    root, owner, other, token0, token1, rewardToken, nofeeswap, delegatee, operator, access, logOffset, lower, upper, curve, kernel, spacing, deadline = deployment
+
+    tag0 = toInt(token0.address)
+    tag1 = toInt(token1.address)
+
+    # The wrapper also exposes the implementation which reads the tags of
+    # every pool from the static parameters of nofeeswap.
+    incentivePoolFactory = IncentivePoolFactoryLegacyWrapper.deploy(nofeeswap, rewardToken, other, root, 1, 2, {'from': root})
+    incentive = Incentive.deploy(
+        nofeeswap.address,
+        address0,
+        address0,
+        address0,
+        incentivePoolFactory.address,
+        tag0,
+        tag1,
+        other.address,
+        rewardToken.address,
+        chain[-1].number + 50,
+        chain[-1].number + 250,
+        1 << 128,
+        {'from': root}
+    )
+
+    incentivePoolFactory.modifyPoolGrowthPortion([tag0], [tag1], [(2 ** 47) // 4], {'from': root})
+
+    poolIds = []
+    for k in range(0, 100, 20):
+        unpepperdPoolIds = [((k + j + 1) << 188) + (twosComplementInt8(logOffset) << 180) + (0b11100001001001001001 << 160) + toInt(incentive.address) for j in range(20)]
+        tx = incentivePoolFactory.initializeBatch(
+            unpepperdPoolIds,
+            [encodeKernelCompact(kernel)] * 20,
+            [encodeCurve(curve)] * 20,
+            {'from': owner}
+        )
+        poolIds += list(tx.return_value)
+
+    # Every round sets a new portion so that no pool is skipped. Both
+    # implementations sync the same pools at the same batch size.
+    gasUsed = {}
+    gasUsedLegacy = {}
+    for n, portionLegacy, portion in zip([1, 10, 100], [(2 ** 47) // 3, (2 ** 47) // 2, (2 ** 47) // 5], [(2 ** 47) // 6, (2 ** 47) // 7, (2 ** 47) // 8]):
+        incentivePoolFactory.modifyPoolGrowthPortion([tag0], [tag1], [portionLegacy], {'from': root})
+        tx = incentivePoolFactory.updatePoolGrowthPortionLegacy(poolIds[:n], {'from': other})
+        gasUsedLegacy[n] = tx.gas_used
+        for poolId in poolIds[:n]:
+            assert incentivePoolFactory.syncedPoolGrowthPortion(poolId) == portionLegacy
+
+        incentivePoolFactory.modifyPoolGrowthPortion([tag0], [tag1], [portion], {'from': root})
+        tx = incentivePoolFactory.updatePoolGrowthPortion(poolIds[:n], {'from': other})
+        gasUsed[n] = tx.gas_used
+        for poolId in poolIds[:n]:
+            assert incentivePoolFactory.syncedPoolGrowthPortion(poolId) == portion
+
+        # Every pool saves the cold 'extcodecopy' of its static parameters
+        # while the pair of tags costs two cold slots once per batch.
+        assert gasUsedLegacy[n] - gasUsed[n] > n * 2000 - 2 * 2100
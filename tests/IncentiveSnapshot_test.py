@@ -0,0 +1,85 @@
+# Copyright 2025, NoFeeSwap LLC - All rights reserved.
+import numpy as np
+from Nofee import keccakPacked, keccak256
+from scripts.IncentiveSnapshot import snapshot, getIncentiveDataSlots, getPoolDataSlots, getEvanescentPointsPerShareMappingSlots, fromWords
+
+incentiveAddress = '0x00000000000000000000000000000000000abcde'
+
+class Chain:
+    # Serves 'eth_getStorageAt' from a dictionary of slots.
+    def __init__(self):
+        self.storage = {}
+        self.block_number = 7
+        self.eth = self
+        self.address = incentiveAddress
+
+    def get_storage_at(self, address, slot, blockNumber):
+        assert address == incentiveAddress and blockNumber == 7
+        return self.storage.get(slot, 0).to_bytes(32, 'big')
+
+def test_slots():
+    tokenIds = [0, 1, 2 ** 64, 2 ** 256 - 1]
+    logPrices = [0, 1, 2 ** 63, 2 ** 64 - 1]
+    assert fromWords(getIncentiveDataSlots(tokenIds)) == [
+        keccakPacked(['uint256', 'uint128'], [tokenId, (keccak256('incentiveData') - 1) % (1 << 128)])
+        for tokenId in tokenIds
+    ]
+    assert fromWords(getPoolDataSlots(tokenIds)) == [
+        keccakPacked(['uint256', 'uint128'], [poolId, (keccak256('poolData') - 1) % (1 << 128)])
+        for poolId in tokenIds
+    ]
+    assert fromWords(getEvanescentPointsPerShareMappingSlots(tokenIds, logPrices)) == [
+        keccakPacked(['uint256', 'uint64', 'uint64'], [poolId, logPrice, (keccak256('evanescentPointsPerShareMapping') - 1) % (1 << 64)])
+        for poolId, logPrice in zip(tokenIds, logPrices)
+    ]
+
+def test_snapshot(tmp_path):
+    chain = Chain()
+    poolIds = [(k << 160) | int(incentiveAddress, 16) for k in [5, 9]]
+    positions = {}
+    for tokenId in range(1, 101):
+        poolId = poolIds[tokenId % 2]
+        qMin = (1 << 63) + tokenId * (1 << 40)
+        qMax = qMin + (1 << 41)
+        owed = tokenId ** 10 if tokenId % 10 == 0 else tokenId
+        positions[tokenId] = (poolId, qMin, qMax, tokenId << 64, tokenId << 32, owed)
+
+        slot = fromWords(getIncentiveDataSlots([tokenId]))[0]
+        overflow = owed >= (1 << 64) - 1
+        chain.storage[slot] = (poolId - (poolId % (1 << 160))) | ((((1 << 64) - 1) if overflow else owed) << 96) | (tokenId << 32)
+        chain.storage[slot + 1] = (qMin << 192) | (qMax << 128) | (tokenId << 64)
+        if overflow:
+            chain.storage[slot + 2] = owed
+        for logPrice in [qMin, qMax]:
+            chain.storage[fromWords(getEvanescentPointsPerShareMappingSlots([poolId], [logPrice]))[0]] = (7 << 224) | ((logPrice + poolId) % (1 << 224))
+    for k, poolId in enumerate(poolIds):
+        chain.storage[fromWords(getPoolDataSlots([poolId]))[0]] = (7 << 224) | (((1 << 63) + k) << 160) | (((1 << 63) + k + 1) << 96) | k
+
+    np.savez(tmp_path / 'snapshot.npz', **snapshot(chain, chain, list(positions), workers=8))
+    columns = np.load(tmp_path / 'snapshot.npz')
+
+    assert int(columns['blockNumber']) == 7
+    assert columns['tokenId'].tolist() == list(range(1, 101))
+    assert fromWords(columns['poolId']) == poolIds
+    assert [value >> 224 for value in fromWords(columns['poolData'])] == [7, 7]
+    for k, tokenId in enumerate(range(1, 101)):
+        poolId, qMin, qMax, shares, subtrahend, owed = positions[tokenId]
+        value0, value1, value2 = fromWords(columns['incentiveData'][k])
+        assert value0 % (1 << 96) == subtrahend
+        assert value1 % (1 << 128) == shares
+        assert (value2 if (value0 >> 96) % (1 << 64) == (1 << 64) - 1 else (value0 >> 96) % (1 << 64)) == owed
+        assert (columns['qMin'][k], columns['qMax'][k]) == (qMin, qMax)
+
+    # Every boundary of every position and pool is present in the mapping.
+    mapping = {
+        (poolId, int(logPrice)): value for poolId, logPrice, value in zip(
+            fromWords(columns['mappingPoolId']),
+            columns['mappingLogPrice'],
+            fromWords(columns['mapping'])
+        )
+    }
+    for poolId, qMin, qMax, _, _, _ in positions.values():
+        assert mapping[(poolId, qMin)] == (qMin + poolId) % (1 << 224)
+        assert mapping[(poolId, qMax)] == (qMax + poolId) % (1 << 224)
+    for k, poolId in enumerate(poolIds):
+        assert (poolId, (1 << 63) + k) in mapping
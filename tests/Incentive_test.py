@@ -1,15 +1,15 @@
 # Copyright 2025, NoFeeSwap LLC - All rights reserved.
 import pytest
 import brownie
-from brownie import web3, accounts, AccessIncentive, Nofeeswap, NofeeswapDelegatee, ERC20FixedSupply, Deployer, Incentive, Operator, IncentiveDeployer, IncentiveWrapper
+from brownie import web3, accounts, AccessIncentive, Nofeeswap, NofeeswapDelegatee, ERC20FixedSupply, Deployer, Incentive, Operator, IncentiveDeployer, IncentiveWrapper, IncentiveLayoutWrapper
 from sympy import sqrt, Integer, floor
-from Nofee import logTest, PUSH32, MODIFY_POSITION, REVERT, address0, swapSequence, mintIncentiveSequence, burnIncentiveSequence, keccak, toInt, twosComplementInt8, encodeKernelCompact, encodeCurve, getPoolId
+from Nofee import logTest, PUSH32, MODIFY_POSITION, REVERT, address0, swapSequence, mintIncentiveSequence, burnIncentiveSequence, keccak, toInt, twosComplementInt8, encodeKernelCompact, encodeCurve, getPoolId, decodeIncentiveData
 from eth_abi import encode
 from eth_abi.packed import encode_packed
 from sha3 import keccak_256
 
-@pytest.fixture(autouse=True)
-def deployment(fn_isolation):
+@pytest.fixture(scope='module', autouse=True)
+def deployment(module_isolation):
     root = accounts[0]
     owner = accounts[1]
     other = accounts[2]
@@ -43,6 +43,93 @@ def deployment(fn_isolation):
 
     return root, owner, other, nofeeswap, delegatee, access, deployer, operator
 
+@pytest.fixture(autouse=True)
+def isolation(fn_isolation):
+    pass
+
+def deployIncentivePool(chain, deployment, incentiveDeploymentSalt, container=Incentive):
+    # Deploys a pair of tokens and an incentive whose window starts 50 blocks
+    # from now and lasts 200 blocks. Then, a pool is initialized with the
+    # incentive as its hook.
+    root, owner, other, nofeeswap, delegatee, access, deployer, operator = deployment
+
+    token0 = ERC20FixedSupply.deploy("ERC20_0", "ERC20_0", 2**120, owner, {'from': owner})
+    token1 = ERC20FixedSupply.deploy("ERC20_1", "ERC20_1", 2**120, owner, {'from': owner})
+    token0.approve(operator, 2**120, {'from': owner})
+    token1.approve(operator, 2**120, {'from': owner})
+    nofeeswap.setOperator(operator, True, {'from': owner})
+    if toInt(token0.address) > toInt(token1.address):
+        token0, token1 = token1, token0
+    rewardToken = ERC20FixedSupply.deploy("REWARD", "REWARD", 2**120, root, {'from': root})
+    tag0 = toInt(token0.address)
+    tag1 = toInt(token1.address)
+
+    startBlock = chain[-1].number + 50
+    endBlock = chain[-1].number + 250
+
+    incentive = deployer.addressOf(incentiveDeploymentSalt)
+    rewardToken.approve(incentive, 2**120, {'from': root})
+    deployer.create3(
+        incentiveDeploymentSalt,
+        container.bytecode + encode(
+            ['address', 'address', 'address', 'address', 'address', 'uint256', 'uint256', 'address', 'address', 'uint32', 'uint32', 'int256'],
+            [nofeeswap.address, address0, address0, address0, root.address, tag0, tag1, root.address, rewardToken.address, startBlock, endBlock, 1 << 128]
+        ).hex(),
+        {'from': root}
+    )
+    incentive = container.at(incentive)
+
+    spacing = 20 * 60 * 57643193118714
+    kernel = [
+      [0, 0],
+      [spacing, 2 ** 15]
+    ]
+    curve = [
+      (2 ** 63) - (spacing // 2) + spacing,
+      (2 ** 63) - (spacing // 2),
+      (2 ** 63)
+    ]
+    lower = min(curve[0], curve[1])
+    upper = max(curve[0], curve[1])
+
+    logOffset = -5
+    unsaltedPoolId = (1 << 188) + (twosComplementInt8(logOffset) << 180) + (0b01000000001001001001 << 160) + toInt(incentive.address)
+    poolId = getPoolId(root.address, unsaltedPoolId)
+
+    nofeeswap.dispatch(
+      delegatee.initialize.encode_input(
+          unsaltedPoolId,
+          tag0,
+          tag1,
+          0x800000000000,
+          encodeKernelCompact(kernel),
+          encodeCurve(curve),
+          b"HookData"
+      ),
+      {'from': root}
+    )
+
+    deadline = 2 ** 32 - 1
+    qMin = lower - (1 << 63) + (logOffset * (1 << 59))
+    qMax = upper - (1 << 63) + (logOffset * (1 << 59))
+    shares = 100000000000
+    tagShares = keccak(['uint256', 'int256', 'int256'], [poolId, qMin, qMax])
+
+    return token0, token1, rewardToken, tag0, tag1, startBlock, endBlock, incentive, spacing, lower, upper, logOffset, poolId, deadline, qMin, qMax, shares, tagShares
+
+def mintIncentivePositions(deployment, incentive, token0, token1, poolId, qMin, qMax, shares, deadline):
+    # Mints tokens 1 and 2 with 'shares' and '3 * shares' to 'owner' and token
+    # 3 with '4 * shares' to 'other'.
+    root, owner, other, nofeeswap, delegatee, access, deployer, operator = deployment
+
+    tagShares = keccak(['uint256', 'int256', 'int256'], [poolId, qMin, qMax])
+    txs = []
+    for recipient, amount in [(owner, shares), (owner, 3 * shares), (other, 4 * shares)]:
+        hookData = encode(['uint256', 'address'], [0, recipient.address])
+        data = mintIncentiveSequence(nofeeswap, incentive, token0, token1, tagShares, poolId, qMin, qMax, amount, hookData, deadline)
+        txs += [nofeeswap.unlock(operator, data, {'from': owner})]
+    return txs
+
 def test_deployIncentive(chain, deployment, request, worker_id):
     logTest(request, worker_id)
     
@@ -822,4 +909,635 @@ def test_points(chain, deployment, request, worker_id):
     ############################################################################
 
     incentive.collect(2, {'from': other})
-    assert rewardToken.balanceOf(other) == 3 * (2 ** 118)
\ No newline at end of file
+    assert rewardToken.balanceOf(other) == 3 * (2 ** 118)
+def test_collectBatch(chain, deployment, request, worker_id):
+    logTest(request, worker_id)
+    
+    root, owner, other, nofeeswap, delegatee, access, deployer, operator = deployment
+
+    token0, token1, rewardToken, tag0, tag1, startBlock, endBlock, incentive, spacing, lower, upper, logOffset, poolId, deadline, qMin, qMax, shares, tagShares = deployIncentivePool(chain, deployment, 15)
+
+    mintIncentivePositions(deployment, incentive, token0, token1, poolId, qMin, qMax, shares, deadline)
+
+    ############################################################################
+
+    chain.mine(50)
+
+    ############################################################################
+
+    amountSpecified = - (1 << 120)
+    limit = upper - (spacing // 4) - (1 << 63) + (logOffset * (1 << 59))
+    zeroForOne = 2
+    hookData = b"HookData"
+
+    data = swapSequence(nofeeswap, token0, token1, root, poolId, amountSpecified, limit, zeroForOne, hookData, deadline)
+    tx = nofeeswap.unlock(operator, data, {'from': owner})
+
+    totalEvanescentPointsOwed = access._readTotalEvanescentPointsOwedSlot(incentive)
+    assert totalEvanescentPointsOwed > 0
+
+    ############################################################################
+
+    with brownie.reverts('ERC721InsufficientApproval: ' + owner.address.lower() + ', ' + str(3)):
+        tx = incentive.collectBatch([1, 2, 3], {'from': owner})
+
+    ############################################################################
+
+    tx = incentive.collectBatch([1, 2, 1], {'from': owner})
+    assert tx.return_value == 2 ** 119
+    assert rewardToken.balanceOf(owner) == 2 ** 119
+    assert access._readTotalEvanescentPointsOwedSlot(incentive) == totalEvanescentPointsOwed // 2
+
+    for tokenId in [1, 2]:
+        _poolId, _qMin, _qMax, _shares, _evanescentPointsPerShareSubtrahend, _evanescentPointsOwed = access._readIncentiveData(incentive, tokenId)
+        assert _evanescentPointsOwed == 0
+
+    ############################################################################
+
+    tx = incentive.collectBatch([3], {'from': other})
+    assert tx.return_value == 2 ** 119
+    assert rewardToken.balanceOf(other) == 2 ** 119
+    assert access._readTotalEvanescentPointsOwedSlot(incentive) == 0
+
+def test_pendingRewards(chain, deployment, request, worker_id):
+    logTest(request, worker_id)
+    
+    root, owner, other, nofeeswap, delegatee, access, deployer, operator = deployment
+
+    token0, token1, rewardToken, tag0, tag1, startBlock, endBlock, incentive, spacing, lower, upper, logOffset, poolId, deadline, qMin, qMax, shares, tagShares = deployIncentivePool(chain, deployment, 16)
+
+    mintIncentivePositions(deployment, incentive, token0, token1, poolId, qMin, qMax, shares, deadline)
+
+    ############################################################################
+
+    chain.mine(50)
+
+    ############################################################################
+
+    amountSpecified = - (1 << 120)
+    limit = upper - (spacing // 4) - (1 << 63) + (logOffset * (1 << 59))
+    zeroForOne = 2
+    hookData = b"HookData"
+
+    data = swapSequence(nofeeswap, token0, token1, root, poolId, amountSpecified, limit, zeroForOne, hookData, deadline)
+    tx = nofeeswap.unlock(operator, data, {'from': owner})
+
+    totalEvanescentPointsOwed = access._readTotalEvanescentPointsOwedSlot(incentive)
+    assert totalEvanescentPointsOwed > 0
+
+    ############################################################################
+
+    pendingPoints = incentive.pendingPoints(1)
+    assert pendingPoints > 0
+    assert incentive.pendingPoints(2) == 3 * pendingPoints
+    assert incentive.pendingPoints(3) == 4 * pendingPoints
+
+    chain.mine(10)
+
+    # The points accrued since the last block accounted are included.
+    assert incentive.pendingPoints(1) > pendingPoints
+    assert access._readTotalEvanescentPointsOwedSlot(incentive) == totalEvanescentPointsOwed
+
+    amounts = incentive.pendingRewards([1, 2, 3])
+    assert amounts[1] in [3 * amounts[0], 3 * amounts[0] + 1, 3 * amounts[0] + 2]
+    assert 2 ** 120 - 3 <= sum(amounts) <= 2 ** 120
+
+    with brownie.reverts('ERC721NonexistentToken: ' + str(4)):
+        incentive.pendingPoints(4)
+
+    ############################################################################
+
+    chain.mine(endBlock - chain[-1].number + 1)
+
+    # After 'endBlock', nothing remains pending and the views match 'collect'.
+    lastBlockAccounted, qLower, qUpper, activeEvanescentPointsPerShare = access._readPoolData(incentive, poolId)
+    assert incentive.pendingPoints(1) == shares * activeEvanescentPointsPerShare
+    assert incentive.pendingRewards([1]) == [incentive.collect.call(1, {'from': owner})]
+
+    tx = incentive.collectBatch([1, 2], {'from': owner})
+    assert incentive.pendingPoints(1) == 0
+    assert incentive.pendingRewards([1, 2, 3]) == [0, 0, 2 ** 120 - tx.return_value]
+
+    ############################################################################
+
+    owners, data = incentive.incentiveData([1, 2, 3, 4])
+    positions = decodeIncentiveData(incentive, owners, data)
+    assert [position[0] for position in positions] == [owner.address, owner.address, other.address, address0]
+    for tokenId in [1, 2, 3, 4]:
+        assert positions[tokenId - 1][1:] == tuple(access._readIncentiveData(incentive, tokenId))
+
+def test_pendingPointsCollect(chain, deployment, request, worker_id):
+    logTest(request, worker_id)
+    
+    root, owner, other, nofeeswap, delegatee, access, deployer, operator = deployment
+
+    token0, token1, rewardToken, tag0, tag1, startBlock, endBlock, incentive, spacing, lower, upper, logOffset, poolId, deadline, qMin, qMax, shares, tagShares = deployIncentivePool(chain, deployment, 23)
+
+    mintIncentivePositions(deployment, incentive, token0, token1, poolId, qMin, qMax, shares, deadline)
+
+    ############################################################################
+
+    chain.mine(50)
+
+    ############################################################################
+
+    amountSpecified = - (1 << 120)
+    limit = upper - (spacing // 4) - (1 << 63) + (logOffset * (1 << 59))
+    zeroForOne = 2
+    hookData = b"HookData"
+
+    data = swapSequence(nofeeswap, token0, token1, root, poolId, amountSpecified, limit, zeroForOne, hookData, deadline)
+    tx = nofeeswap.unlock(operator, data, {'from': owner})
+
+    pendingPoints = incentive.pendingPoints(1)
+
+    chain.mine(10)
+
+    ############################################################################
+
+    # The views are read and the pool is accounted by a mint within the same
+    # transaction. Hence, the collected points and reward must match the
+    # pending ones exactly.
+    tokenId = 1
+    incentiveWrapper = IncentiveWrapper.deploy({'from': root})
+    incentive.transferFrom(owner, incentiveWrapper, tokenId, {'from': owner})
+    token0.transfer(incentiveWrapper, token0.balanceOf(owner), {'from': owner})
+    token1.transfer(incentiveWrapper, token1.balanceOf(owner), {'from': owner})
+    hookData = encode(['uint256', 'address'], [tokenId, incentiveWrapper.address])
+    tx = incentiveWrapper.pendingCollect(
+      nofeeswap,
+      incentive,
+      tokenId,
+      token0,
+      token1,
+      mintIncentiveSequence(nofeeswap, incentive, token0, token1, tagShares, poolId, qMin, qMax, shares, hookData, deadline),
+      {'from': root}
+    )
+    _pendingPoints, pendingReward, amount = tx.return_value
+
+    lastBlockAccounted, qLower, qUpper, activeEvanescentPointsPerShare = access._readPoolData(incentive, poolId)
+    assert lastBlockAccounted == tx.block_number
+
+    assert _pendingPoints > pendingPoints
+    assert tx.events['Collect'][-1]['evanescentPointsOwed'] == _pendingPoints
+    assert amount == pendingReward
+    assert tx.events['Collect'][-1]['amount'] == amount
+    assert rewardToken.balanceOf(incentiveWrapper) == amount
+
+def test_rewardPrograms(chain, deployment, request, worker_id):
+    logTest(request, worker_id)
+    
+    root, owner, other, nofeeswap, delegatee, access, deployer, operator = deployment
+
+    token0, token1, rewardToken, tag0, tag1, startBlock, endBlock, incentive, spacing, lower, upper, logOffset, poolId, deadline, qMin, qMax, shares, tagShares = deployIncentivePool(chain, deployment, 17)
+
+    rewardToken1 = ERC20FixedSupply.deploy("REWARD1", "REWARD1", 2**120, root, {'from': root})
+    rewardToken2 = ERC20FixedSupply.deploy("REWARD2", "REWARD2", 2**120, root, {'from': root})
+    rewardToken1.approve(incentive, 2**120, {'from': root})
+    rewardToken2.approve(incentive, 2**120, {'from': root})
+
+    with brownie.reverts('OnlyByPayMaster: ' + other.address.lower()):
+        incentive.addRewardProgram(rewardToken1, root, startBlock, endBlock, {'from': other})
+
+    with brownie.reverts('RewardProgramOutOfWindow: ' + str(startBlock - 1) + ', ' + str(endBlock)):
+        incentive.addRewardProgram(rewardToken1, root, startBlock - 1, endBlock, {'from': root})
+
+    with brownie.reverts('RewardProgramOutOfWindow: ' + str(startBlock) + ', ' + str(endBlock + 1)):
+        incentive.addRewardProgram(rewardToken1, root, startBlock, endBlock + 1, {'from': root})
+
+    with brownie.reverts('InvalidEndBlock: ' + str(startBlock) + ', ' + str(startBlock)):
+        incentive.addRewardProgram(rewardToken1, root, startBlock, startBlock, {'from': root})
+
+    # Program 1 shares the window of program 0 while program 2 only covers
+    # the first 5 blocks. Program 3 is never accepted by 'other'.
+    tx = incentive.addRewardProgram(rewardToken1, root, startBlock, endBlock, {'from': root})
+    assert tx.return_value == 1
+    tx = incentive.addRewardProgram(rewardToken2, root, startBlock, startBlock + 5, {'from': root})
+    assert tx.return_value == 2
+    tx = incentive.addRewardProgram(rewardToken1, other, startBlock, endBlock, {'from': root})
+    assert tx.return_value == 3
+    assert incentive.rewardProgramsCount() == 3
+    assert incentive.rewardProgram(0) == (rewardToken.address, root.address, startBlock, endBlock, True, 0)
+    assert incentive.rewardProgram(1) == (rewardToken1.address, root.address, startBlock, endBlock, False, 0)
+    assert incentive.rewardProgram(2) == (rewardToken2.address, root.address, startBlock, startBlock + 5, False, 0)
+    assert incentive.rewardProgram(3) == (rewardToken1.address, other.address, startBlock, endBlock, False, 0)
+
+    with brownie.reverts('InvalidRewardProgram: 4'):
+        incentive.rewardProgram(4)
+
+    with brownie.reverts('InvalidRewardProgram: 0'):
+        incentive.acceptRewardProgram(0, {'from': root})
+
+    with brownie.reverts('InvalidRewardProgram: 4'):
+        incentive.acceptRewardProgram(4, {'from': root})
+
+    with brownie.reverts('OnlyByPayMaster: ' + root.address.lower()):
+        incentive.acceptRewardProgram(3, {'from': root})
+
+    incentive.acceptRewardProgram(1, {'from': root})
+    incentive.acceptRewardProgram(2, {'from': root})
+    assert incentive.rewardProgram(1)[4] == True
+    assert incentive.rewardProgram(2)[4] == True
+    assert incentive.rewardProgram(3)[4] == False
+
+    ############################################################################
+
+    mintIncentivePositions(deployment, incentive, token0, token1, poolId, qMin, qMax, shares, deadline)
+
+    ############################################################################
+
+    chain.mine(50)
+
+    ############################################################################
+
+    amountSpecified = - (1 << 120)
+    limit = upper - (spacing // 4) - (1 << 63) + (logOffset * (1 << 59))
+    zeroForOne = 2
+    hookData = b"HookData"
+
+    data = swapSequence(nofeeswap, token0, token1, root, poolId, amountSpecified, limit, zeroForOne, hookData, deadline)
+    tx = nofeeswap.unlock(operator, data, {'from': owner})
+
+    totalEvanescentPointsOwed = access._readTotalEvanescentPointsOwedSlot(incentive)
+    assert totalEvanescentPointsOwed > 0
+
+    ############################################################################
+
+    # The swap accounts the blocks from 'startBlock' on. Program 2 only owes
+    # the points accrued within its first 5 blocks.
+    blocks = tx.block_number - startBlock
+    sharesTotal = 8 * shares
+    pointsPerShareIncrement = totalEvanescentPointsOwed // sharesTotal
+    assert totalEvanescentPointsOwed == pointsPerShareIncrement * sharesTotal
+    assert incentive.rewardProgram(1)[5] == totalEvanescentPointsOwed
+    totalEvanescentPointsOwed2 = incentive.rewardProgram(2)[5]
+    assert totalEvanescentPointsOwed2 == ((pointsPerShareIncrement * 5) // blocks) * sharesTotal
+    assert incentive.rewardProgram(3)[5] == 0
+
+    with brownie.reverts('InvalidStartBlock: ' + str(startBlock) + ', ' + str(chain[-1].number + 1)):
+        incentive.acceptRewardProgram(3, {'from': other})
+
+    ############################################################################
+
+    tx = incentive.collectBatch([1, 2], {'from': owner})
+    assert tx.return_value == 2 ** 119
+    assert [event['programId'] for event in tx.events['CollectRewardProgram']] == [1, 2]
+    assert tx.events['CollectRewardProgram'][0]['amount'] == 2 ** 119
+    assert rewardToken.balanceOf(owner) == 2 ** 119
+    assert rewardToken1.balanceOf(owner) == 2 ** 119
+    assert tx.events['CollectRewardProgram'][1]['evanescentPointsOwed'] == totalEvanescentPointsOwed2 // 2
+    amount2 = 2 ** 119
+    assert rewardToken2.balanceOf(owner) == amount2
+
+    ############################################################################
+
+    tx = incentive.collect(3, {'from': other})
+    assert rewardToken.balanceOf(other) == 2 ** 119
+    assert rewardToken1.balanceOf(other) == 2 ** 119
+    assert rewardToken2.balanceOf(other) == 2 ** 120 - amount2
+    assert incentive.rewardProgram(0)[5] == 0
+    assert incentive.rewardProgram(1)[5] == 0
+    assert incentive.rewardProgram(2)[5] == 0
+
+    ############################################################################
+
+    for programId in range(4, 9):
+        tx = incentive.addRewardProgram(rewardToken1, root, endBlock - 1, endBlock, {'from': root})
+        assert tx.return_value == programId
+
+    with brownie.reverts('TooManyRewardPrograms: '):
+        incentive.addRewardProgram(rewardToken1, root, endBlock - 1, endBlock, {'from': root})
+
+def test_rewardProgramPayments(chain, deployment, request, worker_id):
+    logTest(request, worker_id)
+
+    root, owner, other, nofeeswap, delegatee, access, deployer, operator = deployment
+
+    token0, token1, rewardToken, tag0, tag1, startBlock, endBlock, incentive, spacing, lower, upper, logOffset, poolId, deadline, qMin, qMax, shares, tagShares = deployIncentivePool(chain, deployment, 22)
+
+    rewardToken1 = ERC20FixedSupply.deploy("REWARD1", "REWARD1", 2**120, root, {'from': root})
+    rewardToken2 = ERC20FixedSupply.deploy("REWARD2", "REWARD2", 2**120, root, {'from': root})
+    rewardToken1.approve(incentive, 2**120, {'from': root})
+    rewardToken2.approve(incentive, 2**120, {'from': root})
+
+    # Program 1 covers the second half of the window while program 2 covers
+    # its first 20 blocks.
+    incentive.addRewardProgram(rewardToken1, root, startBlock + 100, endBlock, {'from': root})
+    incentive.addRewardProgram(rewardToken2, root, startBlock, startBlock + 20, {'from': root})
+    incentive.acceptRewardProgram(1, {'from': root})
+    incentive.acceptRewardProgram(2, {'from': root})
+
+    mintIncentivePositions(deployment, incentive, token0, token1, poolId, qMin, qMax, shares, deadline)
+
+    amountSpecified = - (1 << 120)
+    limits = [
+      upper - (spacing // 4) - (1 << 63) + (logOffset * (1 << 59)),
+      lower + (spacing // 4) - (1 << 63) + (logOffset * (1 << 59))
+    ]
+    zeroForOne = 2
+    hookData = b"HookData"
+
+    chain.mine(50)
+    data = swapSequence(nofeeswap, token0, token1, root, poolId, amountSpecified, limits[0], zeroForOne, hookData, deadline)
+    nofeeswap.unlock(operator, data, {'from': owner})
+
+    # Token 4 is minted after program 2 is ended and before program 1 starts.
+    chain.mine(20)
+    hookData4 = encode(['uint256', 'address'], [0, owner.address])
+    data = mintIncentiveSequence(nofeeswap, incentive, token0, token1, tagShares, poolId, qMin, qMax, shares, hookData4, deadline)
+    tx = nofeeswap.unlock(operator, data, {'from': owner})
+    assert startBlock + 20 < tx.block_number < startBlock + 100
+
+    chain.mine(80)
+    data = swapSequence(nofeeswap, token0, token1, root, poolId, amountSpecified, limits[1], zeroForOne, hookData, deadline)
+    tx = nofeeswap.unlock(operator, data, {'from': owner})
+    assert startBlock + 100 < tx.block_number
+    totalEvanescentPointsOwed1 = incentive.rewardProgram(1)[5]
+    assert totalEvanescentPointsOwed1 > 0
+
+    ############################################################################
+
+    # The payMaster of program 1 can no longer pay. The collect still pays
+    # program 0 and program 2 while the points of program 1 are kept.
+    rewardToken1.transfer(other, 2**120, {'from': root})
+    tx = incentive.collect(1, {'from': owner})
+    assert tx.return_value > 0
+    assert rewardToken.balanceOf(owner) == tx.return_value
+    assert [event['programId'] for event in tx.events['CollectRewardProgram']] == [2]
+    assert rewardToken2.balanceOf(owner) > 0
+    assert [event['programId'] for event in tx.events['RewardProgramPaymentFailed']] == [1]
+    unpaid = tx.events['RewardProgramPaymentFailed'][0]['evanescentPointsOwed']
+    assert unpaid > 0
+    assert incentive.unpaidRewardProgramPoints(owner, 1) == unpaid
+    assert incentive.rewardProgram(1)[5] == totalEvanescentPointsOwed1
+
+    # Token 4 accrued no points within the window of program 2.
+    tx = incentive.collect(4, {'from': owner})
+    assert 'CollectRewardProgram' not in tx.events
+    assert [event['programId'] for event in tx.events['RewardProgramPaymentFailed']] == [1]
+    unpaid += tx.events['RewardProgramPaymentFailed'][0]['evanescentPointsOwed']
+    assert incentive.unpaidRewardProgramPoints(owner, 1) == unpaid
+
+    ############################################################################
+
+    with brownie.reverts('InvalidRewardProgram: 3'):
+        incentive.collectRewardProgram(3, {'from': owner})
+
+    # Once the payMaster can pay again, the kept points are claimed.
+    rewardToken1.transfer(root, 2**120, {'from': other})
+    tx = incentive.collectRewardProgram(1, {'from': owner})
+    assert tx.return_value == (2**120 * unpaid) // totalEvanescentPointsOwed1
+    assert rewardToken1.balanceOf(owner) == tx.return_value
+    assert tx.events['CollectRewardProgram'][0]['evanescentPointsOwed'] == unpaid
+    assert incentive.unpaidRewardProgramPoints(owner, 1) == 0
+    assert incentive.rewardProgram(1)[5] == totalEvanescentPointsOwed1 - unpaid
+
+    # Every program pays its remaining allowance to the last collector.
+    incentive.collect(2, {'from': owner})
+    incentive.collect(3, {'from': other})
+    assert incentive.rewardProgram(1)[5] == 0
+    assert incentive.rewardProgram(2)[5] == 0
+    assert rewardToken2.balanceOf(owner) + rewardToken2.balanceOf(other) == 2**120
+
+def test_rewardProgramsGas(chain, deployment, request, worker_id):
+    logTest(request, worker_id)
+    
+    root, owner, other, nofeeswap, delegatee, access, deployer, operator = deployment
+
+    maxRewardPrograms = 8
+
+    # Two identical pools are created. The incentive of the second one carries
+    # the maximum number of reward programs. Both windows are open by the time
+    # of the first swap.
+    pools = []
+    for incentiveDeploymentSalt in [18, 19]:
+        token0, token1, rewardToken, tag0, tag1, startBlock, endBlock, incentive, spacing, lower, upper, logOffset, poolId, deadline, qMin, qMax, shares, tagShares = deployIncentivePool(chain, deployment, incentiveDeploymentSalt)
+        pools += [(token0, token1, poolId)]
+
+        if incentiveDeploymentSalt == 19:
+            for programId in range(1, maxRewardPrograms + 1):
+                incentive.addRewardProgram(rewardToken, root, startBlock, endBlock, {'from': root})
+                incentive.acceptRewardProgram(programId, {'from': root})
+
+        hookData = encode(['uint256', 'address'], [0, owner.address])
+        data = mintIncentiveSequence(nofeeswap, incentive, token0, token1, tagShares, poolId, qMin, qMax, shares, hookData, deadline)
+        tx = nofeeswap.unlock(operator, data, {'from': owner})
+
+    chain.mine(50)
+
+    # Every swap accounts the blocks passed since the previous one. The second
+    # round of swaps writes to nonzero program slots.
+    amountSpecified = - (1 << 120)
+    limits = [
+      upper - (spacing // 4) - (1 << 63) + (logOffset * (1 << 59)),
+      lower + (spacing // 4) - (1 << 63) + (logOffset * (1 << 59))
+    ]
+    zeroForOne = 2
+    hookData = b"HookData"
+    for limit in limits:
+        gasUsed = []
+        for token0, token1, poolId in pools:
+            data = swapSequence(nofeeswap, token0, token1, root, poolId, amountSpecified, limit, zeroForOne, hookData, deadline)
+            tx = nofeeswap.unlock(operator, data, {'from': owner})
+            gasUsed += [tx.gas_used]
+
+    # Each program costs a cold read of its parameters and an update of its
+    # total on every swap, i.e., about 5100 gas on top of the arithmetic.
+    overhead = gasUsed[1] - gasUsed[0]
+    assert 0 < overhead < maxRewardPrograms * 9000
+
+def test_twoSlotLayoutGas(chain, deployment, request, worker_id):
+    logTest(request, worker_id)
+    
+    root, owner, other, nofeeswap, delegatee, access, deployer, operator = deployment
+
+    # Both incentives go through the same sequence of operations. The first
+    # one stores each position in two slots while the second one keeps the
+    # three-slot layout of the parent commit where 'evanescentPointsOwed'
+    # always occupies the third slot.
+    pools = [
+        deployIncentivePool(chain, deployment, 20, Incentive),
+        deployIncentivePool(chain, deployment, 21, IncentiveLayoutWrapper)
+    ]
+
+    def mint(pool, tokenId):
+        token0, token1, rewardToken, tag0, tag1, startBlock, endBlock, incentive, spacing, lower, upper, logOffset, poolId, deadline, qMin, qMax, shares, tagShares = pool
+        hookData = encode(['uint256', 'address'], [tokenId, owner.address])
+        data = mintIncentiveSequence(nofeeswap, incentive, token0, token1, tagShares, poolId, qMin, qMax, shares, hookData, deadline)
+        return nofeeswap.unlock(operator, data, {'from': owner})
+
+    def burn(pool, tokenId):
+        token0, token1, rewardToken, tag0, tag1, startBlock, endBlock, incentive, spacing, lower, upper, logOffset, poolId, deadline, qMin, qMax, shares, tagShares = pool
+        hookData = encode(['uint256', 'address'], [tokenId, owner.address])
+        data = burnIncentiveSequence(token0, token1, owner, operator, tagShares, poolId, qMin, qMax, shares, hookData, deadline)
+        return nofeeswap.unlock(operator, data, {'from': owner})
+
+    def collect(pool, tokenId):
+        token0, token1, rewardToken, tag0, tag1, startBlock, endBlock, incentive, spacing, lower, upper, logOffset, poolId, deadline, qMin, qMax, shares, tagShares = pool
+        return incentive.collect(tokenId, {'from': owner})
+
+    def measure(operation, tokenId):
+        gasUsedTwoSlots, gasUsedThreeSlots = [operation(pool, tokenId).gas_used for pool in pools]
+        return gasUsedThreeSlots - gasUsedTwoSlots
+
+    # A new position writes the third slot in the three-slot layout.
+    assert measure(mint, 0) >= 2100
+
+    # Both windows are open from here on so that every operation below
+    # accrues nonzero points for token 1.
+    chain.mine(50)
+
+    # Each operation saves at least the cold access of the third slot.
+    for operation in [mint, burn, collect]:
+        assert measure(operation, 1) >= 2100
+
+    for pool in pools:
+        token0, token1, rewardToken, tag0, tag1, startBlock, endBlock, incentive, spacing, lower, upper, logOffset, poolId, deadline, qMin, qMax, shares, tagShares = pool
+        assert rewardToken.balanceOf(owner) > 0
+
+def test_mergeSplit(chain, deployment, request, worker_id):
+    logTest(request, worker_id)
+    
+    root, owner, other, nofeeswap, delegatee, access, deployer, operator = deployment
+
+    token0, token1, rewardToken, tag0, tag1, startBlock, endBlock, incentive, spacing, lower, upper, logOffset, poolId, deadline, qMin, qMax, shares, tagShares = deployIncentivePool(chain, deployment, 18)
+
+    txs = mintIncentivePositions(deployment, incentive, token0, token1, poolId, qMin, qMax, shares, deadline)
+    assert [tuple(event.values()) for event in txs[0].events['ModifyShares']] == [(1, poolId, lower, upper, shares)]
+
+    ############################################################################
+
+    chain.mine(50)
+
+    ############################################################################
+
+    amountSpecified = - (1 << 120)
+    limit = upper - (spacing // 4) - (1 << 63) + (logOffset * (1 << 59))
+    zeroForOne = 2
+    hookData = b"HookData"
+
+    data = swapSequence(nofeeswap, token0, token1, root, poolId, amountSpecified, limit, zeroForOne, hookData, deadline)
+    tx = nofeeswap.unlock(operator, data, {'from': owner})
+
+    totalEvanescentPointsOwed = access._readTotalEvanescentPointsOwedSlot(incentive)
+    assert totalEvanescentPointsOwed > 0
+
+    ############################################################################
+
+    with brownie.reverts('ERC721InsufficientApproval: ' + owner.address.lower() + ', ' + str(3)):
+        tx = incentive.merge([1, 3], {'from': owner})
+
+    with brownie.reverts('NoPositionsToMerge: '):
+        incentive.merge([], {'from': owner})
+
+    with brownie.reverts('IncompatiblePositions: ' + str(1) + ', ' + str(1)):
+        tx = incentive.merge([1, 2, 1], {'from': owner})
+
+    ############################################################################
+
+    tx = incentive.merge([1, 2], {'from': owner})
+    assert tx.return_value == 1
+    assert [tuple(event.values()) for event in tx.events['ModifyShares']] == [
+        (2, poolId, lower, upper, - 3 * shares),
+        (1, poolId, lower, upper, 3 * shares)
+    ]
+
+    _poolId, _qMin, _qMax, _shares, _evanescentPointsPerShareSubtrahend, _evanescentPointsOwed = access._readIncentiveData(incentive, 1)
+    assert _poolId == poolId
+    assert _qMin == lower
+    assert _qMax == upper
+    assert _shares == 4 * shares
+    assert _evanescentPointsPerShareSubtrahend == activeEvanescentPointsPerShare
+    assert _evanescentPointsOwed == 4 * shares * activeEvanescentPointsPerShare
+
+    assert access._readIncentiveData(incentive, 2) == (toInt(incentive.address), 0, 0, 0, 0, 0)
+    with brownie.reverts('ERC721NonexistentToken: ' + str(2)):
+        incentive.ownerOf(2)
+
+    ############################################################################
+
+    with brownie.reverts('InsufficientShares: ' + str(1)):
+        tx = incentive.split(1, 4 * shares + 1, {'from': owner})
+
+    tx = incentive.split(1, 3 * shares, {'from': owner})
+    assert tx.return_value == 4
+    assert [tuple(event.values()) for event in tx.events['ModifyShares']] == [
+        (1, poolId, lower, upper, - 3 * shares),
+        (4, poolId, lower, upper, 3 * shares)
+    ]
+    assert incentive.ownerOf(4) == owner.address
+
+    _poolId, _qMin, _qMax, _shares, _evanescentPointsPerShareSubtrahend, _evanescentPointsOwed = access._readIncentiveData(incentive, 1)
+    assert _shares == shares
+    assert _evanescentPointsOwed == 4 * shares * activeEvanescentPointsPerShare
+
+    _poolId, _qMin, _qMax, _shares, _evanescentPointsPerShareSubtrahend, _evanescentPointsOwed = access._readIncentiveData(incentive, 4)
+    assert _poolId == poolId
+    assert _qMin == lower
+    assert _qMax == upper
+    assert _shares == 3 * shares
+    assert _evanescentPointsPerShareSubtrahend == activeEvanescentPointsPerShare
+    assert _evanescentPointsOwed == 0
+
+    ############################################################################
+
+    # Merging and splitting preserve the rewards owed to each owner.
+    tx = incentive.collectBatch([1, 4], {'from': owner})
+    assert tx.return_value == 2 ** 119
+    assert [tuple(event.values()) for event in tx.events['Collect']] == [(owner.address, 4 * shares * activeEvanescentPointsPerShare, 2 ** 119)]
+    tx = incentive.collect(3, {'from': other})
+    assert tx.return_value == 2 ** 119
+
+def test_burn(chain, deployment, request, worker_id):
+    logTest(request, worker_id)
+    
+    root, owner, other, nofeeswap, delegatee, access, deployer, operator = deployment
+
+    token0, token1, rewardToken, tag0, tag1, startBlock, endBlock, incentive, spacing, lower, upper, logOffset, poolId, deadline, qMin, qMax, shares, tagShares = deployIncentivePool(chain, deployment, 19)
+
+    mintIncentivePositions(deployment, incentive, token0, token1, poolId, qMin, qMax, shares, deadline)
+
+    ############################################################################
+
+    chain.mine(50)
+
+    ############################################################################
+
+    amountSpecified = - (1 << 120)
+    limit = upper - (spacing // 4) - (1 << 63) + (logOffset * (1 << 59))
+    zeroForOne = 2
+    hookData = b"HookData"
+
+    data = swapSequence(nofeeswap, token0, token1, root, poolId, amountSpecified, limit, zeroForOne, hookData, deadline)
+    tx = nofeeswap.unlock(operator, data, {'from': owner})
+
+    totalEvanescentPointsOwed = access._readTotalEvanescentPointsOwedSlot(incentive)
+    assert totalEvanescentPointsOwed > 0
+
+    ############################################################################
+
+    with brownie.reverts('PositionNotEmpty: ' + str(1) + ', ' + str(shares)):
+        tx = incentive.burn(1, {'from': owner})
+
+    # All shares of token 1 are withdrawn.
+    hookData = encode(['uint256', 'address'], [1, owner.address])
+    data = burnIncentiveSequence(token0, token1, owner, operator, tagShares, poolId, qMin, qMax, shares, hookData, deadline)
+    tx = nofeeswap.unlock(operator, data, {'from': owner})
+    assert [tuple(event.values()) for event in tx.events['ModifyShares']] == [(1, poolId, lower, upper, - shares)]
+
+    with brownie.reverts('ERC721InsufficientApproval: ' + other.address.lower() + ', ' + str(1)):
+        tx = incentive.burn(1, {'from': other})
+
+    ############################################################################
+
+    # The remaining points are paid and the position is cleared.
+    _, _, _, _, _, evanescentPointsOwed = access._readIncentiveData(incentive, 1)
+    tx = incentive.burn(1, {'from': owner})
+    assert tx.return_value > 0
+    assert rewardToken.balanceOf(owner) == tx.return_value
+    assert [tuple(event.values()) for event in tx.events['Collect']] == [(owner.address, evanescentPointsOwed, tx.return_value)]
+    assert access._readIncentiveData(incentive, 1) == (toInt(incentive.address), 0, 0, 0, 0, 0)
+    with brownie.reverts('ERC721NonexistentToken: ' + str(1)):
+        incentive.ownerOf(1)
+    with brownie.reverts('ERC721NonexistentToken: ' + str(1)):
+        incentive.burn(1, {'from': owner})
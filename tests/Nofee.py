@@ -1,10 +1,12 @@
 # Copyright 2025, NoFeeSwap LLC - All rights reserved.
+import math
 import os
 import time
 from sympy import Integer, Symbol, Piecewise, And, floor, piecewise_fold, exp, N, oo
 from sha3 import keccak_256
 from eth_abi import encode
 from eth_abi.packed import encode_packed
+from scripts.PoolModel import toRational, amend, getFunctionFromKernel, getFunctionFromCurve, outgoing, incoming, getMaxIntegrals, Pool, getGrowthMultiplier
 
 minLogStep = (1 << 59) >> 27
 minLogSpacing = (1 << 59) >> 19
@@ -253,12 +255,6 @@ def subOffset(input):
     else:
         return input - X63
     
-def toRational(input):
-    if type(input) is list:
-        return [(value - X63) / Integer(X59) for value in input]
-    else:
-        return (input - X63) / Integer(X59)
-
 def getBoundaries(curve):
     return min(curve[0], curve[1]), max(curve[0], curve[1])
 
@@ -670,366 +666,6 @@ def encodeCurve(curve):
         index += 1
     return encodedCurve
 
-def amend(curve, targetX59):
-    newCurve = [point for point in curve]
-    point0 = newCurve[0]
-    point1 = newCurve[1]
-    if targetX59 <= min(point0, point1):
-        return [max(point0, point1), min(point0, point1)]
-    if targetX59 >= max(point0, point1):
-        return [min(point0, point1), max(point0, point1)]
-    index = 1
-    while (True):
-        if (min(point0, point1) < targetX59 < max(point0, point1)):
-            point0 = point1
-            index += 1
-            if (index < len(newCurve)):
-                point1 = curve[index]
-            else:
-                break
-        else:
-            break
-    if (index < len(newCurve)):
-        newCurve[index] = targetX59
-        newCurve = newCurve[0: (index + 1)]
-    else:
-        newCurve += [targetX59]
-    return newCurve
-
-def getFunctionFromKernel(kernel):
-    h = Symbol('h', real = True)
-    args = []
-    for k in range(len(kernel) - 1):
-        c0 = Integer(kernel[k][1]) / X15
-        c1 = Integer(kernel[k+1][1]) / X15
-        b0 = Integer(kernel[k][0]) / X59
-        b1 = Integer(kernel[k+1][0]) / X59
-        if b1 != b0:
-            args = args + [(
-                c0 + ((c1 - c0) * (h - b0) / (b1 - b0)),
-                And(b0 < h, h < b1)
-            )]
-    args = args + [(0, h < 0), (0, (Integer(kernel[-1][0]) / X59) < h), (0, True)]
-    return Piecewise(*args), h
-
-def getFunctionFromCurve(curve, kernel):
-    zKernel, h = getFunctionFromKernel(kernel)
-    args = []
-    for k in range(len(curve), 1, -1):
-        point0 = (curve[min(k, len(curve) - 1)] - X63) / Integer(X59)
-        point1 = (curve[k - 1] - X63) / Integer(X59)
-        point2 = (curve[k - 2] - X63) / Integer(X59)
-        if point2 > point0:
-            args = args + [(zKernel.subs(h, h - point1), And(point0 < h, h < point2))]
-        else:
-            args = args + [(zKernel.subs(h, point1 - h), And(point2 < h, h < point0))]
-    point1 = min((curve[0] - X63) / Integer(X59), (curve[1] - X63) / Integer(X59))
-    point2 = max((curve[0] - X63) / Integer(X59), (curve[1] - X63) / Integer(X59))
-    args = args + [(0, h < point1), (0, point2 < h), (0, True)]
-    return Piecewise(*args), h
-
-def outgoing(curve, kernel, qMinX59, qMaxX59):
-    if qMinX59 == qMaxX59:
-        return Integer(0)
-    
-    integral = 0
-    h = Symbol('h', real = True)
-
-    if curve[-1] <= qMinX59:
-        for kk in range(len(curve), 1, -1):
-            point0 = curve[min(kk, len(curve) - 1)]
-            point1 = curve[kk - 1]
-            point2 = curve[kk - 2]
-            if point0 < point2:
-                begin = max(qMinX59, point0)
-                end = min(qMaxX59, point2)
-                if begin < end:
-                    for ii in range(len(kernel) - 1):
-                        c0 = Integer(kernel[ii][1]) / X15
-                        c1 = Integer(kernel[ii + 1][1]) / X15
-                        b0 = point1 + kernel[ii][0]
-                        b1 = point1 + kernel[ii + 1][0]
-                        limit0 = max(b0, begin)
-                        limit1 = min(b1, end)
-                        if limit0 < limit1:
-                            f = ((c0 + ((c1 - c0) * (h - toRational(b0)) / (toRational(b1) - toRational(b0)))) * exp(- h / 2)).integrate(h)
-                            integral += N(X216 * exp(-8) * (f.subs(h, toRational(limit1)) - f.subs(h, toRational(limit0))) / 2, 200)
-        return floor(integral)
-    
-    if qMaxX59 <= curve[-1]:
-        for kk in range(len(curve), 1, -1):
-            point0 = curve[min(kk, len(curve) - 1)]
-            point1 = curve[kk - 1]
-            point2 = curve[kk - 2]
-            if point2 < point0:
-                begin = min(qMaxX59, point0)
-                end = max(qMinX59, point2)
-                if end < begin:
-                    for ii in range(len(kernel) - 1):
-                        c0 = Integer(kernel[ii][1]) / X15
-                        c1 = Integer(kernel[ii + 1][1]) / X15
-                        b0 = point1 - kernel[ii][0]
-                        b1 = point1 - kernel[ii + 1][0]
-                        limit0 = max(b1, end)
-                        limit1 = min(b0, begin)
-                        if limit0 < limit1:
-                            f = ((c0 + ((c1 - c0) * (h - toRational(b0)) / (toRational(b1) - toRational(b0)))) * exp(+ h / 2)).integrate(h)
-                            integral += N(X216 * exp(-8) * (f.subs(h, toRational(limit1)) - f.subs(h, toRational(limit0))) / 2, 200)
-        return floor(integral)
-
-def incoming(curve, kernel, qMinX59, qMaxX59):
-    if qMinX59 == qMaxX59:
-        return Integer(0)
-    
-    integral = 0
-    h = Symbol('h', real = True)
-
-    if curve[-1] <= qMinX59:
-        for kk in range(len(curve), 1, -1):
-            point0 = curve[min(kk, len(curve) - 1)]
-            point1 = curve[kk - 1]
-            point2 = curve[kk - 2]
-            if point0 < point2:
-                begin = max(qMinX59, point0)
-                end = min(qMaxX59, point2)
-                if begin < end:
-                    for ii in range(len(kernel) - 1):
-                        c0 = Integer(kernel[ii][1]) / X15
-                        c1 = Integer(kernel[ii + 1][1]) / X15
-                        b0 = point1 + kernel[ii][0]
-                        b1 = point1 + kernel[ii + 1][0]
-                        limit0 = max(b0, begin)
-                        limit1 = min(b1, end)
-                        if limit0 < limit1:
-                            f = ((c0 + ((c1 - c0) * (h - toRational(b0)) / (toRational(b1) - toRational(b0)))) * exp(+ h / 2)).integrate(h)
-                            integral += N(X216 * exp(-8) * (f.subs(h, toRational(limit1)) - f.subs(h, toRational(limit0))) / 2, 200)
-        return floor(integral)
-    
-    if qMaxX59 <= curve[-1]:
-        for kk in range(len(curve), 1, -1):
-            point0 = curve[min(kk, len(curve) - 1)]
-            point1 = curve[kk - 1]
-            point2 = curve[kk - 2]
-            if point2 < point0:
-                begin = min(qMaxX59, point0)
-                end = max(qMinX59, point2)
-                if end < begin:
-                    for ii in range(len(kernel) - 1):
-                        c0 = Integer(kernel[ii][1]) / X15
-                        c1 = Integer(kernel[ii + 1][1]) / X15
-                        b0 = point1 - kernel[ii][0]
-                        b1 = point1 - kernel[ii + 1][0]
-                        limit0 = max(b1, end)
-                        limit1 = min(b0, begin)
-                        if limit0 < limit1:
-                            f = ((c0 + ((c1 - c0) * (h - toRational(b0)) / (toRational(b1) - toRational(b0)))) * exp(- h / 2)).integrate(h)
-                            integral += N(X216 * exp(-8) * (f.subs(h, toRational(limit1)) - f.subs(h, toRational(limit0))) / 2, 200)
-        return floor(integral)
-
-def getMaxIntegrals(kernel):
-    lower = 1
-    upper = kernel[-1][0] + 1
-    zKernel, hKernel = getFunctionFromKernel(kernel)
-    zOutgoing = piecewise_fold(zKernel.subs(hKernel, hKernel - (Integer(lower - (2 ** 63)) / (2 ** 59))) * exp(- hKernel / 2), evaluate = True)._eval_integral(hKernel)
-    outgoingMax = floor(N((2 ** 216) * exp(-8) * exp(+ Integer(lower - (2 ** 63)) / (2 ** 60)) * (zOutgoing.subs(hKernel, Integer(upper - 2 ** 63) / (2 ** 59)) - zOutgoing.subs(hKernel, Integer(lower - 2 ** 63) / (2 ** 59))) / 2, 100))
-    zIncoming = piecewise_fold(zKernel.subs(hKernel, hKernel - (Integer(lower - (2 ** 63)) / (2 ** 59))) * exp(+ hKernel / 2), evaluate = True)._eval_integral(hKernel)
-    incomingMax = floor(N((2 ** 216) * exp(-8) * exp(- Integer(upper - (2 ** 63)) / (2 ** 60)) * (zIncoming.subs(hKernel, Integer(upper - 2 ** 63) / (2 ** 59)) - zIncoming.subs(hKernel, Integer(lower - 2 ** 63) / (2 ** 59))) / 2, 100))
-    return outgoingMax, incomingMax
-
-class Pool:
-    def __init__(
-        self,
-        logOffset,
-        curve,
-        kernel,
-        protocolGrowthPortion,
-        poolGrowthPortion,
-        numberOfIntervals
-    ):
-        self.protocolGrowthPortion = protocolGrowthPortion
-        self.poolGrowthPortion = poolGrowthPortion
-        self.logOffset = Integer(logOffset)
-        self.curve = curve
-        self.kernel = kernel
-        self.amount0 = 0
-        self.amount1 = 0
-        self.poolAccrued0 = 0
-        self.poolAccrued1 = 0
-        self.protocolAccrued0 = 0
-        self.protocolAccrued1 = 0
-
-        lower = min(curve[0], curve[1])
-        upper = max(curve[0], curve[1])
-        spacing = upper - lower
-        minLogPrice = max(spacing - ((- lower) % spacing), lower - numberOfIntervals * spacing)
-        maxLogPrice = ((2 ** 64) - 1) - (((2 ** 64) - 1) % spacing) + (lower % spacing)
-        if maxLogPrice > ((2 ** 64) - 1):
-            maxLogPrice -= spacing
-        maxLogPrice = min(maxLogPrice, upper + numberOfIntervals * spacing)
-
-        self.growth = {}
-        self.sharesTotal = {}
-        for logPrice in range(minLogPrice, maxLogPrice, spacing):
-            self.growth[logPrice] = Integer(1)
-            self.sharesTotal[logPrice] = Integer(0)
-
-    def modifyPosition(
-        self,
-        logPriceMin,
-        logPriceMax,
-        shares
-    ):
-        logPriceMinOffsetted = int(logPriceMin - self.logOffset * (1 << 59) + (1 << 63))
-        logPriceMaxOffsetted = int(logPriceMax - self.logOffset * (1 << 59) + (1 << 63))
-        current = self.curve[-1]
-        lower = min(self.curve[0], self.curve[1])
-        upper = max(self.curve[0], self.curve[1])
-        spacing = upper - lower
-
-        outgoingMax, incomingMax = getMaxIntegrals(self.kernel)
-        
-        for logPrice in range(logPriceMinOffsetted, logPriceMaxOffsetted, spacing):
-            growth = self.growth[logPrice]
-            _shares = shares
-            sqrtOffset = exp(self.logOffset / 2)
-
-            if upper <= logPrice:
-                self.amount0 += _shares * growth * (outgoing([logPrice + spacing, logPrice], self.kernel, logPrice, logPrice + spacing) / outgoingMax) / sqrtOffset
-            if logPrice + spacing <= lower:
-                self.amount1 += _shares * growth * (outgoing([logPrice, logPrice + spacing], self.kernel, logPrice, logPrice + spacing) / outgoingMax) * sqrtOffset
-            if (lower <= logPrice) and (logPrice + spacing <= upper):
-                self.amount0 += _shares * growth * (outgoing(self.curve, self.kernel, current, upper) / outgoingMax) / sqrtOffset
-                self.amount1 += _shares * growth * (outgoing(self.curve, self.kernel, lower, current) / outgoingMax) * sqrtOffset
-
-            self.sharesTotal[logPrice] += shares
-
-    def swap(
-        self,
-        target,
-        overshoot
-    ):
-        current = self.curve[-1]
-        if target == current:
-            return Integer(1), Integer(1), Integer(1)
-        zeroForOne = target < current
-        outgoingMax, incomingMax = getMaxIntegrals(self.kernel)
-
-        lower = min(self.curve[0], self.curve[1])
-        upper = max(self.curve[0], self.curve[1])
-        spacing = upper - lower
-
-        g = Integer(0)
-        g_minus = Integer(0)
-        g_plus = Integer(0)
-
-        while (current != target):
-            growth = self.growth[lower]
-            shares = self.sharesTotal[lower]
-            sqrtOffset = exp(self.logOffset / 2)
-
-            _target = max(target, lower) if zeroForOne else min(target, upper)
-
-            self.amount0 -= shares * growth * (outgoing(self.curve, self.kernel, current, upper) / outgoingMax) / sqrtOffset
-            self.amount1 -= shares * growth * (outgoing(self.curve, self.kernel, lower, current) / outgoingMax) * sqrtOffset
-
-            if _target != target:
-                if zeroForOne:
-                    g = (outgoing(self.curve, self.kernel, current, upper) + incoming(self.curve, self.kernel, lower, current)) / outgoing([upper, lower], self.kernel, lower, upper)
-                    self.amount0 += shares * g * growth * (outgoing([upper, lower], self.kernel, lower, upper) / outgoingMax) / sqrtOffset
-                    self.growth[lower] = (1 + (g - 1) * (1 - self.protocolGrowthPortion) * (1 - self.poolGrowthPortion)) * self.growth[lower]
-                    self.curve = [lower - spacing, lower]
-                    current = lower
-                    upper = lower
-                    lower = lower - spacing
-                else:
-                    g = (outgoing(self.curve, self.kernel, lower, current) + incoming(self.curve, self.kernel, current, upper)) / outgoing([lower, upper], self.kernel, lower, upper)
-                    self.amount1 += shares * g * growth * (outgoing([lower, upper], self.kernel, lower, upper) / outgoingMax) * sqrtOffset
-                    self.growth[lower] = (1 + (g - 1) * (1 - self.protocolGrowthPortion) * (1 - self.poolGrowthPortion)) * self.growth[lower]
-                    self.curve = [upper + spacing, upper]
-                    current = upper
-                    lower = upper
-                    upper = upper + spacing
-            else:
-                _curve = amend(amend(self.curve, overshoot), target)
-
-                denominator0 = outgoing(_curve, self.kernel, target, upper)
-                denominator1 = outgoing(_curve, self.kernel, lower, target)
-
-                if zeroForOne:
-                    numerator0 = outgoing(self.curve, self.kernel, current, upper) + incoming(self.curve, self.kernel, target, current)
-                    numerator1 = outgoing(self.curve, self.kernel, lower, target)
-                else:
-                    numerator0 = outgoing(self.curve, self.kernel, target, upper)
-                    numerator1 = outgoing(self.curve, self.kernel, lower, current) + incoming(self.curve, self.kernel, current, target)
-
-                if denominator0 == 0:
-                    g0 = +oo
-                else:
-                    g0 = numerator0 / denominator0
-
-                if denominator1 == 0:
-                    g1 = +oo
-                else:
-                    g1 = numerator1 / denominator1
-
-                g = min(g0, g1)
-
-                self.amount0 += shares * g * growth * (denominator0 / outgoingMax) / sqrtOffset
-                self.amount1 += shares * g * growth * (denominator1 / outgoingMax) * sqrtOffset
-
-                if (overshoot != upper) and not(zeroForOne and (overshoot == target)):
-                    _curve_plus = amend(amend(self.curve, overshoot + 1), target)
-
-                    denominator0 = outgoing(_curve_plus, self.kernel, target, upper)
-                    denominator1 = outgoing(_curve_plus, self.kernel, lower, target)
-
-                    if denominator0 == 0:
-                        g0 = Integer(1)
-                    else:
-                        g0 = numerator0 / denominator0
-
-                    if denominator1 == 0:
-                        g1 = Integer(1)
-                    else:
-                        g1 = numerator1 / denominator1
-
-                    g_plus = min(g0, g1)
-
-                if (overshoot != lower) and not(not(zeroForOne) and (overshoot == target)):
-                    _curve_minus = amend(amend(self.curve, overshoot - 1), target)
-
-                    denominator0 = outgoing(_curve_minus, self.kernel, target, upper)
-                    denominator1 = outgoing(_curve_minus, self.kernel, lower, target)
-
-                    if denominator0 == 0:
-                        g0 = Integer(1)
-                    else:
-                        g0 = numerator0 / denominator0
-
-                    if denominator1 == 0:
-                        g1 = Integer(1)
-                    else:
-                        g1 = numerator1 / denominator1
-
-                    g_plus = min(g0, g1)
-
-                self.curve = _curve
-                self.growth[lower] = (1 + (g - 1) * (1 - self.protocolGrowthPortion) * (1 - self.poolGrowthPortion)) * self.growth[lower]
-                current = target
-
-        return g, g_minus, g_plus
-
-def getGrowthMultiplier(nofeeswap, access, poolId, lower, upper, logPrice):
-    growthMultiplier = access._readGrowthMultiplier(nofeeswap, poolId, logPrice)
-
-    if growthMultiplier != 0:
-        return growthMultiplier
-    else:
-        if logPrice <= lower:
-            return (2 ** 208) * exp(+ Integer(logPrice - (2 ** 63)) / (2 ** 60)) / (1 - exp(- Integer(upper - lower) / (2 ** 60)))
-        else:
-            return (2 ** 208) * exp(- Integer(logPrice - (2 ** 63)) / (2 ** 60)) / (1 - exp(- Integer(upper - lower) / (2 ** 60)))
-
 def checkPool(nofeeswap, access, poolId, pool):
     curve = pool.curve
     lower = min(curve[0], curve[1])
@@ -1591,4 +1227,333 @@ def burnIncentiveSequence(token0, token1, payer, operator, tagShares, poolId, qM
       [TRANSFER_TRANSIENT_BALANCE_FROM_PAYER, tagShares, operator.address, sharesSlot, sharesSuccessSlot]
     )
 
-    return encode_packed(['uint32'] + ['bytes'] * len(sequence), [deadline] + sequence)
\ No newline at end of file
+    return encode_packed(['uint32'] + ['bytes'] * len(sequence), [deadline] + sequence)
+
+def decodeIncentiveData(incentive, owners, data):
+    # Unpacks the output of 'Incentive.incentiveData' into one tuple per
+    # position: (owner, poolId, qMin, qMax, shares,
+    # evanescentPointsPerShareSubtrahend, evanescentPointsOwed).
+    incentive = toInt(incentive) if isinstance(incentive, str) else toInt(incentive.address)
+    words = [
+        [word if isinstance(word, int) else int.from_bytes(bytes(word), 'big') for word in record]
+        for record in data
+    ]
+    return [
+        (
+            owner,
+            (value0 & (((1 << 96) - 1) << 160)) | incentive,
+            (value1 >> 192) % X64,
+            (value1 >> 128) % X64,
+            value1 % (1 << 128),
+            value0 % (1 << 96),
+            value2 if (value0 >> 96) % X64 == X64 - 1 else (value0 >> 96) % X64
+        ) for owner, (value0, value1, value2) in zip(owners, words)
+    ]
+
+def encodeObservation(index, length, blockTimeStamp, logPriceCumulative):
+    return ((index << 240) | (length << 224) | (blockTimeStamp << 192) | logPriceCumulative) % X256
+
+def decodeObservation(content):
+    index = content >> 240
+    length = (content >> 224) % (1 << 16)
+    blockTimeStamp = (content >> 192) % (1 << 32)
+    logPriceCumulative = content % (1 << 192)
+    return index, length, blockTimeStamp, logPriceCumulative
+
+class OracleModel:
+    # A bit-level replica of the observation array of 'Oracle.sol' for a
+    # single pool. 'slots[0]' mirrors the last observation slot and
+    # 'slots[index + 1]' mirrors the slot of observation 'index'. Unwritten
+    # slots read as zero, exactly as in storage.
+    def __init__(self):
+        self.slots = {}
+
+    def readLastObservation(self):
+        return decodeObservation(self.slots.get(0, 0))
+
+    def readObservation(self, index):
+        _, _, blockTimeStamp, logPriceCumulative = decodeObservation(self.slots.get(index + 1, 0))
+        return blockTimeStamp, logPriceCumulative
+
+    def writeObservation(self, index, length, blockTimeStamp, logPriceCumulative):
+        content = encodeObservation(index, length, blockTimeStamp, logPriceCumulative)
+        self.slots[0] = content
+        self.slots[index + 1] = content
+
+    def postInitialize(self, timestamp):
+        self.writeObservation(0, 2, timestamp % (1 << 32), 0)
+
+    def grow(self, newLength):
+        _, length, _, _ = self.readLastObservation()
+        if length != 0:
+            while length < newLength:
+                length = length + 1
+                self.slots[length] = X256 - 1
+
+    def update(self, timestamp, logPrice):
+        index, length, blockTimeStamp, logPriceCumulative = self.readLastObservation()
+
+        # 'uint32(block.timestamp) - blockTimeStamp' is checked arithmetic.
+        timeDelta = (timestamp % (1 << 32)) - blockTimeStamp
+        if timeDelta < 0:
+            raise OverflowError('timeDelta underflow')
+
+        if timeDelta != 0:
+            logPriceCumulative = (logPriceCumulative + logPrice * timeDelta) % X256
+            index = index + 1
+            if index < length:
+                self.writeObservation(index, length, timestamp % (1 << 32), logPriceCumulative)
+            else:
+                placeHolder, _ = self.readObservation(index)
+                if placeHolder != 0:
+                    self.writeObservation(index, length + 1, timestamp % (1 << 32), logPriceCumulative)
+                else:
+                    self.writeObservation(0, length, timestamp % (1 << 32), logPriceCumulative)
+
+def geometricMean(x, y):
+    # Mirrors 'GeometricMean.sol': 'floor(sqrt(x * y / (2 ** 208)))' for
+    # 'X216' inputs.
+    return math.isqrt((x * y) >> 208)
+
+def productX208(x, y):
+    # Step by step replica of 'productX208' in 'GeometricMean.sol', i.e., the
+    # 'mulmod' trick modulo '2 ** 256 - 1'.
+    modulus = X256 - 1
+    s = (x * y) % modulus
+    r = (x * y) % (1 << 208)
+    return (((s + (modulus - r)) % modulus) * (1 << 48)) % modulus
+
+def geometricMeanReference(x, y):
+    # Step by step replica of 'geometricMean' in 'GeometricMean.sol', i.e.,
+    # the magnitude search followed by six Newton iterations. Every
+    # intermediate value is within 256 bits.
+    a = productX208(x, y)
+    if a <= 1:
+        return a
+    aa = a
+    xn = 1
+    for shift in [128, 64, 32, 16, 8, 4]:
+        if aa >= (1 << shift):
+            aa >>= shift
+            xn <<= shift >> 1
+    if aa >= 4:
+        xn <<= 1
+    xn = (3 * xn) >> 1
+    for _ in range(6):
+        xn = (xn + a // xn) >> 1
+    return xn - (1 if xn > a // xn else 0)
+
+# Coefficients of the initial estimate of 'geometricMeanFast' in 'X64', 'X48'
+# and 'X32', respectively, where the last one is subtracted.
+geometricMeanFastCoefficients = (0x84bfe507d70ef000, 0x86a89d6d8ea4, 0xa1f4c76)
+
+def geometricMeanFastEstimate(a):
+    # The initial estimate of 'geometricMeanFast' for 'a >= 2'.
+    c0, c1, c2 = geometricMeanFastCoefficients
+    k = (a.bit_length() - 1) >> 1
+    m = (a << 16) >> (2 * k)
+    return ((c0 + c1 * m - c2 * m * m) << k) >> 64
+
+def geometricMeanFast(x, y):
+    # Step by step replica of 'geometricMeanFast' in 'GeometricMean.sol'.
+    a = productX208(x, y)
+    if a <= 1:
+        return a
+    xn = geometricMeanFastEstimate(a)
+    for _ in range(4):
+        xn = (xn + a // xn) >> 1
+    return xn - (1 if xn > a // xn else 0)
+
+def geometricMeanInputs(random, count):
+    # Generates 'count' pairs of 'X216' inputs of 'geometricMean' for each of
+    # the following strata, given a 'random.Random' instance:
+    #
+    # 'powers': both inputs within 3 of powers of two,
+    # 'top': both inputs within '2 ** 16' below '2 ** 216',
+    # 'squares': 'x * y / (2 ** 208)' is a perfect square or one away from it,
+    # 'uniform': both inputs uniform in magnitude.
+    #
+    # Returns a dictionary of lists of pairs.
+    def nearPower():
+        return max(0, min(X216 - 1, (1 << random.randrange(0, 217)) + random.randrange(-3, 4)))
+
+    def nearSquare():
+        # 'x == s * (2 ** u)' and 'y == s * (2 ** (208 - u)) + d' so that
+        # 'x * y / (2 ** 208) == s ** 2 + {-1, 0, +1}'.
+        # Both inputs are less than '2 ** 216' if 'u' is at least
+        # 'bits(s) - 8'. The offsets require 'x <= 2 ** 208' and some room for
+        # 'd' in 'y'.
+        s = random.randrange(1, 1 << random.randrange(1, 113))
+        bits = s.bit_length()
+        offset = random.randrange(-1, 2) if bits <= 107 else 0
+        if offset == 0:
+            u = random.randrange(max(0, bits - 8), min(209, 217 - bits))
+        else:
+            u = random.randrange(max(0, bits - 7), 209 - bits)
+        x = s << u
+        y = s << (208 - u)
+        if offset == -1:
+            y -= 1
+        elif offset == 1:
+            y += - ((- (1 << 208)) // x)
+        return (x, y) if random.randrange(2) else (y, x)
+
+    def uniform():
+        return random.randrange(0, 1 << random.randrange(1, 217))
+
+    return {
+        'powers': [(nearPower(), nearPower()) for _ in range(count)],
+        'top': [(X216 - 1 - random.randrange(1 << 16), X216 - 1 - random.randrange(1 << 16)) for _ in range(count)],
+        'squares': [nearSquare() for _ in range(count)],
+        'uniform': [(uniform(), uniform()) for _ in range(count)]
+    }
+
+def pointsPerShareIncrement(blocks, growth, integral0, integral1, outgoingMax):
+    # Mirrors 'Incentive._calculatePointsPerShareIncrement'. The product is
+    # taken modulo '2 ** 256' and the exact division by 'outgoingMax' via its
+    # modular inverse is equivalent to a floor division of the largest
+    # multiple of 'outgoingMax' not exceeding the product.
+    product = (blocks * ((geometricMean(integral0, integral1) * growth) % X256)) % X256
+    return (product - (product % outgoingMax)) // outgoingMax
+
+class IncentiveModel:
+    # A replica of the evanescent points accounting of 'Incentive.sol' and
+    # 'StorageIncentive.sol'. Storage is kept as plain integers:
+    #
+    # 'poolData[poolId]' mirrors the pool data slot as
+    # '[blockNumber, qLower, qUpper, activeEvanescentPointsPerShare]',
+    # 'mapping[(poolId, logPrice)]' mirrors
+    # 'evanescentPointsPerShareMapping' and 'positions[tokenId]' mirrors the
+    # incentive data slots as
+    # '[poolId, qMin, qMax, shares, evanescentPointsPerShareSubtrahend,
+    # evanescentPointsOwed]'.
+    #
+    # Unwritten entries read as zero, exactly as in storage. Every call costs
+    # a constant number of operations plus one step per interval crossed,
+    # regardless of the number of blocks elapsed.
+    def __init__(self, startBlock, endBlock, maxIncentiveGrowth=(1 << 127)):
+        self.startBlock = startBlock
+        self.endBlock = endBlock
+        self.maxIncentiveGrowth = maxIncentiveGrowth
+        self.totalEvanescentPointsOwed = 0
+        self.poolData = {}
+        self.mapping = {}
+        self.positions = {}
+        self.tokenId = 0
+
+    def preInitialize(self, poolId, blockNumber, qLower, qUpper):
+        blockNumber = blockNumber % (1 << 32)
+        self.poolData[poolId] = [max(blockNumber, self.startBlock), qLower, qUpper, 0]
+
+    def accountEvanescentPoints(self, poolId, blockNumber, qLower, qUpper, growth, integral0, integral1, outgoingMax, sharesTotal):
+        # Mirrors 'Incentive._accountEvanescentPoints'. The remaining
+        # arguments are the current active interval and the dynamic
+        # parameters which the hook reads from calldata.
+        currentBlock = blockNumber % (1 << 32)
+        if currentBlock <= self.startBlock:
+            return
+        if self.endBlock < currentBlock:
+            return
+
+        lastBlockAccounted, lastLower, lastUpper, lastActive = self.poolData.get(poolId, [0, 0, 0, 0])
+        if currentBlock == lastBlockAccounted:
+            return
+
+        if lastLower != qLower:
+            pointsLower = self.mapping.get((poolId, lastLower), 0)
+            pointsUpper = self.mapping.get((poolId, lastUpper), 0)
+
+            while lastLower < qLower:
+                pointsLower = (pointsLower + lastActive) % X256
+                self.mapping[(poolId, lastUpper)] = pointsLower
+                lastLower, lastUpper = lastUpper, lastUpper + (lastUpper - lastLower)
+                transition = pointsUpper
+                pointsUpper = self.mapping.get((poolId, lastUpper), 0)
+                lastActive = (transition - pointsUpper) % X256
+
+            while qLower < lastLower:
+                pointsUpper = (pointsUpper + lastActive) % X256
+                self.mapping[(poolId, lastLower)] = pointsUpper
+                lastLower, lastUpper = lastLower - (lastUpper - lastLower), lastLower
+                transition = pointsLower
+                pointsLower = self.mapping.get((poolId, lastLower), 0)
+                lastActive = (transition - pointsLower) % X256
+
+        increment = 0
+        if growth <= self.maxIncentiveGrowth:
+            increment = pointsPerShareIncrement(
+                (currentBlock - lastBlockAccounted) % (1 << 32),
+                growth,
+                integral0,
+                integral1,
+                outgoingMax
+            )
+            lastActive = (lastActive + increment) % X256
+
+        # 'writePoolData' packs 'activeEvanescentPointsPerShare' in 96 bits.
+        if lastActive >= (1 << 96):
+            raise OverflowError('activeEvanescentPointsPerShare overflow')
+        self.poolData[poolId] = [currentBlock, qLower, qUpper, lastActive]
+        self.totalEvanescentPointsOwed = self.totalEvanescentPointsOwed + ((increment * sharesTotal) % X256)
+
+    def calculateEvanescentPointsPerShare(self, poolId, qMin, qMax):
+        # Mirrors 'StorageIncentive.calculateEvanescentPointsPerShare'.
+        _, lower, upper, active = self.poolData.get(poolId, [0, 0, 0, 0])
+        pointsMin = self.mapping.get((poolId, qMin), 0)
+        pointsMax = self.mapping.get((poolId, qMax), 0)
+        if upper <= qMin:
+            return (pointsMin - pointsMax) % X256
+        elif qMax <= lower:
+            return (pointsMax - pointsMin) % X256
+        else:
+            return (
+                active + self.mapping.get((poolId, upper), 0) - pointsMax + self.mapping.get((poolId, lower), 0) - pointsMin
+            ) % X256
+
+    def mint(self, poolId, qMin, qMax, shares):
+        # Mirrors 'Incentive._mint' which is called by 'midMint' after the
+        # pool is accounted.
+        self.tokenId = self.tokenId + 1
+        self.positions[self.tokenId] = [
+            poolId,
+            qMin,
+            qMax,
+            shares,
+            self.calculateEvanescentPointsPerShare(poolId, qMin, qMax),
+            0
+        ]
+        return self.tokenId
+
+    def modifyIncentiveShares(self, tokenId, sharesIncrement):
+        # Mirrors 'StorageIncentive.modifyIncentiveShares' with
+        # 'evanescentPointsPerShare' calculated as in 'midMint' and 'midBurn'.
+        poolId, qMin, qMax, shares, subtrahend, owed = self.positions[tokenId]
+        sharesUpdated = shares + sharesIncrement
+        if sharesUpdated < 0:
+            raise ValueError('InsufficientShares: ' + str(tokenId))
+        pointsPerShare = self.calculateEvanescentPointsPerShare(poolId, qMin, qMax)
+        owed = owed + ((shares * ((pointsPerShare - subtrahend) % X256)) % X256)
+        self.positions[tokenId] = [poolId, qMin, qMax, sharesUpdated, pointsPerShare, owed]
+
+    def collectEvanescentPoints(self, tokenId):
+        # Mirrors 'StorageIncentive.collectEvanescentPoints'.
+        poolId, qMin, qMax, shares, subtrahend, owed = self.positions[tokenId]
+        pointsPerShare = self.calculateEvanescentPointsPerShare(poolId, qMin, qMax)
+        owed = owed + ((shares * ((pointsPerShare - subtrahend) % X256)) % X256)
+        self.positions[tokenId] = [poolId, qMin, qMax, shares, pointsPerShare, 0]
+        return owed
+
+    def payRewards(self, evanescentPointsOwed, allowance):
+        # Mirrors the first reward program of 'Incentive._payRewards'.
+        amount = 0
+        if self.totalEvanescentPointsOwed != 0:
+            amount = (allowance * evanescentPointsOwed) // self.totalEvanescentPointsOwed
+        self.totalEvanescentPointsOwed = self.totalEvanescentPointsOwed - evanescentPointsOwed
+        return amount
+
+    def pendingPoints(self, tokenId):
+        # The points that 'collectEvanescentPoints' would return right now,
+        # without modifying the position.
+        poolId, qMin, qMax, shares, subtrahend, owed = self.positions[tokenId]
+        pointsPerShare = self.calculateEvanescentPointsPerShare(poolId, qMin, qMax)
+        return owed + ((shares * ((pointsPerShare - subtrahend) % X256)) % X256)
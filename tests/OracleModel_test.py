@@ -0,0 +1,48 @@
+# Copyright 2025, NoFeeSwap LLC - All rights reserved.
+from hypothesis import settings, strategies as st
+from hypothesis.stateful import RuleBasedStateMachine, initialize, invariant, rule
+from Nofee import OracleModel
+
+class OracleMachine(RuleBasedStateMachine):
+    @initialize(timestamp=st.integers(min_value=1, max_value=2 ** 31))
+    def postInitialize(self, timestamp):
+        self.oracle = OracleModel()
+        self.oracle.postInitialize(timestamp)
+        self.timestamp = timestamp
+        self.logPriceCumulative = 0
+        self.history = [(timestamp, 0)]
+        self.length = 2
+        self.lengthMax = 2
+
+    @rule(timeDelta=st.integers(min_value=0, max_value=2 ** 10), logPrice=st.integers(min_value=0, max_value=2 ** 64 - 1))
+    def midSwap(self, timeDelta, logPrice):
+        self.timestamp += timeDelta
+        self.oracle.update(self.timestamp, logPrice)
+        if timeDelta != 0:
+            self.logPriceCumulative += logPrice * timeDelta
+            self.history += [(self.timestamp, self.logPriceCumulative)]
+
+    @rule(newLength=st.integers(min_value=0, max_value=64))
+    def grow(self, newLength):
+        self.oracle.grow(newLength)
+        self.lengthMax = max(self.lengthMax, newLength)
+
+    @invariant()
+    def lastObservation(self):
+        index, length, blockTimeStamp, logPriceCumulative = self.oracle.readLastObservation()
+        assert (blockTimeStamp, logPriceCumulative) == self.history[-1]
+        assert self.oracle.readObservation(index) == self.history[-1]
+        assert index < length
+        assert self.length <= length <= self.lengthMax
+        self.length = length
+
+    @invariant()
+    def ringBuffer(self):
+        # Walking backwards from 'index', the array holds the most recent
+        # observations in reverse chronological order.
+        index, length, _, _ = self.oracle.readLastObservation()
+        for k in range(min(length, len(self.history))):
+            assert self.oracle.readObservation((index - k) % length) == self.history[-1 - k]
+
+TestOracleModel = OracleMachine.TestCase
+TestOracleModel.settings = settings(max_examples=50, stateful_step_count=200, deadline=None)
@@ -1,12 +1,13 @@
 # Copyright 2025, NoFeeSwap LLC - All rights reserved.
 import pytest
+import random
 from brownie import chain, accounts, Access, Nofeeswap, NofeeswapDelegatee, ERC20FixedSupply, Oracle, Operator, Deployer
 from eth_abi import encode
 from eth_abi.packed import encode_packed
-from Nofee import logTest, ADD, REVERT, PUSH32, SWAP, JUMP, JUMPDEST, LT, NEG, TAKE_TOKEN, ISZERO, SYNC_TOKEN, TRANSFER_FROM_PAYER_ERC20, SETTLE, address0, mintSequence, keccak, toInt, twosComplementInt8, encodeKernelCompact, encodeCurve, getPoolId
+from Nofee import logTest, OracleModel, ADD, REVERT, PUSH32, SWAP, JUMP, JUMPDEST, LT, NEG, TAKE_TOKEN, ISZERO, SYNC_TOKEN, TRANSFER_FROM_PAYER_ERC20, SETTLE, address0, mintSequence, keccak, toInt, twosComplementInt8, encodeKernelCompact, encodeCurve, getPoolId
 
-@pytest.fixture(autouse=True)
-def deployment(fn_isolation):
+@pytest.fixture(scope='module', autouse=True)
+def deployment(module_isolation):
     root = accounts[0]
     owner = accounts[1]
     other = accounts[2]
@@ -44,6 +45,10 @@ def deployment(fn_isolation):
 
     return root, owner, other, nofeeswap, delegatee, access, oracle, operator, poolGrowthPortion, protocolGrowthPortion
 
+@pytest.fixture(autouse=True)
+def isolation(fn_isolation):
+    pass
+
 def test_oracle(deployment, request, worker_id):
     logTest(request, worker_id)
     
@@ -619,4 +624,93 @@ def test_oracle(deployment, request, worker_id):
 
     timestamp, logPriceCumulative = oracle.observation(poolId, index)
     assert timestamp == chain[-1].timestamp
-    assert logPriceCumulative == qUpper + limit3 + 6 * _limit3 + 5 * limit3_
\ No newline at end of file
+    assert logPriceCumulative == qUpper + limit3 + 6 * _limit3 + 5 * limit3_
+
+def test_oracleModel(deployment, request, worker_id):
+    logTest(request, worker_id)
+
+    root, owner, other, nofeeswap, delegatee, access, oracle, operator, poolGrowthPortion, protocolGrowthPortion = deployment
+
+    token0 = ERC20FixedSupply.deploy("ERC20_0", "ERC20_0", 2**128, root, {'from': root})
+    token1 = ERC20FixedSupply.deploy("ERC20_1", "ERC20_1", 2**128, root, {'from': root})
+    if toInt(token0.address) > toInt(token1.address):
+        token0, token1 = token1, token0
+    tag0 = toInt(token0.address)
+    tag1 = toInt(token1.address)
+
+    qLower = 2 ** 40 + 1
+    qUpper = 2 ** 40 + 1 + 2 ** 40
+
+    kernel = [
+      [0, 0],
+      [2 ** 40, 2 ** 15]
+    ]
+    curve = [qLower, qUpper]
+
+    logOffset = -5
+
+    unsaltedPoolId = (twosComplementInt8(logOffset) << 180) + (0b00000000001000000010 << 160) + toInt(oracle.address)
+    poolId = getPoolId(owner.address, unsaltedPoolId)
+
+    deadline = 2 ** 32 - 1
+
+    nofeeswap.dispatch(
+      delegatee.initialize.encode_input(
+        unsaltedPoolId,
+        tag0,
+        tag1,
+        0,
+        encodeKernelCompact(kernel),
+        encodeCurve(curve),
+        b"HookData"
+      ),
+      {'from': owner}
+    )
+
+    model = OracleModel()
+    model.postInitialize(chain[-1].timestamp)
+
+    amountSpecified = - (1 << 120)
+    zeroForOne = 2
+    hookData = b"HookData"
+    successSlot = 2
+    amount0Slot = 3
+    amount1Slot = 4
+    amountSpecifiedSlot = 15
+    zeroSlot = 100
+
+    # Random swaps and grows are replayed through 'Oracle.sol' and the model.
+    # With no liquidity, every swap moves the price to its limit which is then
+    # observed by the first swap of the next block.
+    generator = random.Random(1)
+    logPrice = qUpper
+    for _ in range(40):
+        if generator.random() < 0.2:
+            newLength = generator.randrange(1, 8)
+            oracle.grow(poolId, newLength, {'from': root})
+            model.grow(newLength)
+
+        chain.sleep(generator.randrange(1, 1000))
+
+        limits = [generator.randrange(qLower + 1, qUpper) for _ in range(generator.randrange(1, 3))]
+        sequence = [encode_packed(
+          ['uint8', 'int256', 'uint8'],
+          [PUSH32, amountSpecified, amountSpecifiedSlot]
+        )]
+        for limit in limits:
+            sequence += [encode_packed(
+              ['uint8', 'uint256', 'uint8', 'uint64', 'uint8', 'uint8', 'uint8', 'uint8', 'uint8', 'uint16', 'bytes'],
+              [SWAP, poolId, amountSpecifiedSlot, limit, zeroForOne, zeroSlot, successSlot, amount0Slot, amount1Slot, len(hookData), hookData]
+            )]
+        data = encode_packed(['uint32'] + ['bytes'] * len(sequence), [deadline] + sequence)
+        nofeeswap.unlock(operator, data, {'from': root})
+
+        # Only the first swap of the block writes an observation.
+        for limit in limits:
+            model.update(chain[-1].timestamp, logPrice)
+            logPrice = limit
+
+        index, length, timestamp, logPriceCumulative = oracle.lastObservation(poolId)
+        assert (index, length, timestamp, logPriceCumulative) == model.readLastObservation()
+        for k in range(length + 1):
+            assert oracle.observation(poolId, k) == model.readObservation(k)
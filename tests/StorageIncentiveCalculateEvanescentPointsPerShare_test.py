@@ -1,7 +1,7 @@
 # Copyright 2025, NoFeeSwap LLC - All rights reserved.
 import pytest
-from brownie import accounts, StorageIncentiveWrapper
-from Nofee import logTest, keccak256, keccakPacked
+from brownie import accounts, StorageIncentiveBatchWrapper
+from Nofee import logTest, keccak256, keccakPacked, IncentiveModel
 
 value0 = 0x0000000000000000000000000000000000000000000000000000000000000000
 value1 = 0x0000000000000000000000000000000000000000000000000000000000000001
@@ -42,50 +42,74 @@ points2 = 0xF00FF00FF00FF00FF00FF00F
 points3 = 0x8FFFFFFFFFFFFFFFFFFFFFFF
 points4 = 0xFFFFFFFFFFFFFFFFFFFFFFFF
 
+batchSize = 125
+
+@pytest.fixture(scope='module', autouse=True)
+def wrapper(module_isolation):
+    return StorageIncentiveBatchWrapper.deploy({'from': accounts[0]})
+
 @pytest.fixture(autouse=True)
-def wrapper(fn_isolation):
-    return StorageIncentiveWrapper.deploy({'from': accounts[0]})
-
-@pytest.mark.parametrize('poolId', [value0, value1, value2, value3, value4])
-@pytest.mark.parametrize('qMin', [logPrice0, logPrice1, logPrice2, logPrice3, logPrice4])
-@pytest.mark.parametrize('qMax', [logPrice0, logPrice1, logPrice2, logPrice3, logPrice4])
-@pytest.mark.parametrize('value', [value0, value1, value2, value3, value4])
-def test_calculateEvanescentPointsPerShare(wrapper, poolId, qMin, qMax, value, request, worker_id):
-    logTest(request, worker_id)
-    
-    # Check if evanescentPointsPerShare is calculated correctly.
+def isolation(fn_isolation):
+    pass
+
+def calculateEvanescentPointsPerShareModel(poolId, qMin, qMax, value):
+    # Returns the storage slots and contents of the evanescent points mapping
+    # to be written for the given case along with the expected
+    # evanescentPointsPerShare. The slots are written in order and may
+    # coincide, in which case the last content prevails as in storage.
     qLower = (value >> 160) % (1 << 64)
     qUpper = (value >> 96) % (1 << 64)
     activeEvanescentPointsPerShare = value % (1 << 96)
-    if qLower != qUpper:
-        pointsMinSlot = keccakPacked(['uint256', 'uint64', 'uint64'], [poolId, qMin, (keccak256('evanescentPointsPerShareMapping') - 1) % (1 << 64)])
-        pointsMaxSlot = keccakPacked(['uint256', 'uint64', 'uint64'], [poolId, qMax, (keccak256('evanescentPointsPerShareMapping') - 1) % (1 << 64)])
-        pointsLowerSlot = keccakPacked(['uint256', 'uint64', 'uint64'], [poolId, qLower, (keccak256('evanescentPointsPerShareMapping') - 1) % (1 << 64)])
-        pointsUpperSlot = keccakPacked(['uint256', 'uint64', 'uint64'], [poolId, qUpper, (keccak256('evanescentPointsPerShareMapping') - 1) % (1 << 64)])
-
-        points0 = (value >> 160) >> 1
-        points1 = (value % (1 << 96)) >> 1
-        points2 = (poolId >> 160) >> 1
-        points3 = (poolId % (1 << 96)) >> 1
-
-        if (qUpper <= qMin):
-            contents = [max(points0, points1), min(points0, points1), 0, 0]
-            evanescentPointsPerShare = max(points0, points1) - min(points0, points1)
-        elif (qMax <= qLower):
-            contents = [min(points0, points1), max(points0, points1), 0, 0]
-            evanescentPointsPerShare = max(points0, points1) - min(points0, points1)
-        else:
-            contents = [min(points0, points1), min(points2, points3), max(points0, points1), max(points2, points3)]
-            evanescentPointsPerShare = activeEvanescentPointsPerShare + max(points0, points1) + max(points2, points3) - min(points0, points1) - min(points2, points3)
-
-        tx = wrapper._calculateEvanescentPointsPerShare(
-            poolId,
-            qMin,
-            qMax,
-            value,
-            [pointsMinSlot, pointsMaxSlot, pointsLowerSlot, pointsUpperSlot],
-            contents
-        )
-        evanescentPointsPerShareResult = tx.return_value
 
-        assert evanescentPointsPerShareResult == evanescentPointsPerShare
\ No newline at end of file
+    pointsMinSlot = keccakPacked(['uint256', 'uint64', 'uint64'], [poolId, qMin, (keccak256('evanescentPointsPerShareMapping') - 1) % (1 << 64)])
+    pointsMaxSlot = keccakPacked(['uint256', 'uint64', 'uint64'], [poolId, qMax, (keccak256('evanescentPointsPerShareMapping') - 1) % (1 << 64)])
+    pointsLowerSlot = keccakPacked(['uint256', 'uint64', 'uint64'], [poolId, qLower, (keccak256('evanescentPointsPerShareMapping') - 1) % (1 << 64)])
+    pointsUpperSlot = keccakPacked(['uint256', 'uint64', 'uint64'], [poolId, qUpper, (keccak256('evanescentPointsPerShareMapping') - 1) % (1 << 64)])
+
+    points0 = (value >> 160) >> 1
+    points1 = (value % (1 << 96)) >> 1
+    points2 = (poolId >> 160) >> 1
+    points3 = (poolId % (1 << 96)) >> 1
+
+    if (qUpper <= qMin):
+        contents = [max(points0, points1), min(points0, points1), 0, 0]
+    elif (qMax <= qLower):
+        contents = [min(points0, points1), max(points0, points1), 0, 0]
+    else:
+        contents = [min(points0, points1), min(points2, points3), max(points0, points1), max(points2, points3)]
+
+    model = IncentiveModel(0, 0)
+    model.poolData[poolId] = [value >> 224, qLower, qUpper, activeEvanescentPointsPerShare]
+    for logPrice, content in zip([qMin, qMax, qLower, qUpper], contents):
+        model.mapping[(poolId, logPrice)] = content
+
+    return (
+        [pointsMinSlot, pointsMaxSlot, pointsLowerSlot, pointsUpperSlot],
+        contents,
+        model.calculateEvanescentPointsPerShare(poolId, qMin, qMax)
+    )
+
+def test_calculateEvanescentPointsPerShare(wrapper, request, worker_id):
+    logTest(request, worker_id)
+
+    # Check if evanescentPointsPerShare is calculated correctly. The whole
+    # grid is evaluated by the batch wrapper in 'batchSize' cases per call.
+    cases = []
+    for poolId in [value0, value1, value2, value3, value4]:
+        for qMin in [logPrice0, logPrice1, logPrice2, logPrice3, logPrice4]:
+            for qMax in [logPrice0, logPrice1, logPrice2, logPrice3, logPrice4]:
+                for value in [value0, value1, value2, value3, value4]:
+                    cases += [(poolId, qMin, qMax, value) + calculateEvanescentPointsPerShareModel(poolId, qMin, qMax, value)]
+
+    for k in range(0, len(cases), batchSize):
+        batch = cases[k:k + batchSize]
+        results = wrapper._calculateEvanescentPointsPerShareBatch.call(
+            [case[0] for case in batch],
+            [case[1] for case in batch],
+            [case[2] for case in batch],
+            [case[3] for case in batch],
+            [case[4] for case in batch],
+            [case[5] for case in batch]
+        )
+        for case, evanescentPointsPerShareResult in zip(batch, results):
+            assert evanescentPointsPerShareResult == case[6]
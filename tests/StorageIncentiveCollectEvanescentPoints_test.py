@@ -1,7 +1,7 @@
 # Copyright 2025, NoFeeSwap LLC - All rights reserved.
 import pytest
-from brownie import accounts, StorageIncentiveWrapper
-from Nofee import logTest, toInt, keccak256, keccakPacked
+from brownie import accounts, StorageIncentiveBatchWrapper
+from Nofee import logTest, toInt, keccak256, keccakPacked, IncentiveModel
 
 value0 = 0x0000000000000000000000000000000000000000000000000000000000000000
 value1 = 0x0000000000000000000000000000000000000000000000000000000000000001
@@ -42,63 +42,89 @@ points2 = 0xF00FF00FF00FF00FF00FF00F
 points3 = 0x8FFFFFFFFFFFFFFFFFFFFFFF
 points4 = 0xFFFFFFFFFFFFFFFFFFFFFFFF
 
+batchSize = 125
+
+@pytest.fixture(scope='module', autouse=True)
+def wrapper(module_isolation):
+    return StorageIncentiveBatchWrapper.deploy({'from': accounts[0]})
+
 @pytest.fixture(autouse=True)
-def wrapper(fn_isolation):
-    return StorageIncentiveWrapper.deploy({'from': accounts[0]})
-
-@pytest.mark.parametrize('tokenId', [value0, value2, value4])
-@pytest.mark.parametrize('content0', [value0, value1, value2, value3, value4])
-@pytest.mark.parametrize('content1', [value0, value1, value2, value3, value4])
-@pytest.mark.parametrize('content2', [value0, value1, value2, value3, value4])
-@pytest.mark.parametrize('value', [value0, value1, value2, value3, value4])
-def test_collectEvanescentPoints(wrapper, tokenId, content0, content1, content2, value, request, worker_id):
-    logTest(request, worker_id)
-    
-    # Check if the incentive points are collected correctly.
-    poolId = ((content0 >> 160) << 160) + toInt(wrapper.address)
+def isolation(fn_isolation):
+    pass
+
+def collectEvanescentPointsModel(address, content0, content1, content2, value):
+    # Returns the storage slots and contents of the evanescent points mapping
+    # to be written for the given case along with the expected
+    # evanescentPointsOwed and incentive data slots. The slots are written in
+    # order and may coincide, in which case the last content prevails as in
+    # storage.
+    poolId = ((content0 >> 160) << 160) + address
     evanescentPointsPerShareSubtrahend = content0 % (1 << 96)
+    overflow = (content0 >> 96) % (1 << 64) == (1 << 64) - 1
+    evanescentPointsOwedStored = content2 if overflow else (content0 >> 96) % (1 << 64)
     qMin = (content1 >> 192)
     qMax = (content1 >> 128) % (1 << 64)
     shares = content1 % (1 << 128)
-    
-    blockNumber = value >> 224
+
     qLower = (value >> 160) % (1 << 64)
     qUpper = (value >> 96) % (1 << 64)
     activeEvanescentPointsPerShare = value % (1 << 96)
-    if qLower != qUpper:
-        pointsMinSlot = keccakPacked(['uint256', 'uint64', 'uint64'], [poolId, qMin, (keccak256('evanescentPointsPerShareMapping') - 1) % (1 << 64)])
-        pointsMaxSlot = keccakPacked(['uint256', 'uint64', 'uint64'], [poolId, qMax, (keccak256('evanescentPointsPerShareMapping') - 1) % (1 << 64)])
-        pointsLowerSlot = keccakPacked(['uint256', 'uint64', 'uint64'], [poolId, qLower, (keccak256('evanescentPointsPerShareMapping') - 1) % (1 << 64)])
-        pointsUpperSlot = keccakPacked(['uint256', 'uint64', 'uint64'], [poolId, qUpper, (keccak256('evanescentPointsPerShareMapping') - 1) % (1 << 64)])
-
-        points0 = (value >> 160) >> 1
-        points1 = (value % (1 << 96)) >> 1
-        points2 = (content0 >> 160) >> 1
-        points3 = (content0 % (1 << 96)) >> 1
-
-        if (qUpper <= qMin):
-            contents = [max(points0, points1), min(points0, points1), 0, 0]
-            evanescentPointsPerShare = max(points0, points1) - min(points0, points1)
-        elif (qMax <= qLower):
-            contents = [min(points0, points1), max(points0, points1), 0, 0]
-            evanescentPointsPerShare = max(points0, points1) - min(points0, points1)
-        else:
-            contents = [min(points0, points1), min(points2, points3), max(points0, points1), max(points2, points3)]
-            evanescentPointsPerShare = activeEvanescentPointsPerShare + max(points0, points1) + max(points2, points3) - min(points0, points1) - min(points2, points3)
-
-        tx = wrapper._collectEvanescentPoints(
-            tokenId,
-            content0,
+
+    pointsMinSlot = keccakPacked(['uint256', 'uint64', 'uint64'], [poolId, qMin, (keccak256('evanescentPointsPerShareMapping') - 1) % (1 << 64)])
+    pointsMaxSlot = keccakPacked(['uint256', 'uint64', 'uint64'], [poolId, qMax, (keccak256('evanescentPointsPerShareMapping') - 1) % (1 << 64)])
+    pointsLowerSlot = keccakPacked(['uint256', 'uint64', 'uint64'], [poolId, qLower, (keccak256('evanescentPointsPerShareMapping') - 1) % (1 << 64)])
+    pointsUpperSlot = keccakPacked(['uint256', 'uint64', 'uint64'], [poolId, qUpper, (keccak256('evanescentPointsPerShareMapping') - 1) % (1 << 64)])
+
+    points0 = (value >> 160) >> 1
+    points1 = (value % (1 << 96)) >> 1
+    points2 = (content0 >> 160) >> 1
+    points3 = (content0 % (1 << 96)) >> 1
+
+    if (qUpper <= qMin):
+        contents = [max(points0, points1), min(points0, points1), 0, 0]
+    elif (qMax <= qLower):
+        contents = [min(points0, points1), max(points0, points1), 0, 0]
+    else:
+        contents = [min(points0, points1), min(points2, points3), max(points0, points1), max(points2, points3)]
+
+    model = IncentiveModel(0, 0)
+    model.poolData[poolId] = [value >> 224, qLower, qUpper, activeEvanescentPointsPerShare]
+    for logPrice, content in zip([qMin, qMax, qLower, qUpper], contents):
+        model.mapping[(poolId, logPrice)] = content
+    evanescentPointsPerShare = model.calculateEvanescentPointsPerShare(poolId, qMin, qMax)
+
+    return (
+        [pointsMinSlot, pointsMaxSlot, pointsLowerSlot, pointsUpperSlot],
+        contents,
+        [
+            (evanescentPointsOwedStored + shares * (evanescentPointsPerShare - evanescentPointsPerShareSubtrahend)) % (1 << 256),
+            ((content0 >> 160) << 160) | evanescentPointsPerShare,
             content1,
-            content2,
-            value,
-            [pointsMinSlot, pointsMaxSlot, pointsLowerSlot, pointsUpperSlot],
-            contents
-        )
-        evanescentPointsOwed, content0New, content1New, content2New = tx.return_value
+            0 if overflow else content2
+        ]
+    )
 
-        assert content0New == ((content0 >> 96) << 96) + evanescentPointsPerShare
-        assert content1New == content1
-        assert content2New == 0
-        if (content2 + shares * (evanescentPointsPerShare - evanescentPointsPerShareSubtrahend) >= 0):
-            assert evanescentPointsOwed == content2 + shares * (evanescentPointsPerShare - evanescentPointsPerShareSubtrahend)
\ No newline at end of file
+def test_collectEvanescentPoints(wrapper, request, worker_id):
+    logTest(request, worker_id)
+
+    # Check if the incentive points are collected correctly. The whole grid
+    # is evaluated by the batch wrapper in 'batchSize' cases per call.
+    cases = []
+    for tokenId in [value0, value2, value4]:
+        for content0 in [value0, value1, value2, value3, value4]:
+            for content1 in [value0, value1, value2, value3, value4]:
+                for content2 in [value0, value1, value2, value3, value4]:
+                    for value in [value0, value1, value2, value3, value4]:
+                        cases += [(tokenId, [content0, content1, content2], value) + collectEvanescentPointsModel(toInt(wrapper.address), content0, content1, content2, value)]
+
+    for k in range(0, len(cases), batchSize):
+        batch = cases[k:k + batchSize]
+        results = wrapper._collectEvanescentPointsBatch.call(
+            [case[0] for case in batch],
+            [case[1] for case in batch],
+            [case[2] for case in batch],
+            [case[3] for case in batch],
+            [case[4] for case in batch]
+        )
+        for case, result in zip(batch, results):
+            assert list(result) == case[5]
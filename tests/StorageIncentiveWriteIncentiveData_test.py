@@ -42,14 +42,18 @@ points2 = 0xF00FF00FF00FF00FF00FF00F
 points3 = 0x8FFFFFFFFFFFFFFFFFFFFFFF
 points4 = 0xFFFFFFFFFFFFFFFFFFFFFFFF
 
-@pytest.fixture(autouse=True)
-def wrapper(fn_isolation):
+@pytest.fixture(scope='module', autouse=True)
+def wrapper(module_isolation):
     return StorageIncentiveWrapper.deploy({'from': accounts[0]})
 
+@pytest.fixture(autouse=True)
+def isolation(fn_isolation):
+    pass
+
 @pytest.mark.parametrize('storageSlot', [storageSlot0, storageSlot2, storageSlot4])
 @pytest.mark.parametrize('content0', [value0, value2, value4])
 @pytest.mark.parametrize('content1', [value0, value2, value4])
-@pytest.mark.parametrize('content2', [value0, value2, value4])
+@pytest.mark.parametrize('content2', [value0, value1, value2, value4])
 def test_writeIncentiveData(wrapper, storageSlot, content0, content1, content2, request, worker_id):
     logTest(request, worker_id)
     
@@ -64,6 +68,22 @@ def test_writeIncentiveData(wrapper, storageSlot, content0, content1, content2,
     tx = wrapper._writeIncentiveData(storageSlot, poolId, qMin, qMax, shares, evanescentPointsPerShareSubtrahend, evanescentPointsOwed)
     content0New, content1New, content2New = tx.return_value
 
-    assert content0New == content0 & 0xFFFFFFFFFFFFFFFFFFFFFFFF0000000000000000FFFFFFFFFFFFFFFFFFFFFFFF
+    owed = min(evanescentPointsOwed, (1 << 64) - 1)
+    assert content0New == (content0 & 0xFFFFFFFFFFFFFFFFFFFFFFFF0000000000000000FFFFFFFFFFFFFFFFFFFFFFFF) + (owed << 96)
     assert content1New == content1
-    assert content2New == content2
\ No newline at end of file
+    assert content2New == (content2 if owed == (1 << 64) - 1 else 0)
+
+@pytest.mark.parametrize('storageSlot', [storageSlot0, storageSlot2, storageSlot4])
+@pytest.mark.parametrize('content2', [value0, value1, (1 << 64) - 2])
+def test_writeIncentiveDataLeavesOverflow(wrapper, storageSlot, content2, request, worker_id):
+    logTest(request, worker_id)
+
+    # An overflowed position which is overwritten with a smaller
+    # 'evanescentPointsOwed' has its third slot cleared.
+    poolId = toInt(wrapper.address)
+    wrapper._writeIncentiveData(storageSlot, poolId, logPrice1, logPrice2, balance1, points1, value4)
+    tx = wrapper._writeIncentiveData(storageSlot, poolId, logPrice1, logPrice2, balance1, points1, content2)
+    content0New, content1New, content2New = tx.return_value
+
+    assert (content0New >> 96) % (1 << 64) == content2
+    assert content2New == 0
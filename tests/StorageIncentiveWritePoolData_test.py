@@ -42,10 +42,14 @@ points2 = 0xF00FF00FF00FF00FF00FF00F
 points3 = 0x8FFFFFFFFFFFFFFFFFFFFFFF
 points4 = 0xFFFFFFFFFFFFFFFFFFFFFFFF
 
-@pytest.fixture(autouse=True)
-def wrapper(fn_isolation):
+@pytest.fixture(scope='module', autouse=True)
+def wrapper(module_isolation):
     return StorageIncentiveWrapper.deploy({'from': accounts[0]})
 
+@pytest.fixture(autouse=True)
+def isolation(fn_isolation):
+    pass
+
 @pytest.mark.parametrize('storageSlot', [storageSlot0, storageSlot2, storageSlot4])
 @pytest.mark.parametrize('blockNumber', [block0, block1, block2, block3])
 @pytest.mark.parametrize('qLower', [logPrice0, logPrice2, logPrice4])
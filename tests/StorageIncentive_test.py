@@ -2,7 +2,7 @@
 import pytest
 import brownie
 from brownie import accounts, StorageIncentiveWrapper
-from Nofee import logTest, keccak256, keccakPacked
+from Nofee import logTest, keccak256, keccakPacked, toInt
 
 value0 = 0x0000000000000000000000000000000000000000000000000000000000000000
 value1 = 0x0000000000000000000000000000000000000000000000000000000000000001
@@ -43,10 +43,14 @@ points2 = 0xF00FF00FF00FF00FF00FF00F
 points3 = 0x8FFFFFFFFFFFFFFFFFFFFFFF
 points4 = 0xFFFFFFFFFFFFFFFFFFFFFFFF
 
-@pytest.fixture(autouse=True)
-def wrapper(fn_isolation):
+@pytest.fixture(scope='module', autouse=True)
+def wrapper(module_isolation):
     return StorageIncentiveWrapper.deploy({'from': accounts[0]})
 
+@pytest.fixture(autouse=True)
+def isolation(fn_isolation):
+    pass
+
 def test_tokenIdSlot(wrapper):
     # Check if the hash is calculated correctly.
     tx = wrapper._tokenIdSlot()
@@ -77,8 +81,10 @@ def test_totalEvanescentPointsOwedSlot(wrapper, request, worker_id):
 def test_updateTotalEvanescentPointsOwed(wrapper, totalEvanescentPointsOwed, increment, request, worker_id):
     logTest(request, worker_id)
     
-    # Check if the content of the totalEvanescentPointsOwed slot is updated correctly.
-    if totalEvanescentPointsOwed + increment < (1 << 256):
+    # Check if the content of the totalEvanescentPointsOwed slot is updated
+    # correctly. The most significant byte holds the number of reward programs
+    # and remains intact.
+    if (totalEvanescentPointsOwed % (1 << 248)) + increment < (1 << 248):
         tx = wrapper._updateTotalEvanescentPointsOwed(totalEvanescentPointsOwed, increment)
         totalEvanescentPointsOwedIncremented = tx.return_value
         assert totalEvanescentPointsOwedIncremented == totalEvanescentPointsOwed + increment
@@ -132,6 +138,19 @@ def test_getIncentiveDataSlot(wrapper, tokenId, request, worker_id):
     storageSlot = tx.return_value
     assert storageSlot == keccakPacked(['uint256', 'uint128'], [tokenId, (keccak256('incentiveData') - 1) % (1 << 128)])
 
+@pytest.mark.parametrize('storageSlot', [storageSlot0, storageSlot1, storageSlot2, storageSlot3])
+@pytest.mark.parametrize('content0', [value0, value2, value4])
+@pytest.mark.parametrize('content1', [value0, value2, value4])
+@pytest.mark.parametrize('content2', [value0, value2, value4])
+def test_clearIncentiveData(wrapper, storageSlot, content0, content1, content2, request, worker_id):
+    logTest(request, worker_id)
+    
+    # Check if the incentiveData slots are cleared. The third slot is only
+    # cleared if it is in use.
+    tx = wrapper._clearIncentiveData(storageSlot, content0, content1, content2)
+    overflow = (content0 >> 96) % (1 << 64) == (1 << 64) - 1
+    assert tx.return_value == (0, 0, 0 if overflow else content2)
+
 def test_evanescentPointsPerShareMappingSlot(wrapper, request, worker_id):
     logTest(request, worker_id)
     
@@ -148,4 +167,133 @@ def test_getEvanescentPointsPerShareMappingSlot(wrapper, poolId, logPrice, reque
     # Check if the evanescentPointsPerShareMapping slots are calculated correctly.
     tx = wrapper._getEvanescentPointsPerShareMappingSlot(poolId, logPrice)
     evanescentPointsPerShareMappingSlot = tx.return_value
-    assert evanescentPointsPerShareMappingSlot == keccakPacked(['uint256', 'uint64', 'uint64'], [poolId, logPrice, (keccak256('evanescentPointsPerShareMapping') - 1) % (1 << 64)])
\ No newline at end of file
+    assert evanescentPointsPerShareMappingSlot == keccakPacked(['uint256', 'uint64', 'uint64'], [poolId, logPrice, (keccak256('evanescentPointsPerShareMapping') - 1) % (1 << 64)])
+
+@pytest.mark.parametrize('content', [value0, value1, value2, value3, value4])
+def test_readRewardProgramsCount(wrapper, content, request, worker_id):
+    logTest(request, worker_id)
+
+    # Check if the number of reward programs is read from the most significant
+    # byte of the totalEvanescentPointsOwed slot.
+    tx = wrapper._readRewardProgramsCount(content)
+    assert tx.return_value == content >> 248
+
+@pytest.mark.parametrize('storageSlot', [storageSlot0, storageSlot1, storageSlot2, storageSlot3, storageSlot4])
+@pytest.mark.parametrize('blockNumber', [block0, block1, block2, block3])
+def test_getEvanescentPointsPerShareSnapshotSlot(wrapper, storageSlot, blockNumber, request, worker_id):
+    logTest(request, worker_id)
+
+    # Check if the snapshot slots are calculated correctly.
+    tx = wrapper._getEvanescentPointsPerShareSnapshotSlot(storageSlot, blockNumber)
+    assert tx.return_value == keccakPacked(['uint256', 'uint32', 'uint64'], [storageSlot, blockNumber, (keccak256('evanescentPointsPerShareSnapshot') - 1) % (1 << 64)])
+
+@pytest.mark.parametrize('lastBlock', [block0, block1, block2])
+@pytest.mark.parametrize('content', [points0, points2, points4])
+@pytest.mark.parametrize('evanescentPointsPerShare', [points1, points3])
+def test_writeEvanescentPointsPerShare(wrapper, lastBlock, content, evanescentPointsPerShare, request, worker_id):
+    logTest(request, worker_id)
+
+    # The entry is written as of 'block2 + 1' and the former content is
+    # preserved as of every boundary from 'lastBlock' on.
+    boundaries = [block0, block1, block2]
+    tx = wrapper._writeEvanescentPointsPerShare(storageSlot2, (lastBlock << 224) | content, evanescentPointsPerShare, block2 + 1, boundaries)
+    contentNew, snapshots = tx.return_value
+    assert contentNew == ((block2 + 1) << 224) | evanescentPointsPerShare
+    assert list(snapshots) == [content if lastBlock <= boundary else 0 for boundary in boundaries]
+
+@pytest.mark.parametrize('poolId', [value0, value1, value2, value3, value4])
+@pytest.mark.parametrize('blockNumber', [block0, block1, block2, block3])
+def test_getPoolDataSnapshotSlot(wrapper, poolId, blockNumber, request, worker_id):
+    logTest(request, worker_id)
+
+    # Check if the pool data snapshot slots are calculated correctly.
+    tx = wrapper._getPoolDataSnapshotSlot(poolId, blockNumber)
+    assert tx.return_value == keccakPacked(['uint256', 'uint32', 'uint128'], [poolId, blockNumber, (keccak256('poolDataSnapshot') - 1) % (1 << 128)])
+
+@pytest.mark.parametrize('tokenId', [value0, value1, value2, value3, value4])
+@pytest.mark.parametrize('programId', [1, 8])
+def test_getRewardProgramPositionSlots(wrapper, tokenId, programId, request, worker_id):
+    logTest(request, worker_id)
+
+    # Check if the per position slots of reward programs are calculated
+    # correctly.
+    tx = wrapper._getRewardProgramsStateSlot(tokenId)
+    assert tx.return_value == keccakPacked(['uint256', 'uint128'], [tokenId, (keccak256('rewardProgramsState') - 1) % (1 << 128)])
+    tx = wrapper._getRewardProgramPointsSlot(tokenId, programId)
+    assert tx.return_value == keccakPacked(['uint256', 'uint128', 'uint128'], [tokenId, programId, (keccak256('rewardProgramPoints') - 1) % (1 << 128)])
+    owner = accounts[tokenId % len(accounts)]
+    tx = wrapper._getUnpaidRewardProgramPointsSlot(owner, programId)
+    assert tx.return_value == keccakPacked(['uint256', 'uint128', 'uint128'], [toInt(owner.address), programId, (keccak256('unpaidRewardProgramPoints') - 1) % (1 << 128)])
+
+def test_rewardProgramSlot(wrapper, request, worker_id):
+    logTest(request, worker_id)
+    
+    # Check if the hash is calculated correctly.
+    tx = wrapper._rewardProgramSlot()
+    rewardProgramSlot = tx.return_value
+    assert rewardProgramSlot == (keccak256('rewardProgram') - 1) % (1 << 128)
+
+@pytest.mark.parametrize('programId', [value0, value1, value2, value3, value4])
+def test_getRewardProgramSlot(wrapper, programId, request, worker_id):
+    logTest(request, worker_id)
+    
+    # Check if the rewardProgram slot is calculated correctly.
+    tx = wrapper._getRewardProgramSlot(programId)
+    storageSlot = tx.return_value
+    assert storageSlot == keccakPacked(['uint256', 'uint128'], [programId, (keccak256('rewardProgram') - 1) % (1 << 128)])
+
+@pytest.mark.parametrize('storageSlot', [storageSlot0, storageSlot1, storageSlot2, storageSlot3])
+@pytest.mark.parametrize('content0', [value0, value1, value2, value3, value4])
+@pytest.mark.parametrize('content1', [value0, value2, value4])
+def test_readRewardProgram(wrapper, storageSlot, content0, content1, request, worker_id):
+    logTest(request, worker_id)
+    
+    # Check if the content of rewardProgram slots are decoded correctly.
+    tx = wrapper._readRewardProgram(storageSlot, content0, content1)
+    rewardToken, startBlock, endBlock, payMaster = tx.return_value
+    assert startBlock == content0 >> 224
+    assert endBlock == (content0 >> 192) % (1 << 32)
+    assert toInt(rewardToken) == content0 % (1 << 160)
+    assert toInt(payMaster) == content1 % (1 << 160)
+
+@pytest.mark.parametrize('storageSlot', [storageSlot0, storageSlot1, storageSlot2, storageSlot3])
+@pytest.mark.parametrize('rewardToken', [value0, value1, value2, value4])
+@pytest.mark.parametrize('startBlock', [block0, block1, block3])
+@pytest.mark.parametrize('endBlock', [block0, block2, block3])
+@pytest.mark.parametrize('payMaster', [value0, value2, value4])
+def test_writeRewardProgram(wrapper, storageSlot, rewardToken, startBlock, endBlock, payMaster, request, worker_id):
+    logTest(request, worker_id)
+    
+    rewardToken = '0x' + format(rewardToken % (1 << 160), '040x')
+    payMaster = '0x' + format(payMaster % (1 << 160), '040x')
+
+    # Check if the reward program is encoded correctly.
+    tx = wrapper._writeRewardProgram(storageSlot, rewardToken, startBlock, endBlock, payMaster)
+    content0, content1 = tx.return_value
+    assert content0 == (startBlock << 224) + (endBlock << 192) + toInt(rewardToken)
+    assert content1 == toInt(payMaster)
+
+def test_rewardProgramAcceptedFlag(wrapper, request, worker_id):
+    logTest(request, worker_id)
+    
+    # Check if the flag is within the unused bytes of the first slot.
+    tx = wrapper._rewardProgramAcceptedFlag()
+    assert tx.return_value == 1 << 160
+
+@pytest.mark.parametrize('storageSlot', [storageSlot0, storageSlot1, storageSlot2, storageSlot3])
+@pytest.mark.parametrize('content0', [value0, value1, value2, value3, value4])
+def test_readRewardProgramAccepted(wrapper, storageSlot, content0, request, worker_id):
+    logTest(request, worker_id)
+    
+    # Check if the flag is decoded correctly.
+    tx = wrapper._readRewardProgramAccepted(storageSlot, content0)
+    assert tx.return_value == (((content0 >> 160) & 1) == 1)
+
+@pytest.mark.parametrize('storageSlot', [storageSlot0, storageSlot1, storageSlot2, storageSlot3])
+@pytest.mark.parametrize('content0', [value0, value1, value2, value3, value4])
+def test_writeRewardProgramAccepted(wrapper, storageSlot, content0, request, worker_id):
+    logTest(request, worker_id)
+    
+    # Check if the flag is set while the rest of the slot is preserved.
+    tx = wrapper._writeRewardProgramAccepted(storageSlot, content0)
+    assert tx.return_value == content0 | (1 << 160)
@@ -0,0 +1,23 @@
+# Copyright 2025, NoFeeSwap LLC - All rights reserved.
+import sys
+from pathlib import Path
+
+# The shared models in 'scripts', e.g., 'PoolModel.py', are imported by the
+# tests and by 'Nofee.py'. The project root is put on the path so that they
+# are found regardless of the directory from which the tests are run.
+root = str(Path(__file__).resolve().parents[1])
+if root not in sys.path:
+    sys.path.insert(0, root)
+
+def pytest_addoption(parser):
+    parser.addoption(
+        '--evm-backend',
+        action='store_true',
+        help='run the compiled artifacts in an in-process EVM, see '
+        'scripts/EvmBackend.py'
+    )
+
+def pytest_configure(config):
+    # The in-process EVM is optional and only loaded on demand.
+    if config.getoption('--evm-backend'):
+        config.pluginmanager.import_plugin('scripts.EvmBackend')